@@ -70,6 +70,24 @@ class CertificadoListItemDTO(BaseModel):
     urls: Optional[dict] = None
 
 
+class CertificadoListPageDTO(BaseModel):
+    """DTO de uma página da listagem (offset ou cursor)"""
+    items: List[CertificadoListItemDTO]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+class CertificadoSearchItemDTO(CertificadoListItemDTO):
+    """Item da busca textual com a relevância calculada pelo índice"""
+    score: float
+
+
+class CertificadoSearchPageDTO(BaseModel):
+    """DTO de uma página da busca textual (ordenada por relevância)"""
+    items: List[CertificadoSearchItemDTO]
+    total: int
+
+
 # ============================================================================
 # DASHBOARD DTOs
 # ============================================================================
@@ -190,6 +208,31 @@ class CertificateCreatedDTO:
             "planilha": str(self.planilha_path),
             "pdf": str(self.pdf_path),
         }
+
+
+class UploadBatchItemDTO(BaseModel):
+    """Resultado de um arquivo dentro de um upload em lote"""
+    filename: str
+    status: str  # ok | duplicate | invalid | error
+    numero_certificado: Optional[str] = None
+    cert_id: Optional[str] = None
+    pdf: Optional[str] = None
+    planilha: Optional[str] = None
+    urls: Optional[dict] = None
+    codigo: Optional[str] = None
+    message: Optional[str] = None
+    detalhes: Optional[Any] = None
+    elapsed_ms: Optional[int] = None
+
+
+class UploadBatchResultDTO(BaseModel):
+    """Resumo do upload em lote"""
+    total: int
+    processados: int
+    duplicados: int
+    falhas: int
+    elapsed_ms: int
+    items: List[UploadBatchItemDTO]
 # ============================================================================
 # HEATMAP DTOs
 # ============================================================================
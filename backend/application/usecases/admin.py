@@ -1,25 +1,32 @@
 from __future__ import annotations
 
 import logging
-import tempfile
-import zipfile
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from backend.domain.exceptions import PdfDeletionError
 from backend.domain.services.pdf_engine import PdfEngine
 from backend.domain.services.system_state import SystemStateService
+from backend.domain.services import pdf_service
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
+from backend.domain.services.metrics import MetricsRegistry
+from backend.domain.services.admission import AdmissionControl
+from backend.domain.services.zip_stream import iter_zip
 
 logger = logging.getLogger("cache-admin")
 
 
 class ClearCacheUseCase:
-    def __init__(self, pdf_engine: PdfEngine, system_state: SystemStateService):
+    def __init__(self, pdf_engine: PdfEngine, system_state: SystemStateService, aggregates: DashboardAggregateStore | None = None):
         self.pdf_engine = pdf_engine
         self.system_state = system_state
+        self.aggregates = aggregates
 
     def execute(self, client_host: str) -> Dict[str, Any]:
         # No explicit container reset; if needed, reinitialize engine here
+        if self.aggregates:
+            self.aggregates.invalidate()
         cleared_at = self.system_state.mark_cache_cleared()
         logger.info(f"Cache limpo por {client_host} em {cleared_at}")
         return {
@@ -44,6 +51,31 @@ class GetCacheStatusUseCase:
         }
 
 
+class GetMetricsUseCase:
+    """Métricas internas do processo: contadores, inspeção prévia de uploads, caches de PDFs/exportações e filas de admissão."""
+
+    def __init__(self, metrics: MetricsRegistry | None = None, admission: AdmissionControl | None = None):
+        self.metrics = metrics or MetricsRegistry.shared()
+        self.admission = admission or AdmissionControl.shared()
+
+    def execute(self) -> Dict[str, Any]:
+        data = self.metrics.snapshot()
+        counters = data["counters"]
+        hits = sum(counters.get(f"upload.preflight.{k}", 0) for k in ("clean", "sanitized"))
+        misses = sum(counters.get(f"upload.preflight.{k}", 0) for k in ("clean_miss", "sanitized_failed"))
+        inspected = hits + misses
+        data["upload_preflight"] = {
+            "inspected": inspected,
+            "hit_rate": round(hits / inspected, 4) if inspected else None,
+        }
+        pdf = {k: counters.get(f"pdf.fingerprint.{k}", 0) for k in ("hit", "miss", "stale", "adopted")}
+        lookups = sum(pdf.values())
+        data["pdf_cache"] = {**pdf, "hit_rate": round((pdf["hit"] + pdf["adopted"]) / lookups, 4) if lookups else None}
+        data["export_cache"] = {k: counters.get(f"export.cache.{k}", 0) for k in ("hit", "miss")}
+        data["admission"] = self.admission.snapshot()
+        return data
+
+
 class ListPdfsUseCase:
     def __init__(self, pdf_engine: PdfEngine):
         self.pdf_engine = pdf_engine
@@ -56,9 +88,15 @@ class ListPdfsUseCase:
         data_ate: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> List[Dict[str, Any]]:
-        base = self.pdf_engine.get_pdf_generator().output_dir
-        files = sorted(base.glob("**/*.pdf"), key=lambda p: p.stat().st_mtime, reverse=True)
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Página de PDFs (mais recentes primeiro) e ``meta`` com total e facetas.
+
+        Consulta o catálogo persistente; só diretórios alterados desde a última
+        consulta são revarridos.
+        """
+        catalog = pdf_service.get_metadata(self.pdf_engine)
+        catalog.sync()
 
         def _parse_date(val: str, is_end: bool = False) -> Optional[datetime]:
             s = val.strip()
@@ -82,35 +120,31 @@ class ListPdfsUseCase:
         ts_de = _parse_date(data_de or "") if data_de else None
         ts_ate = _parse_date(data_ate or "", is_end=True) if data_ate else None
 
-        def _match(p: Path) -> bool:
-            name = p.name
-            if q and q.strip() and q.strip().lower() not in name.lower():
-                return False
-            # Simplificação: todo arquivo é tratado como documento; ignora filtro doc_type diferente de 'documento'
-            if doc_type and doc_type.strip().lower() not in ("", "documento"):
-                return False
-            mtime = datetime.fromtimestamp(p.stat().st_mtime)
-            if ts_de and mtime < ts_de:
-                return False
-            if ts_ate and mtime > ts_ate:
-                return False
-            return True
-
-        filtrados = [p for p in files if _match(p)]
-        page = filtrados[offset : offset + max(0, limit)]
-
-        return [
+        # Simplificação: todo arquivo é tratado como documento; doc_type diferente de 'documento' não casa nada
+        if doc_type and doc_type.strip().lower() not in ("", "documento"):
+            return [], {"total": 0, "facets": {"month": [], "dir": [], "linked": {"true": 0, "false": 0}}}
+
+        listing = catalog.query(
+            q=q,
+            since=ts_de.timestamp() if ts_de else None,
+            until=ts_ate.timestamp() if ts_ate else None,
+            limit=limit,
+            offset=offset,
+        )
+        items = [
             {
-                "name": p.name,
-                "relpath": str(p.relative_to(base)),
-                "size_bytes": p.stat().st_size,
-                "size_human": self._size_human(p.stat().st_size),
-                "modified_at": datetime.fromtimestamp(p.stat().st_mtime, tz=timezone.utc).isoformat(),
+                "name": rec.name,
+                "relpath": rec.relpath,
+                "size_bytes": rec.size,
+                "size_human": self._size_human(rec.size),
+                "modified_at": datetime.fromtimestamp(rec.mtime, tz=timezone.utc).isoformat(),
+                "numero_certificado": rec.numero,
                 "doc_type": "documento",
                 "status": "available",
             }
-            for p in page
+            for rec in listing.items
         ]
+        return items, {"total": listing.total, "facets": listing.facets}
 
     @staticmethod
     def _size_human(n: int) -> str:
@@ -144,20 +178,25 @@ class DownloadZipUseCase:
     def __init__(self, pdf_engine: PdfEngine):
         self.pdf_engine = pdf_engine
 
-    def execute(self, names: List[str]) -> Path:
-        base = self.pdf_engine.get_pdf_generator().output_dir
+    def execute(self, names: List[str], compress: bool = False) -> Iterator[bytes]:
+        """
+        Gera o ZIP dos PDFs selecionados em streaming (sem arquivo temporário).
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
-            zip_path = Path(tmp.name)
+        Os nomes são validados antes do primeiro byte; entradas sem compressão
+        por padrão (``compress`` ativa DEFLATE).
+        """
+        base = self.pdf_engine.get_pdf_generator().output_dir
+        entries: List[Tuple[str, Path]] = []
+        seen: set[str] = set()
 
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for name in names:
-                target = (base / name).resolve()
-                if base in target.parents or target.parent == base:
-                    if target.exists() and target.suffix.lower() == ".pdf":
-                        zf.write(str(target), arcname=target.name)
+        for name in names:
+            target = (base / name).resolve()
+            if base in target.parents or target.parent == base:
+                if target.exists() and target.suffix.lower() == ".pdf" and target.name not in seen:
+                    seen.add(target.name)
+                    entries.append((target.name, target))
 
-        return zip_path
+        return iter_zip(entries, compress=compress)
 
 
 class DeletePdfsUseCase:
@@ -165,16 +204,25 @@ class DeletePdfsUseCase:
         self.pdf_engine = pdf_engine
 
     def execute(self, names: List[str]) -> int:
+        """
+        Apaga os PDFs selecionados (com aliases e objeto) e devolve quantos saíram.
+
+        Raises:
+            PdfDeletionError: Remoção parcial (registrada no log); ``removed``
+                traz o que foi efetivamente apagado.
+        """
         base = self.pdf_engine.get_pdf_generator().output_dir
-        deleted = 0
+        targets: List[Path] = []
 
         for name in names:
             target = (base / name).resolve()
             if (base in target.parents or target.parent == base) and target.exists() and target.suffix.lower() == ".pdf":
-                try:
-                    target.unlink()
-                    deleted += 1
-                except Exception:
-                    pass
-
-        return deleted
+                targets.append(target)
+
+        # Remove também os demais aliases (nome gerado / prefixo de cidade) e o objeto
+        try:
+            removed = {str(p) for p in pdf_service.delete_pdfs(targets, self.pdf_engine)}
+        except PdfDeletionError as e:
+            logger.exception(f"Remoção parcial de PDFs: {len(e.removed)} removido(s), {len(e.failed)} falha(s)")
+            raise
+        return sum(1 for t in targets if str(t) in removed)
@@ -8,17 +8,30 @@ import os
 from datetime import datetime, timezone
 
 from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.repositories import CertificadoRepository
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
+from backend.domain.services.certificado_index import engine_data_signature
 from backend.domain.services import pdf_service
 from backend.domain.exceptions import DataInconsistencyError
 from backend.application.dtos import CertificateCreatedDTO
 
 class CreateManualCertificateUseCase:
-    def __init__(self, pdf_engine: PdfEngine, logger=None):
+    def __init__(
+        self,
+        pdf_engine: PdfEngine,
+        logger=None,
+        repository: CertificadoRepository | None = None,
+        aggregates: DashboardAggregateStore | None = None,
+    ):
         self.pdf_engine = pdf_engine
         self.logger = logger
+        self.repository = repository
+        self.aggregates = aggregates
 
     async def execute(self, payload: Dict[str, Any]) -> CertificateCreatedDTO:
         if self.logger: self.logger.info("manual_create_start")
+        # Assinatura dos CSVs antes da gravação: permite aplicar só o delta deste certificado nos índices
+        before = engine_data_signature(self.pdf_engine)
         resultado = await asyncio.to_thread(self.pdf_engine.criar_certificado_manual, payload)
         certificado = resultado["certificado"]
         planilha_path = Path(resultado["planilha"])
@@ -27,6 +40,10 @@ class CreateManualCertificateUseCase:
         bundle = self.pdf_engine.get_bundle_by_numero(numero_certificado)
         if not bundle:
             raise DataInconsistencyError("Falha ao recuperar dados persistidos do certificado.")
+        if self.repository:
+            self.repository.register(bundle, before)
+        if self.aggregates:
+            self.aggregates.apply(bundle, before)
 
         # PDF Generation in threadpool
         pdf_path = await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
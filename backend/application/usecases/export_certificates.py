@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, Optional
+
+from backend.domain.repositories import CertificadoRepository
+from backend.domain.exceptions import ValidationError
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+EXPORT_COLUMNS = [
+    "id",
+    "numero_certificado",
+    "razao_social",
+    "cnpj",
+    "endereco",
+    "bairro",
+    "cidade",
+    "valor",
+    "pragas_tratadas",
+    "data_execucao",
+]
+
+
+class ExportCertificatesUseCase:
+    """
+    Exporta certificados filtrados em NDJSON ou CSV como um gerador de blocos.
+
+    Percorre o índice ordenado por chave (keyset) aplicando os filtros em
+    linha, então a memória fica limitada ao tamanho do bloco e o custo total
+    é uma passada pelo índice, independente do volume exportado.
+    """
+
+    def __init__(self, repository: CertificadoRepository, chunk_size: int = 500, logger=None):
+        self.repository = repository
+        self.chunk_size = chunk_size
+        self.logger = logger
+
+    def execute(
+        self,
+        format: str = "ndjson",
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> Iterator[bytes]:
+        fmt = (format or "").strip().lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError("Formato de exportação inválido. Use ndjson ou csv.", errors=[{"field": "format", "message": "INVALID_FORMAT"}])
+        if self.logger: self.logger.info("export_certs_start", format=fmt, id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor)
+        filtros = dict(id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor)
+        rows = self._iter_rows(filtros)
+        return self._ndjson(rows) if fmt == "ndjson" else self._csv(rows)
+
+    def _iter_rows(self, filtros: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        after = None
+        exported = 0
+        while True:
+            items, next_key = self.repository.scan(after, self.chunk_size, **filtros)
+            for cert in items:
+                exported += 1
+                yield cert.to_dict()
+            if not next_key:
+                break
+            after = next_key
+        if self.logger: self.logger.info("export_certs_done", count=exported)
+
+    def _ndjson(self, rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+        buffer = []
+        for row in rows:
+            buffer.append(json.dumps({k: _serialize(row.get(k)) for k in EXPORT_COLUMNS}, ensure_ascii=False))
+            if len(buffer) >= self.chunk_size:
+                yield ("\n".join(buffer) + "\n").encode("utf-8")
+                buffer = []
+        if buffer:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+
+    def _csv(self, rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(EXPORT_COLUMNS)
+        pending = 0
+        for row in rows:
+            writer.writerow(["" if row.get(k) is None else _serialize(row.get(k)) for k in EXPORT_COLUMNS])
+            pending += 1
+            if pending >= self.chunk_size:
+                yield out.getvalue().encode("utf-8")
+                out.seek(0)
+                out.truncate(0)
+                pending = 0
+        if out.tell():
+            yield out.getvalue().encode("utf-8")
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
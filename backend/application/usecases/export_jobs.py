@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.domain.entities import CertificadoEntity
+from backend.domain.exceptions import DomainException, FeatureUnavailableError, OverloadedError, ValidationError
+from backend.domain.repositories import CertificadoRepository
+from backend.domain.services import pdf_service
+from backend.domain.services.admission import OP_PDF, AdmissionControl
+from backend.domain.services.job_store import FINISHED_STATES, JOB_DONE, JOB_FAILED, JOB_RUNNING, JobStore
+from backend.domain.services.metrics import MetricsRegistry
+from backend.domain.services.pdf_engine import PDF_MERGE_UNAVAILABLE, PdfEngine
+from backend.domain.services.zip_stream import iter_zip
+from backend.application.usecases.upload_jobs import JobQueue
+
+EXPORT_JOB_FORMATS = {"zip": "application/zip", "pdf": "application/pdf"}
+# Sem sufixo .pdf no PDF unido: o artefato não aparece na listagem de PDFs do admin
+_ARTIFACT_SUFFIX = {"zip": ".zip", "pdf": ".merged"}
+# Intervalo mínimo entre gravações do progresso do job
+_PROGRESS_INTERVAL = 0.5
+
+
+def _parse_text(value: Any) -> Optional[str]:
+    s = str(value).strip() if value is not None else ""
+    return s or None
+
+
+def _parse_date(value: Any, field: str) -> Optional[str]:
+    s = str(value or "").strip()
+    if not s:
+        return None
+    try:
+        return date.fromisoformat(s[:10]).isoformat()
+    except ValueError:
+        raise ValidationError("Data inválida. Use AAAA-MM-DD.", errors=[{"field": field, "message": "INVALID_DATE"}])
+
+
+def _parse_valor(value: Any, field: str) -> Optional[float]:
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValidationError("Valor inválido.", errors=[{"field": field, "message": "INVALID_NUMBER"}])
+
+
+def normalize_export_filters(
+    cidade: Any = None,
+    bairro: Any = None,
+    min_valor: Any = None,
+    max_valor: Any = None,
+    data_de: Any = None,
+    data_ate: Any = None,
+) -> Dict[str, Any]:
+    """Filtros da exportação em forma canônica (mesmos de ``GET /certificados`` + período de execução)."""
+    filtros = {
+        "cidade": _parse_text(cidade),
+        "bairro": _parse_text(bairro),
+        "min_valor": _parse_valor(min_valor, "min_valor"),
+        "max_valor": _parse_valor(max_valor, "max_valor"),
+        "data_de": _parse_date(data_de, "data_de"),
+        "data_ate": _parse_date(data_ate, "data_ate"),
+    }
+    if filtros["min_valor"] is not None and filtros["max_valor"] is not None and filtros["min_valor"] > filtros["max_valor"]:
+        raise ValidationError("Faixa de valor inválida.", errors=[{"field": "min_valor", "message": "INVALID_RANGE"}])
+    if filtros["data_de"] and filtros["data_ate"] and filtros["data_de"] > filtros["data_ate"]:
+        raise ValidationError("Período inválido.", errors=[{"field": "data_de", "message": "INVALID_RANGE"}])
+    return filtros
+
+
+def export_key(filtros: Dict[str, Any], fmt: str) -> str:
+    """Hash dos filtros canônicos + formato: identifica o artefato em cache."""
+    raw = json.dumps({"filtros": filtros, "format": fmt}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _data_execucao(cert: CertificadoEntity) -> Optional[date]:
+    value = cert.data_execucao
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and len(value) >= 10:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+class ExportJobQueue(JobQueue):
+    """
+    Exportação em lote de PDFs de certificados por filtros, em segundo plano.
+
+    O job resolve os certificados no servidor, confere o fingerprint de cada
+    PDF e gera os que faltam ou estão desatualizados pelo caminho normal de
+    renderização (``ensure_pdf``, sob o limite ``OP_PDF``) e monta um ZIP ou um PDF
+    único em ``<output_dir>/exports/<hash dos filtros>``. Um novo job com os
+    mesmos filtros reaproveita o artefato se os PDFs selecionados não mudaram.
+    """
+
+    kind = "export"
+
+    def __init__(
+        self,
+        pdf_engine: PdfEngine,
+        repository: CertificadoRepository,
+        store: JobStore,
+        logger=None,
+        workers: int = 1,
+        exports_dir: Optional[Path] = None,
+        metrics: MetricsRegistry | None = None,
+        admission: AdmissionControl | None = None,
+    ):
+        super().__init__(store, logger=logger, workers=workers)
+        self.pdf_engine = pdf_engine
+        self.repository = repository
+        # Renderizações da exportação disputam as mesmas vagas dos downloads
+        self.admission = admission or AdmissionControl.shared()
+        self.exports_dir = Path(exports_dir) if exports_dir else store.jobs_dir.parent / "exports"
+        self.metrics = metrics or MetricsRegistry.shared()
+        # Filtros com job em andamento -> id (pedidos repetidos acompanham o mesmo job)
+        self._active: Dict[str, str] = {}
+
+    async def submit(self, filtros: Dict[str, Any], format: str = "zip") -> Dict[str, Any]:
+        """
+        Valida filtros e formato e enfileira a exportação.
+
+        Raises:
+            ValidationError: Formato desconhecido, filtros inválidos ou PDF único indisponível
+        """
+        fmt = (format or "zip").strip().lower()
+        if fmt not in EXPORT_JOB_FORMATS:
+            raise ValidationError("Formato de exportação inválido. Use zip ou pdf.", errors=[{"field": "format", "message": "INVALID_FORMAT"}])
+        if fmt == "pdf" and not self.pdf_engine.supports_pdf_merge():
+            raise ValidationError("Exportação em PDF único indisponível neste servidor.", errors=[{"field": "format", "message": PDF_MERGE_UNAVAILABLE}])
+        filtros = normalize_export_filters(**filtros)
+        key = export_key(filtros, fmt)
+
+        await self.start()
+        active_id = self._active.get(key)
+        if active_id:
+            job = await asyncio.to_thread(self.store.get, active_id)
+            if job and job.get("status") not in FINISHED_STATES:
+                return job
+        job = await asyncio.to_thread(self.store.create, self.kind, {"filtros": filtros, "format": fmt, "key": key})
+        self._active[key] = job["id"]
+        await self._queue.put(job["id"])
+        if self.logger: self.logger.info("export_job_queued", job_id=job["id"], format=fmt, key=key)
+        return job
+
+    def artifact(self, job: Dict[str, Any]) -> Optional[Path]:
+        """Arquivo pronto para download de um job finalizado com sucesso."""
+        if job.get("kind") != self.kind or job.get("status") != JOB_DONE:
+            return None
+        payload = job.get("payload") or {}
+        path = self._artifact_path(payload.get("key", ""), payload.get("format", ""))
+        return path if path and path.is_file() else None
+
+    async def _run(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if not job or job["status"] in FINISHED_STATES:
+            return
+        payload = job["payload"]
+        started = time.perf_counter()
+        job["status"] = JOB_RUNNING
+        job["started_at"] = _now_iso()
+        self._add_stage(job, "started", started)
+        await self._save(job)
+
+        try:
+            certs = await asyncio.to_thread(self._resolve, payload["filtros"])
+            if not certs:
+                raise ValidationError("Nenhum certificado encontrado para os filtros.", errors=[{"field": "filtros", "message": "NO_MATCHES"}])
+            job["progress"] = {"total": len(certs), "done": 0, "rendered": 0, "missing": 0}
+            self._add_stage(job, "resolved", started)
+            await self._save(job)
+
+            entries, missing = await self._collect(job, certs)
+            if not entries:
+                raise ValidationError("Nenhum PDF disponível para os certificados selecionados.", errors=[{"field": "filtros", "message": "NO_PDFS"}])
+            self._add_stage(job, "pdfs_ready", started)
+            await self._save(job)
+
+            artifact, cached = await asyncio.to_thread(self._assemble, payload["key"], payload["format"], entries)
+            job["status"] = JOB_DONE
+            job["result"] = {
+                "format": payload["format"],
+                "count": len(entries),
+                "missing": missing,
+                "size_bytes": artifact.stat().st_size,
+                "cached": cached,
+            }
+        except ValidationError as e:
+            job["status"] = JOB_FAILED
+            codigo = e.errors[0].get("message") if e.errors and isinstance(e.errors[0], dict) else "VALIDATION_ERROR"
+            job["error"] = {"codigo": codigo, "message": e.message, "detalhes": e.errors}
+        except FeatureUnavailableError as e:
+            job["status"] = JOB_FAILED
+            job["error"] = {"codigo": e.codigo, "message": e.message, "detalhes": e.details}
+        except DomainException as e:
+            job["status"] = JOB_FAILED
+            job["error"] = {"codigo": "EXPORT_ERROR", "message": e.message, "detalhes": e.details}
+        except Exception as e:
+            job["status"] = JOB_FAILED
+            job["error"] = {"codigo": "EXPORT_ERROR", "message": str(e), "detalhes": None}
+        finally:
+            if self._active.get(payload.get("key")) == job_id:
+                self._active.pop(payload.get("key"), None)
+        job["finished_at"] = _now_iso()
+        self._add_stage(job, job["status"], started)
+        await self._save(job)
+        if self.logger: self.logger.info("export_job_finished", job_id=job_id, status=job["status"], elapsed_ms=job["stages"][-1]["elapsed_ms"])
+
+    def _resolve(self, filtros: Dict[str, Any]) -> List[CertificadoEntity]:
+        certs = self.repository.find(
+            bairro=filtros.get("bairro"),
+            cidade=filtros.get("cidade"),
+            min_valor=filtros.get("min_valor"),
+            max_valor=filtros.get("max_valor"),
+        )
+        data_de = date.fromisoformat(filtros["data_de"]) if filtros.get("data_de") else None
+        data_ate = date.fromisoformat(filtros["data_ate"]) if filtros.get("data_ate") else None
+        if not data_de and not data_ate:
+            return certs
+        selecionados = []
+        for cert in certs:
+            executado = _data_execucao(cert)
+            if executado is None:
+                continue
+            if (data_de and executado < data_de) or (data_ate and executado > data_ate):
+                continue
+            selecionados.append(cert)
+        return selecionados
+
+    async def _collect(self, job: Dict[str, Any], certs: List[CertificadoEntity]) -> Tuple[List[Tuple[str, Path]], List[str]]:
+        progress = job["progress"]
+        entries: List[Tuple[str, Path]] = []
+        missing: List[str] = []
+        names: set[str] = set()
+        saved_at = time.monotonic()
+        for cert in certs:
+            try:
+                path, rendered = await self._pdf_for(cert)
+            except DomainException as e:
+                if self.logger: self.logger.warn("export_job_pdf_error", numero=cert.numero_certificado, error=e.message)
+                path, rendered = None, False
+            if path is None:
+                missing.append(cert.numero_certificado)
+                progress["missing"] += 1
+            elif path.name not in names:
+                names.add(path.name)
+                entries.append((path.name, path))
+            progress["done"] += 1
+            progress["rendered"] += int(rendered)
+            if time.monotonic() - saved_at >= _PROGRESS_INTERVAL:
+                await self._save(job)
+                saved_at = time.monotonic()
+        return entries, missing
+
+    async def _pdf_for(self, cert: CertificadoEntity) -> Tuple[Optional[Path], bool]:
+        """PDF atual do certificado (existente ou renderizado agora) e se foi renderizado."""
+        rendered = False
+        bundle = await asyncio.to_thread(self.pdf_engine.get_bundle_by_numero, cert.numero_certificado)
+        if bundle:
+            # Mesma conferência de fingerprint do download individual
+            path = await asyncio.to_thread(pdf_service.current_pdf, bundle, self.pdf_engine)
+            if not path:
+                path, rendered = await self._render(bundle), True
+        else:
+            # Sem bundle não há como conferir: usa o PDF localizado por nome + número
+            path = await asyncio.to_thread(self.repository.get_pdf_path, cert.numero_certificado)
+        if not path or not path.exists():
+            return None, False
+        # Mesmo nome servido no download individual (prefixado pela cidade)
+        if cert.cidade:
+            path = await asyncio.to_thread(pdf_service.ensure_city_prefixed_copy, path, cert.cidade, self.pdf_engine)
+        return path, rendered
+
+    async def _render(self, bundle: Any) -> Path:
+        """Renderiza dentro do limite de ``OP_PDF``; com a fila cheia, espera a vaga em vez de falhar."""
+        while True:
+            try:
+                async with self.admission.slot(OP_PDF):
+                    return await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
+            except OverloadedError as e:
+                await asyncio.sleep(e.retry_after)
+
+    def _assemble(self, key: str, fmt: str, entries: List[Tuple[str, Path]]) -> Tuple[Path, bool]:
+        """Monta o artefato, ou reaproveita o anterior se os PDFs são os mesmos."""
+        artifact = self._artifact_path(key, fmt)
+        meta_path = artifact.with_name(f"{key}.json")
+        content = self._content_signature(entries)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            meta = {}
+        if meta.get("content") == content and artifact.is_file():
+            self.metrics.incr("export.cache.hit")
+            return artifact, True
+
+        self.metrics.incr("export.cache.miss")
+        self.exports_dir.mkdir(parents=True, exist_ok=True)
+        tmp = artifact.with_name(f".{artifact.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            if fmt == "zip":
+                with open(tmp, "wb") as fh:
+                    for chunk in iter_zip(entries):
+                        fh.write(chunk)
+            else:
+                self.pdf_engine.merge_pdfs([path for _, path in entries], tmp)
+            os.replace(tmp, artifact)
+        finally:
+            tmp.unlink(missing_ok=True)
+        meta_tmp = meta_path.with_name(f".{meta_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        meta_tmp.write_text(json.dumps({"content": content, "count": len(entries), "created_at": _now_iso()}), encoding="utf-8")
+        os.replace(meta_tmp, meta_path)
+        return artifact, False
+
+    def _artifact_path(self, key: str, fmt: str) -> Optional[Path]:
+        if not key.isalnum() or fmt not in _ARTIFACT_SUFFIX:
+            return None
+        return self.exports_dir / f"{key}{_ARTIFACT_SUFFIX[fmt]}"
+
+    @staticmethod
+    def _content_signature(entries: List[Tuple[str, Path]]) -> str:
+        digest = hashlib.sha256()
+        for arcname, path in entries:
+            try:
+                st = path.stat()
+                digest.update(f"{arcname}\0{st.st_ino}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+            except FileNotFoundError:
+                digest.update(f"{arcname}\0-\n".encode("utf-8"))
+        return digest.hexdigest()
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
@@ -9,12 +9,14 @@ from backend.domain.services.pdf_engine import PdfEngine
 from backend.domain.repositories import CertificadoRepository
 from backend.domain.entities import CertificadoBundleEntity
 from backend.domain.services import pdf_service
+from backend.domain.services.admission import OP_PDF, AdmissionControl
 from backend.domain.exceptions import CertificadoNotFoundError, DataInconsistencyError
 
 class GetCertificateUseCase:
-    def __init__(self, repository: CertificadoRepository, pdf_engine: PdfEngine):
+    def __init__(self, repository: CertificadoRepository, pdf_engine: PdfEngine, admission: AdmissionControl | None = None):
         self.repository = repository
         self.pdf_engine = pdf_engine
+        self.admission = admission or AdmissionControl.shared()
 
     async def execute(self, id: str) -> Dict[str, Any]:
         # Loading certificate by ID
@@ -26,9 +28,11 @@ class GetCertificateUseCase:
         if not bundle:
             raise DataInconsistencyError("Bundle não encontrado (inconsistência de dados).")
 
-        pdf_path = await asyncio.to_thread(self.repository.get_pdf_path, cert_entity.numero_certificado)
+        # PDF só é reaproveitado se o fingerprint do bundle confere
+        pdf_path = await asyncio.to_thread(pdf_service.current_pdf, bundle, self.pdf_engine)
         if not pdf_path:
-            pdf_path = await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
+            async with self.admission.slot(OP_PDF):
+                pdf_path = await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
             
         planilha_path = self.repository.get_consolidated_spreadsheet_path()
         
@@ -40,26 +44,30 @@ class GetCertificateUseCase:
         }
 
 class DownloadPdfUseCase:
-    def __init__(self, repository: CertificadoRepository, pdf_engine: PdfEngine):
+    def __init__(self, repository: CertificadoRepository, pdf_engine: PdfEngine, admission: AdmissionControl | None = None):
         self.repository = repository
         self.pdf_engine = pdf_engine
+        self.admission = admission or AdmissionControl.shared()
 
     async def execute(self, id: str) -> Path:
         cert_entity = await asyncio.to_thread(self.repository.get_by_id, id)
         if not cert_entity:
             raise CertificadoNotFoundError(identifier=id)
               
-        # Tenta localizar por nome + número para evitar colisões
-        pdf_path = await asyncio.to_thread(self.repository.get_pdf_path, cert_entity.numero_certificado)
+        bundle = await asyncio.to_thread(self.pdf_engine.get_bundle_by_numero, cert_entity.numero_certificado)
+        if bundle:
+            # Confere o fingerprint: PDF desatualizado (dados/template) é renderizado de novo
+            pdf_path = await asyncio.to_thread(pdf_service.current_pdf, bundle, self.pdf_engine)
+            if not pdf_path:
+                async with self.admission.slot(OP_PDF):
+                    pdf_path = await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
+        else:
+            # Sem bundle não há como conferir: serve o PDF localizado por nome + número
+            pdf_path = await asyncio.to_thread(self.repository.get_pdf_path, cert_entity.numero_certificado)
         
         # Sempre garantir a cópia prefixada por cidade quando houver cidade disponível
         if pdf_path and cert_entity.cidade:
             pdf_path = await asyncio.to_thread(pdf_service.ensure_city_prefixed_copy, pdf_path, cert_entity.cidade, self.pdf_engine)
-        elif not pdf_path:
-            # Fallback to regeneration
-            bundle = self.pdf_engine.get_bundle_by_numero(cert_entity.numero_certificado)
-            if bundle:
-                pdf_path = await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
             
         if not pdf_path or not pdf_path.exists():
             raise FileNotFoundError("PDF não encontrado.")
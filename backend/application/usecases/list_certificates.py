@@ -1,9 +1,34 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import base64
+import json
+from typing import Optional, Tuple
 import asyncio
 from backend.domain.repositories import CertificadoRepository
-from backend.application.dtos import CertificadoListItemDTO
+from backend.domain.entities import CertificadoEntity
+from backend.domain.exceptions import ValidationError
+from backend.application.dtos import CertificadoListItemDTO, CertificadoListPageDTO
+
+
+def encode_cursor(key: Tuple[str, str]) -> str:
+    """Codifica a chave (id, número) como cursor opaco."""
+    raw = json.dumps(list(key), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, str]]:
+    """Decodifica o cursor; vazio significa primeira página."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw.decode("utf-8"))
+        if isinstance(key, list) and len(key) == 2 and all(isinstance(k, str) for k in key):
+            return (key[0], key[1])
+    except Exception:
+        pass
+    raise ValidationError("Cursor inválido.", errors=[{"field": "cursor", "message": "INVALID_CURSOR"}])
+
 
 class ListCertificatesUseCase:
     def __init__(self, repository: CertificadoRepository, logger=None):
@@ -19,72 +44,49 @@ class ListCertificatesUseCase:
         max_valor: Optional[float] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> List[CertificadoListItemDTO]:
-        if self.logger: self.logger.info("list_certs_filters", id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor, limit=limit, offset=offset)
-        certificados = await asyncio.to_thread(self.repository.list)
-        
-        filtrados: List[Dict[str, Any]] = []
-        def _norm(s: Any) -> str:
-            try:
-                return str(s).strip().lower()
-            except Exception:
-                return ""
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+    ) -> CertificadoListPageDTO:
+        """
+        Lista certificados filtrados.
 
-        for c in certificados:
-            data = c.to_dict()
-            if id and _norm(data.get("id", "")) != _norm(id):
-                continue
-            if bairro and _norm(data.get("bairro", "")) != _norm(bairro):
-                continue
-            # cidade: permitir startswith e contains para maior flexibilidade
-            if cidade:
-                dc = _norm(data.get("cidade", ""))
-                qc = _norm(cidade)
-                if not (dc == qc or dc.startswith(qc) or qc in dc):
-                    continue
-            v_raw = data.get("valor")
-            def _to_float(val: Any) -> float | None:
-                if val is None:
-                    return None
-                s = str(val).strip()
-                if not s:
-                    return None
-                s = s.replace("R$", "").replace(" ", "")
-                # Trata formatos brasileiros com separador de milhar
-                if "," in s and "." in s:
-                    s = s.replace(".", "").replace(",", ".")
-                elif "," in s and s.count(",") == 1 and s.rfind(",") > s.rfind("."):
-                    s = s.replace(",", ".")
-                try:
-                    return float(s)
-                except Exception:
-                    return None
+        Com ``cursor`` (mesmo vazio) usa paginação por chave ordenada por
+        (id, número) e devolve ``next_cursor``; caso contrário mantém
+        ``limit/offset`` na ordem da engine.
+        """
+        if self.logger: self.logger.info("list_certs_filters", id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor, limit=limit, offset=offset, cursor=cursor)
+        filtros = dict(id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor)
 
-            v = _to_float(v_raw)
-            if min_valor is not None and (v is None or v < min_valor):
-                continue
-            if max_valor is not None and (v is None or v > max_valor):
-                continue
-            filtrados.append(data)
-            
-        respostas: List[CertificadoListItemDTO] = []
-        page_items = filtrados[offset : offset + max(0, limit)]
-        if self.logger: self.logger.debug("list_certs_counts", total=len(certificados), filtrados=len(filtrados), page=len(page_items))
-        
-        for data in page_items:
-            numero = str(data.get("numero_certificado", ""))
-            pdf_path = await asyncio.to_thread(self.repository.get_pdf_path, numero)
-            respostas.append(
-                CertificadoListItemDTO(
-                    id=str(data.get("id", "")),
-                    numero_certificado=numero,
-                    razao_social=str(data.get("razao_social", "")),
-                    bairro=str(data.get("bairro", "")),
-                    cidade=str(data.get("cidade", "")),
-                    valor=data.get("valor"),
-                    data_execucao=data.get("data_execucao"),
-                    urls=None,
-                )
+        if cursor is not None:
+            after = decode_cursor(cursor)
+            page = await asyncio.to_thread(self.repository.find_page, after, limit, **filtros)
+            if self.logger: self.logger.debug("list_certs_counts", total=page.total, page=len(page.items))
+            return CertificadoListPageDTO(
+                items=[self._to_dto(cert) for cert in page.items],
+                next_cursor=encode_cursor(page.next_key) if page.next_key else None,
+                total=page.total if with_total else None,
             )
-            
-        return respostas
+
+        filtrados = await asyncio.to_thread(self.repository.find, **filtros)
+
+        page_items = filtrados[offset : offset + max(0, limit)]
+        if self.logger: self.logger.debug("list_certs_counts", filtrados=len(filtrados), page=len(page_items))
+
+        return CertificadoListPageDTO(
+            items=[self._to_dto(cert) for cert in page_items],
+            total=len(filtrados) if with_total else None,
+        )
+
+    @staticmethod
+    def _to_dto(cert: CertificadoEntity) -> CertificadoListItemDTO:
+        data = cert.to_dict()
+        return CertificadoListItemDTO(
+            id=str(data.get("id", "")),
+            numero_certificado=str(data.get("numero_certificado", "")),
+            razao_social=str(data.get("razao_social", "")),
+            bairro=str(data.get("bairro", "")),
+            cidade=str(data.get("cidade", "")),
+            valor=data.get("valor"),
+            data_execucao=data.get("data_execucao"),
+            urls=None,
+        )
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+from backend.domain.repositories import CertificadoRepository
+from backend.domain.entities import CertificadoEntity
+from backend.domain.exceptions import ValidationError
+from backend.application.dtos import CertificadoSearchItemDTO, CertificadoSearchPageDTO
+
+# Tamanho máximo de página da busca
+MAX_SEARCH_LIMIT = 100
+
+
+class SearchCertificatesUseCase:
+    def __init__(self, repository: CertificadoRepository, logger=None):
+        self.repository = repository
+        self.logger = logger
+
+    async def execute(self, q: str, limit: int = 20, offset: int = 0) -> CertificadoSearchPageDTO:
+        """
+        Busca textual em razão social, CNPJ, número, cidade, bairro, pragas,
+        produtos e métodos; sem acento, com prefixo e ordenada por relevância.
+        """
+        q = (q or "").strip()
+        if not q:
+            raise ValidationError("Informe o termo de busca.", errors=[{"field": "q", "message": "REQUIRED"}])
+        limit = min(max(1, limit), MAX_SEARCH_LIMIT)
+        offset = max(0, offset)
+        if self.logger: self.logger.info("search_certs", q=q, limit=limit, offset=offset)
+
+        page = await asyncio.to_thread(self.repository.search, q, limit, offset)
+        if self.logger: self.logger.debug("search_certs_counts", total=page.total, page=len(page.items))
+        return CertificadoSearchPageDTO(
+            items=[self._to_dto(cert, score) for cert, score in zip(page.items, page.scores)],
+            total=page.total,
+        )
+
+    @staticmethod
+    def _to_dto(cert: CertificadoEntity, score: float) -> CertificadoSearchItemDTO:
+        data = cert.to_dict()
+        return CertificadoSearchItemDTO(
+            id=str(data.get("id", "")),
+            numero_certificado=str(data.get("numero_certificado", "")),
+            razao_social=str(data.get("razao_social", "")),
+            bairro=str(data.get("bairro", "")),
+            cidade=str(data.get("cidade", "")),
+            valor=data.get("valor"),
+            data_execucao=data.get("data_execucao"),
+            urls=None,
+            score=score,
+        )
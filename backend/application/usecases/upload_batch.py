@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+import zipfile
+import zlib
+from pathlib import PurePosixPath
+from typing import List, Optional, Tuple
+
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.repositories import CertificadoRepository
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
+from backend.domain.services.admission import OP_UPLOAD, AdmissionControl
+from backend.domain.services.upload_spool import SpooledUpload, spool_stream
+from backend.domain.exceptions import DomainException, OverloadedError, ValidationError
+from backend.application.dtos import UploadBatchItemDTO, UploadBatchResultDTO
+from backend.application.usecases.upload_excel import ALLOWED_EXTENSIONS, UploadExcelInput, UploadExcelUseCase
+
+# Limites de expansão de ZIP (proteção contra zip bombs)
+MAX_ZIP_MEMBERS = 500
+MAX_ZIP_MEMBER_BYTES = 50 * 1024 * 1024
+MAX_ZIP_TOTAL_BYTES = 500 * 1024 * 1024
+# Tamanho máximo do próprio arquivo .zip enviado
+MAX_ZIP_UPLOAD_BYTES = MAX_ZIP_TOTAL_BYTES
+
+
+class UploadBatchUseCase:
+    """
+    Processa vários workbooks (ou um ZIP de .xlsx) em paralelo.
+
+    Cada arquivo passa pelo ``UploadExcelUseCase`` completo e ocupa sua
+    própria vaga de upload no controle de admissão; no máximo ``max_workers``
+    ficam em andamento ao mesmo tempo. Falhas de um arquivo (inclusive a
+    recusa por sobrecarga) não interrompem o lote: cada item devolve seu
+    próprio status.
+    """
+
+    def __init__(
+        self,
+        pdf_engine: PdfEngine,
+        logger=None,
+        repository: CertificadoRepository | None = None,
+        aggregates: DashboardAggregateStore | None = None,
+        max_workers: int = 4,
+        admission: AdmissionControl | None = None,
+    ):
+        self.pdf_engine = pdf_engine
+        self.logger = logger
+        self.repository = repository
+        self.aggregates = aggregates
+        self.max_workers = max(1, max_workers)
+        self.admission = admission or AdmissionControl.shared()
+
+    async def execute(self, files: List[UploadExcelInput]) -> UploadBatchResultDTO:
+        expanded: List[SpooledUpload] = []
+        try:
+            return await self._execute(files, expanded)
+        finally:
+            for member in expanded:
+                member.discard()
+
+    async def _execute(self, files: List[UploadExcelInput], expanded: List[SpooledUpload]) -> UploadBatchResultDTO:
+        started = time.perf_counter()
+        entries: List[Tuple[UploadExcelInput, Optional[UploadBatchItemDTO]]] = []
+        for inp in files:
+            if PurePosixPath(inp.filename or "").suffix.lower() != ".zip":
+                entries.append((inp, None))
+                continue
+            try:
+                # Descompressão e gravação dos membros fora do event loop
+                members = await asyncio.to_thread(self.expand_zip, inp)
+            except ValidationError as e:
+                entries.append((inp, self._invalid(inp.filename, e)))
+                continue
+            expanded.extend(members)
+            entries.extend((UploadExcelInput.from_spool(member), None) for member in members)
+        if self.logger: self.logger.info("upload_batch_start", files=len(files), workbooks=len(entries), workers=self.max_workers)
+
+        # Arquivos idênticos no mesmo lote: só o primeiro é processado
+        hashes = await asyncio.gather(*(inp.sha256() for inp, _ in entries))
+        items: List[Optional[UploadBatchItemDTO]] = [item for _, item in entries]
+        seen = set()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        tasks = {}
+        for pos, ((inp, preset), file_hash) in enumerate(zip(entries, hashes)):
+            if preset is not None:
+                continue
+            if file_hash in seen:
+                items[pos] = UploadBatchItemDTO(
+                    filename=inp.filename, status="duplicate", codigo="DUPLICATE_FILE", message="Arquivo repetido no lote."
+                )
+                continue
+            seen.add(file_hash)
+            tasks[pos] = asyncio.ensure_future(self._process(inp, semaphore))
+        for pos, task in tasks.items():
+            items[pos] = await task
+
+        result = UploadBatchResultDTO(
+            total=len(items),
+            processados=sum(1 for i in items if i.status == "ok"),
+            duplicados=sum(1 for i in items if i.status == "duplicate"),
+            falhas=sum(1 for i in items if i.status in ("invalid", "error")),
+            elapsed_ms=int((time.perf_counter() - started) * 1000),
+            items=items,
+        )
+        if self.logger: self.logger.info("upload_batch_done", total=result.total, ok=result.processados, duplicados=result.duplicados, falhas=result.falhas, elapsed_ms=result.elapsed_ms)
+        return result
+
+    @staticmethod
+    def expand_zip(inp: UploadExcelInput) -> List[SpooledUpload]:
+        """
+        Extrai os workbooks de um ZIP para arquivos temporários, em blocos
+        (ignora diretórios e arquivos ocultos). Os temporários pertencem ao
+        chamador, que deve descartá-los.
+
+        Os limites valem para os bytes efetivamente descomprimidos, não para
+        os tamanhos declarados no diretório do ZIP.
+        """
+        try:
+            archive = zipfile.ZipFile(inp.file_path if inp.file_path is not None else io.BytesIO(inp.file_bytes or b""))
+        except zipfile.BadZipFile:
+            raise ValidationError("ZIP inválido.", errors=[{"field": "arquivos", "message": "INVALID_ZIP"}])
+        with archive:
+            members = []
+            for info in archive.infolist():
+                path = PurePosixPath(info.filename)
+                if info.is_dir() or any(part.startswith((".", "__MACOSX")) for part in path.parts):
+                    continue
+                if path.suffix.lower() in ALLOWED_EXTENSIONS:
+                    members.append(info)
+            if not members:
+                raise ValidationError("ZIP sem planilhas .xlsx/.xls.", errors=[{"field": "arquivos", "message": "EMPTY_ZIP"}])
+            too_large = ValidationError("ZIP excede os limites do lote.", errors=[{"field": "arquivos", "message": "ZIP_TOO_LARGE"}])
+            if len(members) > MAX_ZIP_MEMBERS or sum(i.file_size for i in members) > MAX_ZIP_TOTAL_BYTES or any(i.file_size > MAX_ZIP_MEMBER_BYTES for i in members):
+                raise too_large
+            spooled: List[SpooledUpload] = []
+            total = 0
+            try:
+                for info in members:
+                    with archive.open(info) as member:
+                        limit = min(MAX_ZIP_MEMBER_BYTES, MAX_ZIP_TOTAL_BYTES - total)
+                        spooled.append(spool_stream(member, PurePosixPath(info.filename).name, max_bytes=limit))
+                    total += spooled[-1].size
+            except ValidationError:
+                for s in spooled:
+                    s.discard()
+                raise too_large
+            except (zipfile.BadZipFile, zlib.error, EOFError):
+                for s in spooled:
+                    s.discard()
+                raise ValidationError("ZIP inválido.", errors=[{"field": "arquivos", "message": "INVALID_ZIP"}])
+            except BaseException:
+                for s in spooled:
+                    s.discard()
+                raise
+            return spooled
+
+    async def _process(self, inp: UploadExcelInput, semaphore: asyncio.Semaphore) -> UploadBatchItemDTO:
+        async with semaphore:
+            started = time.perf_counter()
+            use_case = UploadExcelUseCase(
+                self.pdf_engine,
+                logger=self.logger,
+                repository=self.repository,
+                aggregates=self.aggregates,
+            )
+            try:
+                async with self.admission.slot(OP_UPLOAD):
+                    dto = await use_case.execute(inp)
+                item = UploadBatchItemDTO(
+                    filename=inp.filename,
+                    status="ok",
+                    numero_certificado=dto.numero_certificado,
+                    cert_id=dto.id,
+                    pdf=str(dto.pdf_path.resolve()),
+                    planilha=str(dto.planilha_path.resolve()),
+                )
+            except ValidationError as e:
+                item = self._invalid(inp.filename, e)
+            except OverloadedError as e:
+                if self.logger: self.logger.warn("upload_batch_item_overloaded", filename=inp.filename, retry_after=e.retry_after)
+                item = UploadBatchItemDTO(filename=inp.filename, status="error", codigo="OVERLOADED", message=e.message, detalhes=e.details)
+            except DomainException as e:
+                if self.logger: self.logger.error("upload_batch_item_error", filename=inp.filename, error=e.message)
+                item = UploadBatchItemDTO(filename=inp.filename, status="error", codigo="FILE_PROCESSING_ERROR", message=e.message, detalhes=e.details)
+            except Exception as e:
+                if self.logger: self.logger.error("upload_batch_item_error", filename=inp.filename, error=str(e))
+                item = UploadBatchItemDTO(filename=inp.filename, status="error", codigo="UPLOAD_ERROR", message=str(e))
+            item.elapsed_ms = int((time.perf_counter() - started) * 1000)
+            return item
+
+    @staticmethod
+    def _invalid(filename: str, e: ValidationError) -> UploadBatchItemDTO:
+        duplicate = any(err.get("message") == "DUPLICATE_FILE" for err in e.errors if isinstance(err, dict))
+        return UploadBatchItemDTO(
+            filename=filename,
+            status="duplicate" if duplicate else "invalid",
+            codigo="DUPLICATE_FILE" if duplicate else "VALIDATION_ERROR",
+            message=e.message,
+            detalhes=e.errors,
+        )
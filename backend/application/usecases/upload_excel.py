@@ -2,39 +2,107 @@ from __future__ import annotations
 
 import shutil
 import tempfile
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Tuple
 
 import asyncio
 
 from backend.domain.services.pdf_engine import PdfEngine
-from backend.domain.services.excel_sanitizer import sanitize_excel_for_engine
+from backend.domain.repositories import CertificadoRepository
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
+from backend.domain.services.certificado_index import engine_data_signature
+from backend.domain.services.excel_sanitizer import inspect_workbook, sanitize_excel_for_engine
+from backend.domain.services.metrics import MetricsRegistry
 from backend.domain.exceptions import ValidationError, DataInconsistencyError
 from backend.domain.services import pdf_service
 from backend.application.dtos import CertificateCreatedDTO
 from backend.domain.services.processed_files_index import ProcessedFilesIndex
+from backend.domain.services.single_flight import SingleFlight
+from backend.domain.services.upload_spool import SpooledUpload, sha256_file
 from datetime import datetime, timezone
 
 ALLOWED_EXTENSIONS = {".xlsx", ".xls"}
 
 class UploadExcelInput:
+    """
+    Arquivo a processar: em memória (``file_bytes``) ou já gravado em disco
+    (``file_path``, opcionalmente com ``file_hash`` calculado no spool). O
+    arquivo em disco pertence a quem criou a entrada e não é removido aqui.
+    """
     filename: str
-    file_bytes: bytes
-
-    def __init__(self, filename: str, file_bytes: bytes):
+    file_bytes: bytes | None
+    file_path: Path | None
+    file_hash: str | None
+
+    def __init__(
+        self,
+        filename: str,
+        file_bytes: bytes | None = None,
+        file_path: Path | None = None,
+        file_hash: str | None = None,
+    ):
         self.filename = filename
         self.file_bytes = file_bytes
+        self.file_path = file_path
+        self.file_hash = file_hash
+
+    @classmethod
+    def from_spool(cls, spooled: SpooledUpload) -> "UploadExcelInput":
+        return cls(filename=spooled.filename, file_path=spooled.path, file_hash=spooled.sha256)
+
+    @property
+    def size(self) -> int:
+        if self.file_path is not None:
+            return self.file_path.stat().st_size
+        return len(self.file_bytes or b"")
+
+    async def read_bytes(self) -> bytes:
+        if self.file_path is not None:
+            return await asyncio.to_thread(self.file_path.read_bytes)
+        return self.file_bytes or b""
+
+    async def sha256(self) -> str:
+        if self.file_hash:
+            return self.file_hash
+        if self.file_path is not None:
+            return await asyncio.to_thread(sha256_file, self.file_path)
+        return await asyncio.to_thread(ProcessedFilesIndex.sha256_bytes, self.file_bytes or b"")
+
+
+def validate_filename(filename: str) -> str:
+    """Valida a extensão do workbook e devolve o sufixo normalizado."""
+    suffix = Path(filename or "").suffix.lower()
+    if suffix not in ALLOWED_EXTENSIONS:
+        raise ValidationError("Formato de arquivo inválido. Use .xlsx ou .xls.")
+    return suffix
 
 
 class UploadExcelUseCase:
-    def __init__(self, pdf_engine: PdfEngine, logger=None):
+    def __init__(
+        self,
+        pdf_engine: PdfEngine,
+        logger=None,
+        repository: CertificadoRepository | None = None,
+        aggregates: DashboardAggregateStore | None = None,
+    ):
         self.pdf_engine = pdf_engine
-        self._index = ProcessedFilesIndex(self.pdf_engine.get_pdf_generator().output_dir)
+        output_dir = self.pdf_engine.get_pdf_generator().output_dir
+        self._index = ProcessedFilesIndex.for_dir(output_dir)
+        self._flights = SingleFlight.for_dir(output_dir)
+        self._metrics = MetricsRegistry.shared()
         self.logger = logger
-
-    async def execute(self, inp: UploadExcelInput) -> CertificateCreatedDTO:
-        file_hash = await asyncio.to_thread(ProcessedFilesIndex.sha256_bytes, inp.file_bytes)
-        if self.logger: self.logger.info("upload_excel_received", filename=inp.filename, size=len(inp.file_bytes))
+        self.repository = repository
+        self.aggregates = aggregates
+
+    async def execute(self, inp: UploadExcelInput, on_stage: Callable[[str], None] | None = None) -> CertificateCreatedDTO:
+        """
+        Processa o workbook. ``on_stage`` (opcional) é chamado ao fim de cada
+        etapa: ``parsed``, ``pdf_ready`` e ``indexed``.
+        """
+        notify = on_stage or (lambda stage: None)
+        file_hash = await inp.sha256()
+        if self.logger: self.logger.info("upload_excel_received", filename=inp.filename, size=inp.size)
         if self._index.exists(file_hash):
             if self.logger: self.logger.warn("upload_excel_duplicate_file")
             raise ValidationError("Arquivo já processado.", errors=[{"field": "arquivo", "message": "DUPLICATE_FILE"}])
@@ -43,29 +111,50 @@ class UploadExcelUseCase:
             if self.logger: self.logger.warn("upload_excel_invalid_extension", suffix=suffix)
             raise ValidationError("Formato de arquivo inválido. Use .xlsx ou .xls.")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_handle:
-            temp_path = Path(tmp_handle.name)
+        # Mesmo conteúdo já em processamento: aguarda o resultado em vez de refazer
+        dto, shared = await self._flights.run(file_hash, lambda: self._process(inp, file_hash, suffix, notify))
+        if shared and self.logger:
+            self.logger.info("upload_excel_joined_inflight", filename=inp.filename, numero=dto.numero_certificado)
+        return dto
+
+    async def _process(self, inp: UploadExcelInput, file_hash: str, suffix: str, notify: Callable[[str], None]) -> CertificateCreatedDTO:
+        # Rechecado dentro do single-flight: um upload idêntico pode ter terminado
+        # entre a checagem acima e a entrada no registro
+        if self._index.exists(file_hash):
+            if self.logger: self.logger.warn("upload_excel_duplicate_file")
+            raise ValidationError("Arquivo já processado.", errors=[{"field": "arquivo", "message": "DUPLICATE_FILE"}])
+
+        sanitized_path: Path | None = None
+        # Entrada já em disco (spool) é usada diretamente, sem nova cópia
+        owns_temp = inp.file_path is None
+        if owns_temp:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_handle:
+                temp_path = Path(tmp_handle.name)
+        else:
+            temp_path = inp.file_path
 
         try:
-            with temp_path.open("wb") as destino:
-                destino.write(inp.file_bytes)
-            if self.logger: self.logger.debug("upload_temp_written", path=str(temp_path))
+            if owns_temp:
+                with temp_path.open("wb") as destino:
+                    destino.write(inp.file_bytes or b"")
+                if self.logger: self.logger.debug("upload_temp_written", path=str(temp_path))
 
-            try:
-                if self.logger: self.logger.info("engine_process_upload", path=str(temp_path))
-                resultado = await asyncio.to_thread(self.pdf_engine.processar_upload, temp_path)
-            except Exception:
-                safe_path = await asyncio.to_thread(sanitize_excel_for_engine, temp_path)
-                if self.logger: self.logger.warn("sanitize_applied", original=str(temp_path), safe=str(safe_path))
-                resultado = await asyncio.to_thread(self.pdf_engine.processar_upload, safe_path)
+            # Assinatura dos CSVs antes da gravação: permite aplicar só o delta deste certificado nos índices
+            before = engine_data_signature(self.pdf_engine)
+            resultado, sanitized_path = await self._parse(temp_path)
 
             certificado = resultado["certificado"]
             planilha_path = Path(resultado["planilha"])
+            notify("parsed")
 
             bundle = self.pdf_engine.get_bundle_by_numero(certificado.numero_certificado)
             if not bundle:
                 if self.logger: self.logger.error("bundle_missing", numero=str(certificado.numero_certificado))
                 raise DataInconsistencyError("Falha ao recuperar dados persistidos do certificado.")
+            if self.repository:
+                self.repository.register(bundle, before)
+            if self.aggregates:
+                self.aggregates.apply(bundle, before)
 
             pdf_path = await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
             # Garantir nome único por cidade
@@ -76,6 +165,7 @@ class UploadExcelUseCase:
             if cidade:
                 pdf_path = await asyncio.to_thread(pdf_service.ensure_city_prefixed_copy, pdf_path, cidade, self.pdf_engine)
             if self.logger: self.logger.info("pdf_ready", output=str(pdf_path))
+            notify("pdf_ready")
 
             cert_id = certificado.to_dict().get("id")
             # Registra arquivo processado
@@ -92,6 +182,7 @@ class UploadExcelUseCase:
             except Exception:
                 if self.logger: self.logger.warn("index_add_failed")
                 pass
+            notify("indexed")
 
             return CertificateCreatedDTO(
                 id=cert_id,
@@ -103,7 +194,59 @@ class UploadExcelUseCase:
 
         finally:
             try:
-                temp_path.unlink(missing_ok=True)
-                if self.logger: self.logger.debug("upload_temp_unlink", path=str(temp_path))
+                if sanitized_path is not None:
+                    sanitized_path.unlink(missing_ok=True)
+                if owns_temp:
+                    temp_path.unlink(missing_ok=True)
+                    if self.logger: self.logger.debug("upload_temp_unlink", path=str(temp_path))
             except PermissionError:
                 pass
+
+    async def _parse(self, temp_path: Path) -> Tuple[Dict[str, Any], Path | None]:
+        """
+        Executa o parse do engine decidindo antes, pela região de cabeçalho,
+        se a planilha precisa de sanitização; no caso comum há um único parse.
+        O caminho tomado é contado em ``upload.preflight.*``.
+
+        Returns:
+            ``(resultado do engine, cópia sanitizada ou None)``.
+        """
+        plan = None
+        inspected = False
+        started = time.perf_counter()
+        try:
+            plan = await asyncio.to_thread(inspect_workbook, temp_path)
+            inspected = True
+        except Exception as e:
+            # .xls ou arquivo ilegível pelo openpyxl: segue o fluxo tradicional
+            if self.logger: self.logger.debug("preflight_inspect_failed", error=str(e))
+        self._metrics.observe("upload.preflight.inspect_ms", (time.perf_counter() - started) * 1000)
+
+        sanitized_path = None
+        if plan is not None:
+            sanitized_path = await asyncio.to_thread(sanitize_excel_for_engine, temp_path, plan)
+            if self.logger: self.logger.info("sanitize_preflight", original=str(temp_path), safe=str(sanitized_path))
+            path_taken = "sanitized"
+        else:
+            path_taken = "clean" if inspected else "uninspected"
+
+        try:
+            if self.logger: self.logger.info("engine_process_upload", path=str(sanitized_path or temp_path))
+            self._metrics.incr("upload.engine_parses")
+            resultado = await asyncio.to_thread(self.pdf_engine.processar_upload, sanitized_path or temp_path)
+        except Exception:
+            if sanitized_path is not None:
+                self._metrics.incr("upload.preflight.sanitized_failed")
+                raise
+            # Inspeção não previu a falha: sanitização completa e novo parse
+            self._metrics.incr(f"upload.preflight.{path_taken}_miss")
+            safe_path = await asyncio.to_thread(sanitize_excel_for_engine, temp_path)
+            if safe_path == temp_path:
+                raise
+            sanitized_path = safe_path
+            if self.logger: self.logger.warn("sanitize_applied", original=str(temp_path), safe=str(safe_path))
+            self._metrics.incr("upload.engine_parses")
+            resultado = await asyncio.to_thread(self.pdf_engine.processar_upload, safe_path)
+            path_taken = "fallback"
+        self._metrics.incr(f"upload.preflight.{path_taken}")
+        return resultado, sanitized_path
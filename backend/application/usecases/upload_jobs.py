@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+from abc import ABC, abstractmethod
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.repositories import CertificadoRepository
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
+from backend.domain.services.job_store import (
+    FINISHED_STATES,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JobStore,
+)
+from backend.domain.services.processed_files_index import ProcessedFilesIndex
+from backend.domain.exceptions import DomainException, ValidationError
+from backend.application.usecases.upload_excel import UploadExcelInput, UploadExcelUseCase, validate_filename
+
+# Jobs finalizados são mantidos em disco por este período
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+class JobQueue(ABC):
+    """
+    Fila de jobs processados em segundo plano por tarefas asyncio.
+
+    O estado de cada job fica no ``JobStore`` (compartilhado entre os tipos de
+    job, separados por ``kind``); jobs não finalizados do tipo da fila são
+    reenfileirados em ``start`` após um reinício. Subclasses implementam
+    ``_run`` (abstrato).
+    """
+
+    kind = "job"
+
+    def __init__(self, store: JobStore, logger=None, workers: int = 1):
+        self.store = store
+        self.logger = logger
+        self.workers = max(1, workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._changed: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._changed = asyncio.Condition()
+        await asyncio.to_thread(self.store.prune, JOB_RETENTION_SECONDS)
+        pending = await asyncio.to_thread(self.store.pending, self.kind)
+        for job in pending:
+            if job["status"] == JOB_RUNNING:
+                # Interrompido por reinício: volta para a fila
+                job["status"] = JOB_QUEUED
+                self._add_stage(job, "requeued")
+                await asyncio.to_thread(self.store.save, job)
+            await self._queue.put(job["id"])
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.logger: self.logger.info(f"{self.kind}_jobs_started", workers=self.workers, resumed=len(pending))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """Aguarda a próxima atualização de qualquer job; False se expirou."""
+        if self._changed is None:
+            await asyncio.sleep(timeout)
+            return False
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                if self.logger: self.logger.error(f"{self.kind}_job_crashed", job_id=job_id, error=str(e))
+            finally:
+                self._queue.task_done()
+
+    @abstractmethod
+    async def _run(self, job_id: str) -> None:
+        """Processa o job ``job_id`` e registra estágios e resultado no ``JobStore``."""
+        ...
+
+    async def _save(self, job: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.store.save, job)
+        await self._notify()
+
+    async def _notify(self) -> None:
+        if self._changed is None:
+            return
+        async with self._changed:
+            self._changed.notify_all()
+
+    @staticmethod
+    def _add_stage(job: Dict[str, Any], stage: str, started: Optional[float] = None) -> None:
+        elapsed = int((time.perf_counter() - started) * 1000) if started is not None else None
+        job["stages"].append({"stage": stage, "at": _now_iso(), "elapsed_ms": elapsed})
+
+
+class UploadJobQueue(JobQueue):
+    """
+    Fila de uploads processados em segundo plano.
+
+    ``submit`` grava a entrada e o estado do job em disco e retorna na hora;
+    ``workers`` tarefas asyncio executam o ``UploadExcelUseCase`` registrando
+    cada etapa (parsed, pdf_ready, indexed) com o tempo decorrido. Jobs não
+    finalizados são reenfileirados em ``start`` após um reinício.
+    """
+
+    kind = "upload"
+
+    def __init__(
+        self,
+        pdf_engine: PdfEngine,
+        store: JobStore,
+        logger=None,
+        repository: CertificadoRepository | None = None,
+        aggregates: DashboardAggregateStore | None = None,
+        workers: int = 2,
+    ):
+        super().__init__(store, logger=logger, workers=workers)
+        self.pdf_engine = pdf_engine
+        self.repository = repository
+        self.aggregates = aggregates
+
+    async def submit(self, inp: UploadExcelInput) -> Dict[str, Any]:
+        """Valida o básico (extensão e duplicidade) e enfileira o upload."""
+        validate_filename(inp.filename)
+        file_hash = await inp.sha256()
+        index = ProcessedFilesIndex.for_dir(self.pdf_engine.get_pdf_generator().output_dir)
+        if await asyncio.to_thread(index.exists, file_hash):
+            raise ValidationError("Arquivo já processado.", errors=[{"field": "arquivo", "message": "DUPLICATE_FILE"}])
+
+        await self.start()
+        job = await asyncio.to_thread(
+            self.store.create,
+            self.kind,
+            {"filename": inp.filename, "size": inp.size, "hash": file_hash},
+            inp.file_bytes,
+            inp.file_path,
+        )
+        await self._queue.put(job["id"])
+        if self.logger: self.logger.info("upload_job_queued", job_id=job["id"], filename=inp.filename)
+        return job
+
+    async def _run(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if not job or job["status"] in FINISHED_STATES:
+            return
+        started = time.perf_counter()
+        job["status"] = JOB_RUNNING
+        job["started_at"] = _now_iso()
+        self._add_stage(job, "started", started)
+        await self._save(job)
+
+        # Etapas gravadas fora do event loop, em ordem (Lock é FIFO) e sobre
+        # cópias do estado; o estado final só é gravado depois delas
+        stage_saves: List[asyncio.Task] = []
+        save_lock = asyncio.Lock()
+
+        async def save_stage(state: Dict[str, Any]) -> None:
+            async with save_lock:
+                await self._save(state)
+
+        def on_stage(stage: str) -> None:
+            self._add_stage(job, stage, started)
+            stage_saves.append(asyncio.get_running_loop().create_task(save_stage(copy.deepcopy(job))))
+
+        try:
+            use_case = UploadExcelUseCase(
+                self.pdf_engine,
+                logger=self.logger,
+                repository=self.repository,
+                aggregates=self.aggregates,
+            )
+            inp = UploadExcelInput(
+                filename=job["payload"].get("filename") or "",
+                file_path=self.store.input_path(job_id),
+                file_hash=job["payload"].get("hash"),
+            )
+            dto = await use_case.execute(inp, on_stage=on_stage)
+            job["status"] = JOB_DONE
+            job["result"] = {
+                "numero_certificado": dto.numero_certificado,
+                "cert_id": dto.id,
+                "pdf": str(dto.pdf_path.resolve()),
+                "planilha": str(dto.planilha_path.resolve()),
+            }
+        except ValidationError as e:
+            duplicate = any(isinstance(err, dict) and err.get("message") == "DUPLICATE_FILE" for err in e.errors)
+            job["status"] = JOB_FAILED
+            job["error"] = {"codigo": "DUPLICATE_FILE" if duplicate else "VALIDATION_ERROR", "message": e.message, "detalhes": e.errors}
+        except DomainException as e:
+            job["status"] = JOB_FAILED
+            job["error"] = {"codigo": "FILE_PROCESSING_ERROR", "message": e.message, "detalhes": e.details}
+        except Exception as e:
+            job["status"] = JOB_FAILED
+            job["error"] = {"codigo": "UPLOAD_ERROR", "message": str(e), "detalhes": None}
+        job["finished_at"] = _now_iso()
+        self._add_stage(job, job["status"], started)
+        # Entrada descartada antes de publicar o estado final (quem observa "done"/"failed" não a vê mais)
+        await asyncio.to_thread(self.store.discard_input, job_id)
+        await asyncio.gather(*stage_saves, return_exceptions=True)
+        await self._save(job)
+        if self.logger: self.logger.info("upload_job_finished", job_id=job_id, status=job["status"], elapsed_ms=job["stages"][-1]["elapsed_ms"])
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
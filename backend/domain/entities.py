@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 # In a strict clean arch, we would define our own entities here.
@@ -61,3 +61,19 @@ class CertificadoBundleEntity:
     certificado: CertificadoEntity
     produtos: List[ProdutoEntity]
     metodos: List[MetodoEntity]
+
+
+@dataclass
+class CertificadoPage:
+    """Página de certificados ordenada pela chave estável (id, número)."""
+    items: List[CertificadoEntity]
+    next_key: Optional[Tuple[str, str]]
+    total: int
+
+
+@dataclass
+class CertificadoSearchPage:
+    """Página da busca textual, do certificado mais relevante ao menos relevante."""
+    items: List[CertificadoEntity]
+    scores: List[float]
+    total: int
@@ -41,6 +41,15 @@ class FileProcessingError(DomainException):
         self.file_path = file_path
 
 
+class PdfDeletionError(FileProcessingError):
+    """Levantada quando parte dos arquivos de uma remoção não pôde ser apagada"""
+    
+    def __init__(self, message: str, removed: List[str], failed: List[Dict[str, str]]):
+        super().__init__(message, details={"removed": removed, "failed": failed})
+        self.removed = removed
+        self.failed = failed
+
+
 class PdfGenerationError(DomainException):
     """Levantada quando há erro na geração de PDF"""
     
@@ -54,3 +63,20 @@ class DataInconsistencyError(DomainException):
     
     def __init__(self, message: str, details: Optional[Any] = None):
         super().__init__(message, details)
+
+
+class OverloadedError(DomainException):
+    """Levantada quando a fila de uma operação pesada está cheia"""
+    
+    def __init__(self, message: str, operation: str, retry_after: int = 1):
+        super().__init__(message, {"operation": operation, "retry_after": retry_after})
+        self.operation = operation
+        self.retry_after = retry_after
+
+
+class FeatureUnavailableError(DomainException):
+    """Levantada quando um recurso opcional não está disponível neste servidor"""
+    
+    def __init__(self, message: str, codigo: str, details: Optional[Any] = None):
+        super().__init__(message, details)
+        self.codigo = codigo
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Protocol
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple
 from pathlib import Path
 
-from backend.domain.entities import CertificadoEntity
+from backend.domain.entities import CertificadoEntity, CertificadoPage, CertificadoSearchPage
+from backend.domain.services.certificado_snapshot import CertificadoSnapshot
 
 class CertificadoRepository(ABC):
     @abstractmethod
@@ -12,6 +13,51 @@ class CertificadoRepository(ABC):
         """Lista todos os certificados disponíveis."""
         ...
 
+    @abstractmethod
+    def find(
+        self,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> List[CertificadoEntity]:
+        """Filtra certificados (id/bairro exatos, cidade por substring, faixa de valor)."""
+        ...
+
+    @abstractmethod
+    def find_page(
+        self,
+        after: Optional[Tuple[str, str]],
+        limit: int,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> CertificadoPage:
+        """Página de certificados após a chave ``after`` (id, número), com o total filtrado."""
+        ...
+
+    @abstractmethod
+    def scan(
+        self,
+        after: Optional[Tuple[str, str]],
+        limit: int,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> Tuple[List[CertificadoEntity], Optional[Tuple[str, str]]]:
+        """Próximo bloco após ``after`` na ordem (id, número) e a chave para continuar, sem total (varreduras completas)."""
+        ...
+
+    @abstractmethod
+    def search(self, q: str, limit: int = 20, offset: int = 0) -> CertificadoSearchPage:
+        """Busca textual (sem acento, por prefixo) ordenada por relevância, com o total de resultados."""
+        ...
+
     @abstractmethod
     def get_by_id(self, id: str) -> Optional[CertificadoEntity]:
         """Busca um certificado pelo ID único."""
@@ -22,10 +68,35 @@ class CertificadoRepository(ABC):
         """Busca um certificado pelo número do certificado (chave de negócio)."""
         ...
 
+    @abstractmethod
+    def get_by_cnpj(self, cnpj: str) -> List[CertificadoEntity]:
+        """Lista os certificados de um CNPJ (com ou sem pontuação)."""
+        ...
+
+    @abstractmethod
+    def snapshot(self) -> CertificadoSnapshot:
+        """Snapshot colunar dos certificados para agregações (refeito quando os dados mudam)."""
+        ...
+
+    @abstractmethod
+    def register(self, bundle: Any, before: Any) -> None:
+        """
+        Atualiza os índices após a persistência de um certificado (upload ou manual).
+
+        ``before`` é a assinatura dos dados lida antes da gravação; se outro
+        writer gravou nesse meio-tempo, os índices são reconstruídos.
+        """
+        ...
+
     @abstractmethod
     def get_pdf_path(self, numero: str) -> Optional[Path]:
         """Retorna o caminho do PDF se existir."""
         ...
+
+    @abstractmethod
+    def get_pdf_paths(self, numeros: Iterable[str]) -> Dict[str, Optional[Path]]:
+        """Resolve de uma vez os caminhos de PDF de vários certificados (ex.: uma página da listagem)."""
+        ...
     
     @abstractmethod
     def get_consolidated_spreadsheet_path(self) -> Path:
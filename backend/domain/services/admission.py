@@ -0,0 +1,124 @@
+"""
+Domain Service - Controle de admissão de operações pesadas
+Cada operação (upload, criação manual, geração de PDF) tem um limite de
+execuções simultâneas e uma fila de espera limitada; com a fila cheia a
+requisição é recusada na hora (``OverloadedError`` -> 429 + Retry-After)
+em vez de ficar presa atrás das renderizações.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from backend.domain.exceptions import OverloadedError
+from backend.domain.services.metrics import MetricsRegistry
+
+OP_UPLOAD = "upload"
+OP_MANUAL = "manual"
+OP_PDF = "pdf"
+
+# (execuções simultâneas, posições na fila); ADMISSION_<OP>_LIMIT / ADMISSION_<OP>_QUEUE sobrescrevem
+DEFAULT_LIMITS: Dict[str, Tuple[int, int]] = {
+    OP_UPLOAD: (4, 16),
+    OP_MANUAL: (2, 8),
+    OP_PDF: (os.cpu_count() or 1, 32),
+}
+
+
+class AdmissionLimiter:
+    """Semáforo com fila de espera limitada para uma operação."""
+
+    def __init__(self, name: str, limit: int, queue: int, metrics: MetricsRegistry | None = None):
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue = max(0, queue)
+        self.metrics = metrics or MetricsRegistry.shared()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._active = 0
+        self._waiting = 0
+        # Média móvel do tempo de execução, usada para estimar o Retry-After
+        self._avg_hold = 1.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Ocupa uma vaga da operação durante o bloco.
+
+        Raises:
+            OverloadedError: Todas as vagas ocupadas e a fila de espera cheia.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        if self._active >= self.limit and self._waiting >= self.queue:
+            self.metrics.incr(f"admission.{self.name}.rejected")
+            raise OverloadedError(
+                f"Servidor ocupado ({self.name}). Tente novamente em instantes.",
+                operation=self.name,
+                retry_after=self.retry_after(),
+            )
+        self._waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        started = time.perf_counter()
+        self.metrics.observe(f"admission.{self.name}.wait_ms", (started - queued_at) * 1000)
+        self.metrics.incr(f"admission.{self.name}.admitted")
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * (time.perf_counter() - started)
+
+    def retry_after(self) -> int:
+        """Segundos estimados até liberar uma vaga para quem está na fila."""
+        rounds = (self._waiting + 1) / self.limit
+        return max(1, math.ceil(rounds * self._avg_hold))
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"limit": self.limit, "queue": self.queue, "active": self._active, "waiting": self._waiting}
+
+
+class AdmissionControl:
+    """Limitadores por operação, compartilhados pelo processo (``shared``)."""
+
+    _shared: Optional["AdmissionControl"] = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "AdmissionControl":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls.from_env()
+            return cls._shared
+
+    @classmethod
+    def from_env(cls) -> "AdmissionControl":
+        limits = {}
+        for op, (limit, queue) in DEFAULT_LIMITS.items():
+            limits[op] = (
+                int(os.getenv(f"ADMISSION_{op.upper()}_LIMIT", str(limit))),
+                int(os.getenv(f"ADMISSION_{op.upper()}_QUEUE", str(queue))),
+            )
+        return cls(limits)
+
+    def __init__(self, limits: Dict[str, Tuple[int, int]], metrics: MetricsRegistry | None = None):
+        self._limiters = {op: AdmissionLimiter(op, limit, queue, metrics) for op, (limit, queue) in limits.items()}
+
+    def slot(self, operation: str):
+        """Atalho para ``limiter(operation).slot()``."""
+        return self._limiters[operation].slot()
+
+    def limiter(self, operation: str) -> AdmissionLimiter:
+        return self._limiters[operation]
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {op: limiter.snapshot() for op, limiter in self._limiters.items()}
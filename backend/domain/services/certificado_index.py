@@ -0,0 +1,445 @@
+"""
+Domain Service - Índice de certificados em memória
+Tabelas hash por id, número e CNPJ para consultas em tempo constante, e índices
+secundários (bairro, cidade, valor) para os filtros da listagem.
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.domain.entities import CertificadoEntity, CertificadoPage
+
+# Assinatura dos arquivos de dados da engine: (caminho, mtime_ns, tamanho)
+Signature = Tuple[Tuple[str, int, int], ...]
+
+# Arquivos da engine cuja alteração invalida os índices/agregados em memória
+DATA_FILES = ("certificados_path", "produtos_path", "metodos_path")
+
+
+def normalize_cnpj(cnpj: Any) -> str:
+    """Mantém apenas os dígitos do CNPJ."""
+    return "".join(ch for ch in str(cnpj or "") if ch.isdigit())
+
+
+def normalize_text(s: Any) -> str:
+    """Normalização usada pelos filtros da listagem (sem acento-folding)."""
+    try:
+        return str(s).strip().lower()
+    except Exception:
+        return ""
+
+
+def parse_valor(val: Any) -> float | None:
+    """Converte valores monetários ("R$ 1.500,00", "1500.5") para float."""
+    if val is None:
+        return None
+    s = str(val).strip()
+    if not s:
+        return None
+    s = s.replace("R$", "").replace(" ", "")
+    # Trata formatos brasileiros com separador de milhar
+    if "," in s and "." in s:
+        s = s.replace(".", "").replace(",", ".")
+    elif "," in s and s.count(",") == 1 and s.rfind(",") > s.rfind("."):
+        s = s.replace(",", ".")
+    try:
+        v = float(s)
+    except Exception:
+        return None
+    return v if v == v else None
+
+
+def file_signature(paths: Iterable[Optional[Path]]) -> Signature:
+    """Calcula a assinatura (mtime/tamanho) de um conjunto de arquivos."""
+    sig: List[Tuple[str, int, int]] = []
+    for path in paths:
+        if not path:
+            continue
+        try:
+            st = os.stat(path)
+            sig.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append((str(path), -1, -1))
+    return tuple(sig)
+
+
+def engine_data_signature(pdf_engine: Any) -> Signature:
+    """Assinatura dos CSVs de dados da engine (certificados, produtos, métodos)."""
+    csv_manager = pdf_engine.get_csv_manager()
+    return file_signature(getattr(csv_manager, attr, None) for attr in DATA_FILES)
+
+
+def _trigrams(s: str) -> Set[str]:
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+class CertificadoIndex:
+    """
+    Índice em memória dos certificados da engine.
+
+    Reconstruído por completo quando a assinatura dos CSVs muda e atualizado
+    incrementalmente (upsert) pelos fluxos de escrita da aplicação.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entities: List[CertificadoEntity] = []
+        self._by_id: Dict[str, int] = {}
+        self._by_numero: Dict[str, int] = {}
+        self._by_cnpj: Dict[str, List[int]] = {}
+        self._reset_secondary()
+        self._signature: Optional[Signature] = None
+        self.version = 0
+
+    def refresh(self, signature: Signature, loader: Callable[[], List[CertificadoEntity]]) -> None:
+        """Reconstrói o índice se a assinatura dos arquivos de dados mudou."""
+        with self._lock:
+            if self._signature == signature:
+                return
+            self._rebuild(loader(), signature)
+
+    def invalidate(self) -> None:
+        """Força reconstrução na próxima consulta."""
+        with self._lock:
+            self._signature = None
+
+    def upsert(self, entity: CertificadoEntity, before: Signature, after: Signature) -> None:
+        """
+        Insere ou substitui um certificado recém-persistido.
+
+        ``before``/``after`` são as assinaturas dos CSVs lidas antes e depois
+        da gravação. Só quando ``before`` é a assinatura já indexada o
+        certificado é o único dado novo e ``after`` pode ser carimbada; do
+        contrário outro writer também gravou e o índice é invalidado. Se o
+        índice ainda não foi construído não há nada a atualizar: a primeira
+        consulta fará a carga completa.
+        """
+        with self._lock:
+            if self._signature is None:
+                return
+            if self._signature != before:
+                self._signature = None
+                return
+            pos = self._by_numero.get(entity.numero_certificado)
+            if pos is None and entity.id:
+                pos = self._by_id.get(entity.id)
+            if pos is None:
+                pos = len(self._entities)
+                self._entities.append(entity)
+                self._id_norm.append("")
+                self._bairro_norm.append("")
+                self._cidade_norm.append("")
+                self._valores.append(None)
+            else:
+                self._unlink(pos)
+                self._entities[pos] = entity
+            self._link(pos)
+            self._signature = after
+            self.version += 1
+
+    def get_by_id(self, id: str) -> Optional[CertificadoEntity]:
+        with self._lock:
+            pos = self._by_id.get(id)
+            return self._entities[pos] if pos is not None else None
+
+    def get_by_numero(self, numero: str) -> Optional[CertificadoEntity]:
+        with self._lock:
+            pos = self._by_numero.get(numero)
+            return self._entities[pos] if pos is not None else None
+
+    def get_by_cnpj(self, cnpj: str) -> List[CertificadoEntity]:
+        with self._lock:
+            return [self._entities[pos] for pos in self._by_cnpj.get(normalize_cnpj(cnpj), [])]
+
+    def all(self) -> List[CertificadoEntity]:
+        with self._lock:
+            return list(self._entities)
+
+    def versioned(self) -> Tuple[int, List[CertificadoEntity]]:
+        """Versão atual e cópia das entidades, lidas de forma atômica."""
+        with self._lock:
+            return self.version, list(self._entities)
+
+    def find(
+        self,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> List[CertificadoEntity]:
+        """
+        Filtra certificados pelos índices secundários, preservando a ordem da engine.
+
+        O filtro mais seletivo gera os candidatos; os demais são verificados por
+        posição, de modo que o custo acompanha o tamanho do resultado.
+        """
+        with self._lock:
+            positions = self._find_positions(id, bairro, cidade, min_valor, max_valor)
+            if positions is None:
+                return list(self._entities)
+            return [self._entities[pos] for pos in positions]
+
+    def page(
+        self,
+        after: Optional[Tuple[str, str]],
+        limit: int,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> CertificadoPage:
+        """
+        Paginação por chave (keyset) ordenada por (id, número do certificado).
+
+        Sem filtros a página sai direto do array ordenado por bisseção; com
+        filtros apenas o resultado filtrado é ordenado. O total vem do índice.
+        """
+        with self._lock:
+            positions = self._find_positions(id, bairro, cidade, min_valor, max_valor)
+            if positions is None:
+                keyed = self._by_key
+            else:
+                keyed = sorted((self._sort_key(pos), pos) for pos in positions)
+            start = bisect.bisect_right(keyed, (tuple(after), sys.maxsize)) if after else 0
+            chunk = keyed[start : start + max(0, limit)]
+            has_more = start + len(chunk) < len(keyed)
+            return CertificadoPage(
+                items=[self._entities[pos] for _, pos in chunk],
+                next_key=chunk[-1][0] if chunk and has_more else None,
+                total=len(keyed),
+            )
+
+    def scan(
+        self,
+        after: Optional[Tuple[str, str]],
+        limit: int,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> Tuple[List[CertificadoEntity], Optional[Tuple[str, str]]]:
+        """
+        Próximo bloco (e a chave para continuar) na ordem (id, número), sem total.
+
+        Percorre o array já ordenado a partir de ``after`` aplicando os filtros
+        posição a posição, então uma varredura completa em blocos custa O(N) e
+        não mantém nada além do bloco corrente.
+        """
+        with self._lock:
+            matches = self._matcher(id, bairro, cidade, min_valor, max_valor)
+            start = bisect.bisect_right(self._by_key, (tuple(after), sys.maxsize)) if after else 0
+            chunk: List[Tuple[Tuple[str, str], int]] = []
+            has_more = False
+            for i in range(start, len(self._by_key)):
+                entry = self._by_key[i]
+                if matches is not None and not matches(entry[1]):
+                    continue
+                if len(chunk) >= limit:
+                    has_more = True
+                    break
+                chunk.append(entry)
+            items = [self._entities[pos] for _, pos in chunk]
+            return items, chunk[-1][0] if chunk and has_more else None
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def _matcher(
+        self,
+        id: Optional[str],
+        bairro: Optional[str],
+        cidade: Optional[str],
+        min_valor: Optional[float],
+        max_valor: Optional[float],
+    ) -> Optional[Callable[[int], bool]]:
+        """Predicado por posição para os filtros ativos, ou None se não houver filtro."""
+        qid = normalize_text(id) if id else None
+        qbairro = normalize_text(bairro) if bairro else None
+        qcidade = normalize_text(cidade) if cidade else None
+        if qcidade == "":
+            qcidade = None
+        has_range = min_valor is not None or max_valor is not None
+        if qid is None and qbairro is None and qcidade is None and not has_range:
+            return None
+
+        def matches(pos: int) -> bool:
+            if qid is not None and self._id_norm[pos] != qid:
+                return False
+            if qbairro is not None and self._bairro_norm[pos] != qbairro:
+                return False
+            if qcidade is not None and qcidade not in self._cidade_norm[pos]:
+                return False
+            if has_range:
+                v = self._valores[pos]
+                if v is None:
+                    return False
+                if min_valor is not None and v < min_valor:
+                    return False
+                if max_valor is not None and v > max_valor:
+                    return False
+            return True
+
+        return matches
+
+    def _find_positions(
+        self,
+        id: Optional[str],
+        bairro: Optional[str],
+        cidade: Optional[str],
+        min_valor: Optional[float],
+        max_valor: Optional[float],
+    ) -> Optional[List[int]]:
+        """Posições que atendem aos filtros, ou None se nenhum filtro estiver ativo."""
+        qid = normalize_text(id) if id else None
+        qbairro = normalize_text(bairro) if bairro else None
+        # cidade: igualdade, prefixo ou substring (todos cobertos por "contém")
+        qcidade = normalize_text(cidade) if cidade else None
+        if qcidade == "":
+            qcidade = None
+        has_range = min_valor is not None or max_valor is not None
+
+        # (tamanho, gerador de candidatos) de cada filtro ativo
+        sources: List[Tuple[int, Callable[[], Iterable[int]]]] = []
+        if qid is not None:
+            pos = self._by_id_norm.get(qid, [])
+            sources.append((len(pos), lambda: pos))
+        if qbairro is not None:
+            bpos = self._by_bairro.get(qbairro, [])
+            sources.append((len(bpos), lambda: bpos))
+        if qcidade is not None:
+            keys = self._cidade_keys(qcidade)
+            sources.append((sum(len(self._by_cidade[k]) for k in keys), lambda: (p for k in keys for p in self._by_cidade[k])))
+        if has_range:
+            lo = bisect.bisect_left(self._valor_sorted, (min_valor, -1)) if min_valor is not None else 0
+            hi = bisect.bisect_right(self._valor_sorted, (max_valor, sys.maxsize)) if max_valor is not None else len(self._valor_sorted)
+            sources.append((max(0, hi - lo), lambda: (p for _, p in self._valor_sorted[lo:hi])))
+
+        if not sources:
+            return None
+
+        _, candidates = min(sources, key=lambda s: s[0])
+        matches = self._matcher(id, bairro, cidade, min_valor, max_valor)
+        result = [pos for pos in candidates() if matches(pos)]
+        result.sort()
+        return result
+
+    def _sort_key(self, pos: int) -> Tuple[str, str]:
+        entity = self._entities[pos]
+        return (entity.id, entity.numero_certificado)
+
+    def _cidade_keys(self, query: str) -> List[str]:
+        if len(query) < 3:
+            return [k for k in self._by_cidade if query in k]
+        grams = sorted((self._cidade_grams.get(g, set()) for g in _trigrams(query)), key=len)
+        keys = set(grams[0]).intersection(*grams[1:]) if grams else set()
+        return [k for k in keys if query in k]
+
+    def _reset_secondary(self) -> None:
+        self._id_norm: List[str] = []
+        self._bairro_norm: List[str] = []
+        self._cidade_norm: List[str] = []
+        self._valores: List[Optional[float]] = []
+        self._by_id_norm: Dict[str, List[int]] = {}
+        self._by_bairro: Dict[str, List[int]] = {}
+        self._by_cidade: Dict[str, List[int]] = {}
+        self._cidade_grams: Dict[str, Set[str]] = {}
+        self._valor_sorted: List[Tuple[float, int]] = []
+        self._by_key: List[Tuple[Tuple[str, str], int]] = []
+
+    def _rebuild(self, entities: List[CertificadoEntity], signature: Signature) -> None:
+        self._entities = list(entities)
+        self._by_id = {}
+        self._by_numero = {}
+        self._by_cnpj = {}
+        self._reset_secondary()
+        n = len(self._entities)
+        self._id_norm = [""] * n
+        self._bairro_norm = [""] * n
+        self._cidade_norm = [""] * n
+        self._valores = [None] * n
+        for pos in range(n):
+            self._link(pos, incremental=False)
+        self._valor_sorted.sort()
+        self._by_key.sort()
+        self._signature = signature
+        self.version += 1
+
+    def _link(self, pos: int, incremental: bool = True) -> None:
+        # incremental=False durante a reconstrução: os arrays são ordenados uma vez ao final
+        entity = self._entities[pos]
+        if entity.id:
+            self._by_id[entity.id] = pos
+        if entity.numero_certificado:
+            self._by_numero[entity.numero_certificado] = pos
+        cnpj = normalize_cnpj(entity.cnpj)
+        if cnpj:
+            self._by_cnpj.setdefault(cnpj, []).append(pos)
+
+        id_norm = normalize_text(entity.id)
+        bairro_norm = normalize_text(entity.bairro)
+        cidade_norm = normalize_text(entity.cidade)
+        valor = parse_valor(entity.valor)
+        self._id_norm[pos] = id_norm
+        self._bairro_norm[pos] = bairro_norm
+        self._cidade_norm[pos] = cidade_norm
+        self._valores[pos] = valor
+        self._by_id_norm.setdefault(id_norm, []).append(pos)
+        self._by_bairro.setdefault(bairro_norm, []).append(pos)
+        if cidade_norm not in self._by_cidade:
+            self._by_cidade[cidade_norm] = []
+            for gram in _trigrams(cidade_norm):
+                self._cidade_grams.setdefault(gram, set()).add(cidade_norm)
+        self._by_cidade[cidade_norm].append(pos)
+        if valor is not None:
+            if incremental:
+                bisect.insort(self._valor_sorted, (valor, pos))
+            else:
+                self._valor_sorted.append((valor, pos))
+        if incremental:
+            bisect.insort(self._by_key, (self._sort_key(pos), pos))
+        else:
+            self._by_key.append((self._sort_key(pos), pos))
+
+    def _unlink(self, pos: int) -> None:
+        entity = self._entities[pos]
+        if self._by_id.get(entity.id) == pos:
+            del self._by_id[entity.id]
+        if self._by_numero.get(entity.numero_certificado) == pos:
+            del self._by_numero[entity.numero_certificado]
+        _remove(self._by_cnpj, normalize_cnpj(entity.cnpj), pos)
+        _remove(self._by_id_norm, self._id_norm[pos], pos)
+        _remove(self._by_bairro, self._bairro_norm[pos], pos)
+        cidade_norm = self._cidade_norm[pos]
+        _remove(self._by_cidade, cidade_norm, pos)
+        if cidade_norm not in self._by_cidade:
+            for gram in _trigrams(cidade_norm):
+                keys = self._cidade_grams.get(gram)
+                if keys is not None:
+                    keys.discard(cidade_norm)
+                    if not keys:
+                        del self._cidade_grams[gram]
+        valor = self._valores[pos]
+        if valor is not None:
+            idx = bisect.bisect_left(self._valor_sorted, (valor, pos))
+            if idx < len(self._valor_sorted) and self._valor_sorted[idx] == (valor, pos):
+                del self._valor_sorted[idx]
+        entry = (self._sort_key(pos), pos)
+        idx = bisect.bisect_left(self._by_key, entry)
+        if idx < len(self._by_key) and self._by_key[idx] == entry:
+            del self._by_key[idx]
+
+
+def _remove(index: Dict[str, List[int]], key: str, pos: int) -> None:
+    positions = index.get(key)
+    if positions and pos in positions:
+        positions.remove(pos)
+        if not positions:
+            del index[key]
@@ -0,0 +1,267 @@
+"""
+Domain Service - Busca textual de certificados
+Índice invertido em memória (termo -> certificados) sobre razão social, CNPJ,
+número, cidade, bairro, pragas, produtos e métodos. Termos sem acento e em
+minúsculas (``norm`` do catálogo de PDFs); resultados ordenados por relevância.
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from backend.domain.services.certificado_index import Signature, normalize_cnpj
+from backend.domain.services.pdf_catalog import norm
+
+# Peso de cada campo no ranking (identificadores valem mais que texto livre)
+FIELD_WEIGHTS: Dict[str, float] = {
+    "numero_certificado": 8.0,
+    "cnpj": 8.0,
+    "razao_social": 5.0,
+    "produtos": 3.0,
+    "cidade": 2.0,
+    "bairro": 2.0,
+    "pragas_tratadas": 2.0,
+    "metodos": 2.0,
+}
+# Termos da consulta com ao menos esse tamanho também casam por prefixo
+MIN_PREFIX = 2
+# Casamento por prefixo pesa menos que o termo exato
+PREFIX_FACTOR = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Termo formado só por dígitos e pontuação de documento (CNPJ, número)
+_DOCUMENT_RE = re.compile(r"[\d./\-]+")
+
+SearchFields = Mapping[str, Iterable[str]]
+
+
+def tokenize(text: str) -> List[str]:
+    """Termos alfanuméricos do texto, sem acento e em minúsculas."""
+    return _TOKEN_RE.findall(norm(str(text or "")))
+
+
+def query_terms(q: str) -> List[str]:
+    """
+    Termos de uma consulta, sem repetição.
+
+    CNPJ digitado com pontuação ("12.345.678/0001-90") vira um único termo
+    com os dígitos; o restante é quebrado como em ``tokenize``.
+    """
+    terms: List[str] = []
+    for raw in str(q or "").split():
+        digits = normalize_cnpj(raw)
+        if _DOCUMENT_RE.fullmatch(raw) and len(digits) >= 8:
+            parts = [digits]
+        else:
+            parts = tokenize(raw)
+        for term in parts:
+            if term not in terms:
+                terms.append(term)
+    return terms
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    numero_certificado: str
+    score: float
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    hits: List[SearchHit]
+    total: int
+
+
+class CertificadoSearchIndex:
+    """
+    Índice invertido dos certificados, chaveado pelo número do certificado.
+
+    Segue o ciclo do ``CertificadoIndex``: reconstrução completa quando a
+    assinatura dos CSVs muda e ``upsert`` pelos fluxos de escrita. Cada
+    consulta parte do termo mais seletivo e só visita as listas de
+    ocorrência dos termos pedidos; o vocabulário ordenado resolve prefixos
+    por bisseção.
+    """
+
+    def __init__(self, weights: Optional[Mapping[str, float]] = None):
+        self.weights = dict(weights or FIELD_WEIGHTS)
+        self._lock = threading.RLock()
+        self._signature: Optional[Signature] = None
+        self._reset()
+
+    def refresh(self, signature: Signature, loader: Callable[[], Iterable[Tuple[str, SearchFields]]]) -> None:
+        """Reconstrói o índice se a assinatura dos arquivos de dados mudou."""
+        with self._lock:
+            if self._signature == signature:
+                return
+            self._reset()
+            for numero, fields in loader():
+                self._add(numero, fields)
+            self._vocabulary = sorted(self._postings)
+            self._signature = signature
+
+    def invalidate(self) -> None:
+        """Força reconstrução na próxima consulta."""
+        with self._lock:
+            self._signature = None
+
+    def upsert(self, numero: str, fields: SearchFields, before: Signature, after: Signature) -> None:
+        """
+        Indexa (ou reindexa) um certificado recém-persistido; sem índice construído, nada a fazer.
+
+        Como em ``CertificadoIndex.upsert``: ``after`` só é carimbada se
+        ``before`` (assinatura anterior à gravação) é a já indexada; do
+        contrário o índice é invalidado.
+        """
+        with self._lock:
+            if self._signature is None:
+                return
+            if self._signature != before:
+                self._signature = None
+                return
+            self._remove(numero)
+            for term in self._add(numero, fields):
+                idx = bisect.bisect_left(self._vocabulary, term)
+                if idx == len(self._vocabulary) or self._vocabulary[idx] != term:
+                    self._vocabulary.insert(idx, term)
+            self._signature = after
+
+    def search(self, q: str, limit: int = 20, offset: int = 0) -> SearchResult:
+        """
+        Certificados que contêm todos os termos de ``q`` (exatos ou por prefixo),
+        do mais relevante para o menos relevante.
+
+        A relevância soma, por termo, o peso do melhor campo em que ele aparece
+        ponderado pela raridade do termo (IDF); empates seguem a ordem de
+        indexação.
+        """
+        terms = query_terms(q)
+        if not terms:
+            return SearchResult(hits=[], total=0)
+        with self._lock:
+            n_docs = max(1, len(self._weights_by_doc))
+            expanded = sorted((self._expand(term, n_docs) for term in terms), key=_postings_size)
+            scores = self._match(expanded[0])
+            for postings in expanded[1:]:
+                if not scores:
+                    break
+                if len(scores) * len(postings) < _postings_size(postings):
+                    # Poucos candidatos: consulta cada um nas listas do termo
+                    match = {doc: self._score(doc, postings) for doc in scores}
+                else:
+                    match = self._match(postings)
+                scores = {doc: score + match[doc] for doc, score in scores.items() if match.get(doc)}
+            if not scores:
+                return SearchResult(hits=[], total=0)
+            top = heapq.nsmallest(offset + max(0, limit), scores.items(), key=lambda kv: (-kv[1], kv[0]))
+            hits = [SearchHit(self._numeros[doc], round(score, 4)) for doc, score in top[offset:]]
+            return SearchResult(hits=hits, total=len(scores))
+
+    def __len__(self) -> int:
+        return len(self._weights_by_doc)
+
+    def _expand(self, term: str, n_docs: int) -> List[Tuple[Dict[int, float], float]]:
+        """Listas de ocorrência do termo exato e de seus prefixos, com o fator (prefixo x IDF) de cada uma."""
+        tokens: List[Tuple[str, float]] = []
+        if term in self._postings:
+            tokens.append((term, 1.0))
+        if len(term) >= MIN_PREFIX:
+            idx = bisect.bisect_right(self._vocabulary, term)
+            while idx < len(self._vocabulary) and self._vocabulary[idx].startswith(term):
+                tokens.append((self._vocabulary[idx], PREFIX_FACTOR))
+                idx += 1
+        expanded = []
+        for token, factor in tokens:
+            postings = self._postings[token]
+            expanded.append((postings, factor * math.log(1.0 + n_docs / len(postings))))
+        return expanded
+
+    @staticmethod
+    def _match(expanded: List[Tuple[Dict[int, float], float]]) -> Dict[int, float]:
+        """Documento -> contribuição do termo (melhor entre o termo exato e seus prefixos)."""
+        result: Dict[int, float] = {}
+        for postings, factor in expanded:
+            for doc, weight in postings.items():
+                score = weight * factor
+                if score > result.get(doc, 0.0):
+                    result[doc] = score
+        return result
+
+    @staticmethod
+    def _score(doc: int, expanded: List[Tuple[Dict[int, float], float]]) -> float:
+        return max((postings[doc] * factor for postings, factor in expanded if doc in postings), default=0.0)
+
+    def _add(self, numero: str, fields: SearchFields) -> Set[str]:
+        doc = self._next_doc
+        self._next_doc += 1
+        self._docs[numero] = doc
+        self._numeros[doc] = numero
+        weights: Dict[str, float] = {}
+        for name, values in fields.items():
+            weight = self.weights.get(name, 1.0)
+            for value in values:
+                for term in tokenize(value):
+                    if weight > weights.get(term, 0.0):
+                        weights[term] = weight
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[doc] = weight
+        self._weights_by_doc[doc] = weights
+        return set(weights)
+
+    def _remove(self, numero: str) -> None:
+        doc = self._docs.pop(numero, None)
+        if doc is None:
+            return
+        del self._numeros[doc]
+        for term in self._weights_by_doc.pop(doc, {}):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc, None)
+            if not postings:
+                del self._postings[term]
+                idx = bisect.bisect_left(self._vocabulary, term)
+                if idx < len(self._vocabulary) and self._vocabulary[idx] == term:
+                    del self._vocabulary[idx]
+
+    def _reset(self) -> None:
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+        self._docs: Dict[str, int] = {}
+        self._numeros: Dict[int, str] = {}
+        self._weights_by_doc: Dict[int, Dict[str, float]] = {}
+        self._next_doc = 0
+
+
+def _postings_size(expanded: List[Tuple[Dict[int, float], float]]) -> int:
+    return sum(len(postings) for postings, _ in expanded)
+
+
+def search_fields(
+    certificado: object,
+    produtos: Iterable[str] = (),
+    metodos: Iterable[str] = (),
+) -> Dict[str, List[str]]:
+    """Campos indexados de um certificado (entidade ou objeto da engine) e de seu bundle."""
+
+    def get(name: str) -> str:
+        value = certificado.get(name) if isinstance(certificado, dict) else getattr(certificado, name, None)
+        return str(value) if value else ""
+
+    cnpj = get("cnpj")
+    return {
+        "numero_certificado": [get("numero_certificado")],
+        # CNPJ pesquisável pelos dígitos completos ou por trechos formatados
+        "cnpj": [cnpj, normalize_cnpj(cnpj)],
+        "razao_social": [get("razao_social")],
+        "cidade": [get("cidade")],
+        "bairro": [get("bairro")],
+        "pragas_tratadas": [get("pragas_tratadas")],
+        "produtos": [p for p in produtos if p],
+        "metodos": [m for m in metodos if m],
+    }
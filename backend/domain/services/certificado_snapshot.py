@@ -0,0 +1,159 @@
+"""
+Domain Service - Snapshot colunar de certificados
+Arrays NumPy (mês, valor, cidade e praga codificadas) para as agregações do dashboard.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def parse_valor_financeiro(valor: Optional[str]) -> Optional[float]:
+    """Converte "R$ 1.500,00" para float (mesma regra histórica do dashboard)."""
+    if not valor:
+        return None
+    normalizado = (
+        str(valor).replace("R$", "")
+        .replace(".", "")
+        .replace(" ", "")
+        .replace(",", ".")
+    )
+    try:
+        return float(normalizado)
+    except ValueError:
+        return None
+
+
+def mes_ordinal(data: Any) -> int:
+    """
+    Ano*12 + (mês-1) da data de execução, ou -1 se ausente/ inválida.
+
+    A engine entrega ``datetime``/``date``; textos (CSV, payloads) são aceitos
+    em ISO (``AAAA-MM[-DD...]``) ou no formato brasileiro ``DD/MM/AAAA``.
+    """
+    if isinstance(data, (datetime, date)):
+        return data.year * 12 + data.month - 1
+    if not isinstance(data, str):
+        return -1
+    texto = data.strip()
+    try:
+        if len(texto) >= 10 and texto[2] == "/" and texto[5] == "/":
+            ano, mes = int(texto[6:10]), int(texto[3:5])
+        elif len(texto) >= 7 and texto[4] == "-":
+            ano, mes = int(texto[0:4]), int(texto[5:7])
+        else:
+            return -1
+    except ValueError:
+        return -1
+    return ano * 12 + mes - 1 if 1 <= mes <= 12 else -1
+
+
+def mes_label(ordinal: int) -> str:
+    return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
+
+def split_pragas(pragas: Optional[str]) -> List[str]:
+    return [part.strip() for part in (pragas or "").split(",") if part.strip()]
+
+
+class _Encoder:
+    """Codificação por dicionário (rótulo -> código inteiro, na ordem de aparição)."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+
+    def encode(self, label: str) -> int:
+        code = self.codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self.codes[label] = code
+            self.labels.append(label)
+        return code
+
+
+class CertificadoSnapshot:
+    """
+    Representação colunar imutável dos certificados.
+
+    Construída uma vez por versão dos dados; as contagens que alimentam os
+    agregados do dashboard são group-bys vetorizados (``np.bincount``) em vez
+    de laços por objeto.
+    """
+
+    def __init__(
+        self,
+        meses: np.ndarray,
+        valores: np.ndarray,
+        cidade_codes: np.ndarray,
+        cidades: List[str],
+        praga_codes: np.ndarray,
+        pragas: List[str],
+        version: int = 0,
+    ):
+        self.meses = meses
+        self.valores = valores
+        self.cidade_codes = cidade_codes
+        self.cidades = cidades
+        self.praga_codes = praga_codes
+        self.pragas = pragas
+        self.version = version
+
+    @classmethod
+    def from_certificados(cls, certificados: Iterable[Any], version: int = 0) -> "CertificadoSnapshot":
+        meses: List[int] = []
+        valores: List[float] = []
+        cidade_codes: List[int] = []
+        praga_codes: List[int] = []
+        cidades = _Encoder()
+        pragas = _Encoder()
+        for cert in certificados:
+            meses.append(mes_ordinal(getattr(cert, "data_execucao", None)))
+            valor = parse_valor_financeiro(getattr(cert, "valor", None))
+            valores.append(np.nan if valor is None else valor)
+            cidade = getattr(cert, "cidade", None)
+            cidade_codes.append(cidades.encode(str(cidade)) if cidade else -1)
+            for praga in split_pragas(getattr(cert, "pragas_tratadas", None)):
+                praga_codes.append(pragas.encode(praga))
+        return cls(
+            meses=np.asarray(meses, dtype=np.int64),
+            valores=np.asarray(valores, dtype=np.float64),
+            cidade_codes=np.asarray(cidade_codes, dtype=np.int64),
+            cidades=cidades.labels,
+            praga_codes=np.asarray(praga_codes, dtype=np.int64),
+            pragas=pragas.labels,
+            version=version,
+        )
+
+    def __len__(self) -> int:
+        return int(self.meses.shape[0])
+
+    def mes_counts(self) -> Dict[str, int]:
+        """Contagem por mês na ordem de primeira aparição."""
+        validos = self.meses[self.meses >= 0]
+        if validos.size == 0:
+            return {}
+        meses, first, counts = np.unique(validos, return_index=True, return_counts=True)
+        return {mes_label(int(meses[i])): int(counts[i]) for i in np.argsort(first, kind="stable")}
+
+    def cidade_counts(self) -> Dict[str, int]:
+        return _code_counts(self.cidade_codes, self.cidades)
+
+    def praga_counts(self) -> Dict[str, int]:
+        return _code_counts(self.praga_codes, self.pragas)
+
+    def valor_stats(self) -> Tuple[float, int]:
+        """(soma, quantidade) dos valores válidos."""
+        validos = self.valores[~np.isnan(self.valores)]
+        return float(validos.sum()), int(validos.size)
+
+
+def _code_counts(codes: np.ndarray, labels: List[str]) -> Dict[str, int]:
+    validos = codes[codes >= 0]
+    if validos.size == 0:
+        return {}
+    counts = np.bincount(validos, minlength=len(labels))
+    return {labels[int(code)]: int(counts[code]) for code in np.flatnonzero(counts)}
+
@@ -0,0 +1,113 @@
+"""
+Domain Service - Leitura compartilhada dos CSVs da engine
+Cada arquivo é interpretado uma vez por versão (caminho, mtime, tamanho); quando
+o arquivo apenas cresceu, somente as linhas acrescentadas são lidas.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, Dict, List, Optional, Tuple
+
+# Bytes finais já lidos usados para confirmar que o prefixo não foi reescrito
+_TAIL_PROBE = 256
+
+
+@dataclass
+class _CsvTable:
+    header: List[str]
+    rows: List[Dict[str, str]] = field(default_factory=list)
+    version: Tuple[int, int] = (-1, -1)
+    offset: int = 0
+    probe: bytes = b""
+
+
+class CsvReader:
+    """
+    Cache de tabelas CSV por caminho.
+
+    ``rows(path)`` devolve a lista de linhas (dicts) da versão atual do
+    arquivo. A lista é compartilhada entre chamadores e não deve ser
+    modificada.
+    """
+
+    _shared: ClassVar[Optional["CsvReader"]] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables: Dict[str, _CsvTable] = {}
+        self.full_reads = 0
+        self.tail_reads = 0
+
+    @classmethod
+    def shared(cls) -> "CsvReader":
+        """Instância única do processo."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def rows(self, path: Optional[Path]) -> List[Dict[str, str]]:
+        if not path:
+            return []
+        key = str(path)
+        with self._lock:
+            try:
+                st = os.stat(key)
+            except OSError:
+                self._tables.pop(key, None)
+                return []
+            version = (st.st_mtime_ns, st.st_size)
+            table = self._tables.get(key)
+            if table is not None and table.version == version:
+                return table.rows
+            if table is None or not self._append(key, table, st.st_size):
+                table = self._read_full(key)
+                self._tables[key] = table
+            table.version = version
+            return table.rows
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(str(path), None)
+
+    def _read_full(self, key: str) -> _CsvTable:
+        with open(key, "rb") as handle:
+            data = handle.read()
+        self.full_reads += 1
+        reader = csv.DictReader(io.StringIO(data.decode("utf-8-sig")))
+        rows = list(reader)
+        table = _CsvTable(header=list(reader.fieldnames or []), rows=rows)
+        # Só permite leitura incremental se o arquivo termina em registro completo
+        if data.endswith(b"\n"):
+            table.offset = len(data)
+            table.probe = data[-_TAIL_PROBE:]
+        return table
+
+    def _append(self, key: str, table: _CsvTable, size: int) -> bool:
+        """Lê apenas o trecho novo; False se o arquivo foi reescrito."""
+        if not table.offset or not table.header or size <= table.offset:
+            return False
+        start = table.offset - len(table.probe)
+        with open(key, "rb") as handle:
+            handle.seek(start)
+            if handle.read(len(table.probe)) != table.probe:
+                return False
+            chunk = handle.read(size - table.offset)
+        if not chunk.endswith(b"\n"):
+            return False
+        self.tail_reads += 1
+        reader = csv.DictReader(io.StringIO(chunk.decode("utf-8")), fieldnames=table.header)
+        # Nova lista: quem já recebeu a versão anterior não a vê mudar
+        table.rows = table.rows + list(reader)
+        table.offset += len(chunk)
+        table.probe = (table.probe + chunk)[-_TAIL_PROBE:]
+        return True
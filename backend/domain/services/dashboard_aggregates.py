@@ -0,0 +1,200 @@
+"""
+Domain Service - Agregados do dashboard mantidos incrementalmente
+Contadores por mês, cidade, praga, classe química, método e produto, além da
+soma/quantidade de valores, atualizados por deltas a cada certificado gravado.
+"""
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from backend.domain.repositories import CertificadoRepository
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.services.certificado_index import Signature, engine_data_signature
+from backend.domain.services.csv_reader import CsvReader
+from backend.domain.services.certificado_snapshot import (
+    mes_label,
+    mes_ordinal,
+    parse_valor_financeiro,
+    split_pragas,
+)
+
+
+@dataclass
+class DashboardAggregates:
+    """Visão imutável dos agregados, já ordenada para o overview."""
+
+    certificados: int = 0
+    produtos: int = 0
+    metodos: int = 0
+    por_mes: List[Tuple[str, int]] = field(default_factory=list)
+    por_cidade: List[Tuple[str, int]] = field(default_factory=list)
+    por_praga: List[Tuple[str, int]] = field(default_factory=list)
+    classes_quimicas: List[Tuple[str, int]] = field(default_factory=list)
+    metodos_aplicacao: List[Tuple[str, int]] = field(default_factory=list)
+    produtos_por_nome: List[Tuple[str, int]] = field(default_factory=list)
+    valor_total: float = 0.0
+    valor_media: float = 0.0
+
+
+def produto_nome(row: Any) -> str:
+    """Nome do produto em uma linha do CSV (dict) ou em um objeto do bundle."""
+    if isinstance(row, dict):
+        return (row.get("produto") or row.get("nome_produto") or "").strip()
+    return str(getattr(row, "produto", None) or getattr(row, "nome_produto", None) or "").strip()
+
+
+def _field(row: Any, name: str) -> str:
+    value = row.get(name) if isinstance(row, dict) else getattr(row, name, None)
+    return str(value).strip() if value else ""
+
+
+class DashboardAggregateStore:
+    """
+    Contadores do dashboard em memória.
+
+    - Reconstrução completa quando a assinatura dos CSVs da engine muda
+      (edição externa, exclusão) ou após ``invalidate()``.
+    - ``apply(bundle, before)`` soma o delta de um certificado novo em O(1)
+      e re-carimba a assinatura, evitando a releitura dos arquivos; só se a
+      assinatura anterior à gravação (``before``) é a já contabilizada.
+    - ``view()`` devolve a visão ordenada, memorizada por versão.
+    """
+
+    def __init__(self, pdf_engine: PdfEngine, repository: CertificadoRepository, csv_reader: CsvReader | None = None):
+        self.pdf_engine = pdf_engine
+        self.repository = repository
+        self.csv_reader = csv_reader or CsvReader.shared()
+        self._lock = threading.RLock()
+        self._signature: Optional[Signature] = None
+        self._reset()
+        self.version = 0
+        self._view: Optional[DashboardAggregates] = None
+        self._view_version = -1
+
+    def view(self) -> DashboardAggregates:
+        with self._lock:
+            self._ensure()
+            if self._view is None or self._view_version != self.version:
+                self._view = self._build_view()
+                self._view_version = self.version
+            return self._view
+
+    def apply(self, bundle: Any, before: Signature) -> None:
+        """
+        Aplica o delta de um certificado recém-persistido.
+
+        ``before`` é a assinatura dos CSVs lida antes da gravação: se difere
+        da contabilizada, outro worker/processo também gravou e o delta não
+        basta. Nesse caso, e quando o número já era conhecido
+        (reprocessamento, cujas contribuições antigas não podem ser
+        subtraídas com segurança), marca para reconstrução completa.
+        """
+        with self._lock:
+            if self._signature is None:
+                return
+            if self._signature != before:
+                self._signature = None
+                return
+            certificado = getattr(bundle, "certificado", bundle)
+            numero = str(getattr(certificado, "numero_certificado", "") or "")
+            if numero in self._numeros:
+                self._signature = None
+                return
+            self._numeros.add(numero)
+            self._add_certificado(certificado)
+            self._add_produtos(getattr(bundle, "produtos", None) or [])
+            self._add_metodos(getattr(bundle, "metodos", None) or [])
+            self._signature = engine_data_signature(self.pdf_engine)
+            self.version += 1
+
+    def invalidate(self) -> None:
+        """Força reconstrução completa na próxima leitura."""
+        with self._lock:
+            self._signature = None
+
+    def _ensure(self) -> None:
+        signature = engine_data_signature(self.pdf_engine)
+        if self._signature == signature:
+            return
+        self._rebuild(signature)
+
+    def _rebuild(self, signature: Signature) -> None:
+        self._reset()
+        # Certificados: group-bys vetorizados a partir do snapshot colunar
+        snapshot = self.repository.snapshot()
+        self._numeros = {e.numero_certificado for e in self.repository.list()}
+        self.certificados = len(snapshot)
+        self.meses.update(snapshot.mes_counts())
+        self.cidades.update(snapshot.cidade_counts())
+        self.pragas.update(snapshot.praga_counts())
+        self.valor_sum, self.valor_count = snapshot.valor_stats()
+
+        csv_manager = self.pdf_engine.get_csv_manager()
+        self._add_produtos(self.csv_reader.rows(csv_manager.produtos_path))
+        self._add_metodos(self.csv_reader.rows(csv_manager.metodos_path))
+        self._signature = signature
+        self.version += 1
+
+    def _reset(self) -> None:
+        self._numeros: Set[str] = set()
+        self.certificados = 0
+        self.produtos = 0
+        self.metodos = 0
+        self.meses: Counter = Counter()
+        self.cidades: Counter = Counter()
+        self.pragas: Counter = Counter()
+        self.classes: Counter = Counter()
+        self.metodos_por_tipo: Counter = Counter()
+        self.produtos_por_nome: Counter = Counter()
+        self.valor_sum = 0.0
+        self.valor_count = 0
+
+    def _add_certificado(self, certificado: Any) -> None:
+        self.certificados += 1
+        mes = mes_ordinal(getattr(certificado, "data_execucao", None))
+        if mes >= 0:
+            self.meses[mes_label(mes)] += 1
+        cidade = getattr(certificado, "cidade", None)
+        if cidade:
+            self.cidades[str(cidade)] += 1
+        for praga in split_pragas(getattr(certificado, "pragas_tratadas", None)):
+            self.pragas[praga] += 1
+        valor = parse_valor_financeiro(getattr(certificado, "valor", None))
+        if valor is not None:
+            self.valor_sum += valor
+            self.valor_count += 1
+
+    def _add_produtos(self, produtos: Iterable[Any]) -> None:
+        for produto in produtos:
+            self.produtos += 1
+            classe = _field(produto, "classe_quimica")
+            if classe:
+                self.classes[classe] += 1
+            nome = produto_nome(produto)
+            if nome:
+                self.produtos_por_nome[nome] += 1
+
+    def _add_metodos(self, metodos: Iterable[Any]) -> None:
+        for metodo in metodos:
+            self.metodos += 1
+            tipo = _field(metodo, "metodo")
+            if tipo:
+                self.metodos_por_tipo[tipo] += 1
+
+    def _build_view(self) -> DashboardAggregates:
+        return DashboardAggregates(
+            certificados=self.certificados,
+            produtos=self.produtos,
+            metodos=self.metodos,
+            por_mes=self.meses.most_common(),
+            por_cidade=self.cidades.most_common(),
+            por_praga=self.pragas.most_common(),
+            classes_quimicas=self.classes.most_common(),
+            metodos_aplicacao=self.metodos_por_tipo.most_common(),
+            produtos_por_nome=self.produtos_por_nome.most_common(),
+            valor_total=self.valor_sum,
+            valor_media=self.valor_sum / self.valor_count if self.valor_count else 0.0,
+        )
@@ -1,17 +1,229 @@
 from __future__ import annotations
 
+import os
+import posixpath
+import re
+import shutil
 import unicodedata
+import zipfile
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
 
 from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+_RAZAO = "razao social"
+_FANTASIA = "nome fantasia"
+
+# Elementos de célula/linha no XML da planilha (prefixo de namespace opcional)
+_CELL_RE = re.compile(r'<(?:\w+:)?c\b[^>]*?\br="([A-Z]+)(\d+)"[^>]*?(?:/>|>.*?</(?:\w+:)?c>)', re.S)
+_ROW_RE = re.compile(r'<((?:\w+:)?)row\b[^>]*?\br="(\d+)"[^>]*?(/>|>(.*?)</(?:\w+:)?row>)', re.S)
+_STYLE_RE = re.compile(r'\bs="(\d+)"')
+_SHEETDATA_RE = re.compile(r'<((?:\w+:)?)sheetData\s*>')
+
+# Namespaces de relacionamentos do pacote OPC (.xlsx)
+_PKG_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DOC_RELS_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+
+# Linhas por aba lidas na inspeção prévia (região de cabeçalho do certificado)
+PREFLIGHT_ROWS = int(os.getenv("UPLOAD_PREFLIGHT_ROWS", "60"))
+
+
+@dataclass(frozen=True)
+class SanitizePlan:
+    """Célula de "Nome Fantasia" vazia a ser preenchida com a razão social."""
+    sheet_title: str
+    row: int
+    column: int
+    razao_social: str
+
+    @property
+    def ref(self) -> str:
+        return f"{get_column_letter(self.column)}{self.row}"
 
 
 def _norm(s: str) -> str:
     return unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode().strip().lower()
 
 
-def sanitize_excel_for_engine(src_path: Path) -> Path:
+def _is_blank(value) -> bool:
+    return value is None or str(value).strip() == ""
+
+
+def sanitize_excel_for_engine(src_path: Path, plan: Optional[SanitizePlan] = None) -> Path:
+    """
+    Preenche "Nome Fantasia" vazio com o valor de "Razão Social".
+
+    A planilha é lida em modo streaming (read-only) até encontrar os dois
+    rótulos (ou usa ``plan`` de uma inspeção prévia); se houver correção a
+    fazer, apenas o XML da aba afetada é reescrito e os demais membros do
+    .xlsx são copiados sem alteração. Sem correção, retorna o próprio
+    ``src_path`` (nenhuma cópia é gravada).
+    """
+    if plan is None:
+        plan = inspect_workbook(src_path, max_rows=None)
+    if plan is None:
+        return src_path
+
+    out_path = src_path.parent / f"sanitized_{src_path.name}"
+    if _patch_sheet_xml(src_path, out_path, plan.sheet_title, plan.ref, plan.razao_social):
+        return out_path
+    # Estrutura de XML inesperada: recorre à regravação completa via openpyxl
+    return _sanitize_full(src_path, out_path)
+
+
+def inspect_workbook(src_path: Path, max_rows: Optional[int] = PREFLIGHT_ROWS) -> Optional[SanitizePlan]:
+    """
+    Procura os rótulos em modo read-only, parando assim que ambos aparecem.
+
+    Args:
+        max_rows: Linhas lidas por aba (None lê a aba inteira).
+
+    Returns:
+        O plano de correção, ou None se não há o que corrigir.
+
+    Raises:
+        Exceções do openpyxl/zipfile se o arquivo não é um .xlsx legível.
+    """
+    wb = load_workbook(filename=str(src_path), read_only=True, data_only=True)
+    try:
+        razao_val: Optional[str] = None
+        fantasia: Optional[Tuple[str, int, int, object]] = None
+        for ws in wb.worksheets:
+            # Dimensões declaradas pelo gerador podem estar erradas e truncar as linhas
+            ws.reset_dimensions()
+            for r, values in enumerate(ws.iter_rows(min_row=1, max_row=max_rows, min_col=1, values_only=True), start=1):
+                for c, val in enumerate(values, start=1):
+                    if not isinstance(val, str):
+                        continue
+                    n = _norm(val)
+                    if n not in (_RAZAO, _FANTASIA):
+                        continue
+                    right = values[c] if c < len(values) else None
+                    if n == _RAZAO and razao_val is None and right and isinstance(right, str):
+                        razao_val = right.strip()
+                    elif n == _FANTASIA and fantasia is None:
+                        fantasia = (ws.title, r, c + 1, right)
+                    if razao_val is not None and fantasia is not None:
+                        break
+                if razao_val is not None and fantasia is not None:
+                    break
+            if razao_val is not None and fantasia is not None:
+                break
+    finally:
+        wb.close()
+
+    if fantasia is None or not razao_val or not _is_blank(fantasia[3]):
+        return None
+    return SanitizePlan(sheet_title=fantasia[0], row=fantasia[1], column=fantasia[2], razao_social=razao_val)
+
+
+def _patch_sheet_xml(src_path: Path, out_path: Path, sheet_title: str, ref: str, text: str) -> bool:
+    """Copia o .xlsx trocando só a célula ``ref`` da aba ``sheet_title``; False se não conseguiu."""
+    with zipfile.ZipFile(src_path) as zin:
+        sheet_path = _sheet_part(zin, sheet_title)
+        if sheet_path is None:
+            return False
+        try:
+            xml = zin.read(sheet_path).decode("utf-8")
+        except (KeyError, UnicodeDecodeError):
+            return False
+        patched = _set_inline_string(xml, ref, text)
+        if patched is None:
+            return False
+        with zipfile.ZipFile(out_path, "w") as zout:
+            for info in zin.infolist():
+                if info.filename == sheet_path:
+                    zout.writestr(info, patched.encode("utf-8"))
+                    continue
+                with zin.open(info) as src, zout.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+    return True
+
+
+def _sheet_part(zin: zipfile.ZipFile, sheet_title: str) -> Optional[str]:
+    """
+    Caminho, dentro do .xlsx, do XML da aba ``sheet_title``: segue o
+    relacionamento officeDocument até o workbook.xml e o r:id da aba até o
+    alvo declarado nos relacionamentos do workbook. None se não resolveu.
+    """
+    try:
+        workbook_path = "xl/workbook.xml"
+        if "_rels/.rels" in zin.namelist():
+            for rel in ElementTree.fromstring(zin.read("_rels/.rels")).iter(f"{_PKG_RELS_NS}Relationship"):
+                if rel.get("Type") == _OFFICE_DOCUMENT_REL:
+                    workbook_path = _resolve_target("", rel.get("Target", ""))
+                    break
+        base_dir, workbook_name = posixpath.split(workbook_path)
+        workbook = ElementTree.fromstring(zin.read(workbook_path))
+        rel_id = None
+        for sheet in workbook.iter():
+            if sheet.tag.rsplit("}", 1)[-1] == "sheet" and sheet.get("name") == sheet_title:
+                rel_id = sheet.get(f"{_DOC_RELS_NS}id")
+                break
+        if rel_id is None:
+            return None
+        rels_path = posixpath.join(base_dir, "_rels", f"{workbook_name}.rels")
+        for rel in ElementTree.fromstring(zin.read(rels_path)).iter(f"{_PKG_RELS_NS}Relationship"):
+            if rel.get("Id") == rel_id:
+                return _resolve_target(base_dir, rel.get("Target", ""))
+    except (KeyError, ElementTree.ParseError):
+        return None
+    return None
+
+
+def _resolve_target(base_dir: str, target: str) -> str:
+    """Alvo de um relacionamento (absoluto a partir da raiz ou relativo à parte de origem)."""
+    if target.startswith("/"):
+        return posixpath.normpath(target.lstrip("/"))
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _set_inline_string(xml: str, ref: str, text: str) -> Optional[str]:
+    """Define ``ref`` como string inline (criando a célula se não existir); None se não localizou a linha."""
+    col_letters = re.match(r"[A-Z]+", ref).group(0)
+    col_idx = column_index_from_string(col_letters)
+    row_num = int(ref[len(col_letters):])
+
+    sheet_data = _SHEETDATA_RE.search(xml)
+    if sheet_data is None:
+        return None
+    prefix = sheet_data.group(1)
+
+    def new_cell(style: Optional[str]) -> str:
+        s_attr = f' s="{style}"' if style is not None else ""
+        return f'<{prefix}c r="{ref}"{s_attr} t="inlineStr"><{prefix}is><{prefix}t>{escape(text)}</{prefix}t></{prefix}is></{prefix}c>'
+
+    # A célula fica na mesma linha do rótulo, então a linha sempre existe
+    for row in _ROW_RE.finditer(xml, sheet_data.end()):
+        r = int(row.group(2))
+        if r < row_num:
+            continue
+        if r > row_num or row.group(3) == "/>":
+            return None
+        body_start = row.start(4)
+        body = row.group(4)
+        for cell in _CELL_RE.finditer(body):
+            cell_col = column_index_from_string(cell.group(1))
+            if cell_col < col_idx:
+                continue
+            start, end = body_start + cell.start(), body_start + cell.end()
+            if cell_col == col_idx:
+                open_tag = cell.group(0).split(">", 1)[0]
+                style = _STYLE_RE.search(open_tag)
+                return f"{xml[:start]}{new_cell(style.group(1) if style else None)}{xml[end:]}"
+            return f"{xml[:start]}{new_cell(None)}{xml[start:]}"
+        insert_at = body_start + len(body)
+        return f"{xml[:insert_at]}{new_cell(None)}{xml[insert_at:]}"
+    return None
+
+
+def _sanitize_full(src_path: Path, out_path: Path) -> Path:
+    """Caminho antigo: carrega o workbook inteiro, corrige e regrava tudo."""
     wb = load_workbook(filename=str(src_path), data_only=True)
     razao_val: Optional[str] = None
     fantasia_cell = None
@@ -23,17 +235,16 @@ def sanitize_excel_for_engine(src_path: Path) -> Path:
                 if not isinstance(val, str):
                     continue
                 n = _norm(val)
-                if n == "razao social":
+                if n == _RAZAO:
                     c = ws.cell(row=cell.row, column=cell.column + 1)
                     if c.value and isinstance(c.value, str):
                         razao_val = c.value.strip()
-                elif n == "nome fantasia":
+                elif n == _FANTASIA:
                     c = ws.cell(row=cell.row, column=cell.column + 1)
                     fantasia_cell = c
 
-    if fantasia_cell and (fantasia_cell.value is None or str(fantasia_cell.value).strip() == "") and razao_val:
+    if fantasia_cell and _is_blank(fantasia_cell.value) and razao_val:
         fantasia_cell.value = razao_val
 
-    out_path = src_path.parent / f"sanitized_{src_path.name}"
     wb.save(str(out_path))
-    return out_path
\ No newline at end of file
+    return out_path
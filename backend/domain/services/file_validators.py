@@ -0,0 +1,116 @@
+"""
+Domain Service - Validadores HTTP de arquivos servidos
+ETag forte (SHA-256 do conteúdo) e Last-Modified por arquivo, calculados uma
+vez por versão do arquivo (dispositivo, inode, tamanho, mtime). Hashes já
+conhecidos (ex.: objetos do armazenamento de PDFs por conteúdo) vêm de fontes
+registradas, sem reler o arquivo.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from backend.domain.services.upload_spool import sha256_file
+
+# Versões de arquivo com hash em memória
+MAX_ENTRIES = 4096
+
+_Signature = Tuple[int, int, int, int]
+# Fonte de hash conhecido: (caminho, stat) -> SHA-256 ou None
+DigestSource = Callable[[Path, os.stat_result], Optional[str]]
+
+
+@dataclass(frozen=True)
+class FileValidator:
+    path: Path
+    etag: str
+    last_modified: str
+    mtime: float
+    stat: os.stat_result
+
+
+def _signature(st: os.stat_result) -> _Signature:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class FileValidators:
+    """Cache por processo (``shared``) de validadores de arquivos."""
+
+    _shared: Optional["FileValidators"] = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "FileValidators":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._digests: "OrderedDict[Tuple[str, _Signature], str]" = OrderedDict()
+        self._sources: List[DigestSource] = []
+        self.hashed = 0
+
+    def add_source(self, source: DigestSource) -> None:
+        """Registra uma fonte de hashes já calculados, consultada antes de ler o arquivo."""
+        with self._lock:
+            if source not in self._sources:
+                self._sources.append(source)
+
+    def validators(self, path: Path) -> FileValidator:
+        """
+        Validadores do arquivo atual em ``path``.
+
+        Pode ler o arquivo inteiro (hash) quando nenhuma fonte o conhece:
+        chame fora do event loop.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existe.
+        """
+        path = Path(path)
+        st = path.stat()
+        key = (str(path), _signature(st))
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+        if digest is None:
+            digest = self._known_digest(path, st)
+            hashed = digest is None
+            if hashed:
+                digest = sha256_file(path)
+            with self._lock:
+                if hashed:
+                    self.hashed += 1
+                self._digests[key] = digest
+                self._trim(self._digests)
+        return FileValidator(
+            path=path,
+            etag=f'"{digest[:32]}"',
+            last_modified=formatdate(st.st_mtime, usegmt=True),
+            mtime=st.st_mtime,
+            stat=st,
+        )
+
+    def _known_digest(self, path: Path, st: os.stat_result) -> Optional[str]:
+        with self._lock:
+            sources = list(self._sources)
+        for source in sources:
+            try:
+                digest = source(path, st)
+            except OSError:
+                continue
+            if digest:
+                return digest
+        return None
+
+    def _trim(self, cache: OrderedDict) -> None:
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
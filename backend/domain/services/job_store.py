@@ -0,0 +1,123 @@
+"""
+Domain Service - Armazenamento local de jobs assíncronos
+Cada job é um JSON em ``<base_dir>/jobs/<id>.json`` (gravação atômica); a
+entrada do job fica ao lado (``<id>.input``) até o processamento terminar, o
+que permite retomar jobs pendentes após reiniciar o processo.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobStore:
+    """Persistência de jobs em disco (um arquivo por job)."""
+
+    def __init__(self, base_dir: Path):
+        self.jobs_dir = Path(base_dir) / "jobs"
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def create(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        input_bytes: Optional[bytes] = None,
+        input_file: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        """Cria o job; a entrada vem em memória ou é movida de ``input_file``."""
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "status": JOB_QUEUED,
+            "payload": payload,
+            "created_at": _now_iso(),
+            "updated_at": _now_iso(),
+            "started_at": None,
+            "finished_at": None,
+            "stages": [{"stage": JOB_QUEUED, "at": _now_iso(), "elapsed_ms": 0}],
+            "result": None,
+            "error": None,
+        }
+        if input_file is not None:
+            shutil.move(str(input_file), self.input_path(job_id))
+        elif input_bytes is not None:
+            self._write_atomic(self.input_path(job_id), input_bytes)
+        self.save(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not job_id or not job_id.isalnum():
+            return None
+        try:
+            return json.loads(self._path(job_id).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save(self, job: Dict[str, Any]) -> None:
+        job["updated_at"] = _now_iso()
+        data = json.dumps(job, ensure_ascii=False, default=str).encode("utf-8")
+        with self._lock:
+            self._write_atomic(self._path(job["id"]), data)
+
+    def input_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.input"
+
+    def discard_input(self, job_id: str) -> None:
+        try:
+            self.input_path(job_id).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def pending(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Jobs não finalizados (ordem de criação), para retomada na partida; ``kind`` filtra o tipo."""
+        jobs = []
+        for path in self.jobs_dir.glob("*.json"):
+            job = self.get(path.stem)
+            if job and job.get("status") not in FINISHED_STATES and (kind is None or job.get("kind") == kind):
+                jobs.append(job)
+        return sorted(jobs, key=lambda j: j.get("created_at") or "")
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Remove jobs finalizados mais antigos que ``max_age_seconds``."""
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for path in self.jobs_dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                job = self.get(path.stem)
+                if job and job.get("status") in FINISHED_STATES:
+                    path.unlink(missing_ok=True)
+                    self.discard_input(path.stem)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
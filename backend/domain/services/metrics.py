@@ -0,0 +1,60 @@
+"""
+Domain Service - Métricas internas do processo
+Contadores e observações simples (contagem, soma, máximo) mantidos em memória
+e expostos em ``GET /api/admin/metrics``.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional
+
+
+class MetricsRegistry:
+    """Registro de métricas por processo (``shared``), seguro entre threads."""
+
+    _shared: Optional["MetricsRegistry"] = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "MetricsRegistry":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._observations: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """Registra uma amostra (ex.: duração em ms)."""
+        with self._lock:
+            obs = self._observations.get(name)
+            if obs is None:
+                self._observations[name] = {"count": 1, "sum": value, "max": value}
+            else:
+                obs["count"] += 1
+                obs["sum"] += value
+                obs["max"] = max(obs["max"], value)
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            observations = {
+                name: {**obs, "avg": round(obs["sum"] / obs["count"], 3) if obs["count"] else 0.0}
+                for name, obs in self._observations.items()
+            }
+            return {"counters": dict(sorted(self._counters.items())), "observations": dict(sorted(observations.items()))}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
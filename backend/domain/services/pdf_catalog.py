@@ -0,0 +1,169 @@
+"""
+Domain Service - Catálogo de PDFs gerados
+Mapeia número do certificado para os PDFs gerados (e cópias prefixadas por cidade)
+sem varrer o diretório de saída a cada requisição.
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Janela em que o mtime do diretório não é confiável (mesma granularidade de relógio
+# de uma escrita concorrente); dentro dela o catálogo volta a varrer na próxima consulta.
+_RACY_WINDOW_NS = 2_000_000_000
+# Tokens consultados com o resultado memorizado (LRU)
+MAX_TOKENS = 4096
+
+
+def norm(s: str) -> str:
+    """Remove acentos e converte para minúsculas (comparação de nomes de arquivo)."""
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join([c for c in s if not unicodedata.combining(c)])
+    return s.lower()
+
+
+def numero_token(numero: str) -> str:
+    """Forma do número do certificado usada nos nomes de arquivo."""
+    return str(numero).replace("/", "-")
+
+
+class PdfCatalog:
+    """
+    Catálogo em memória dos PDFs de um diretório de saída.
+
+    Construído uma vez com ``os.scandir``, mantido pelos fluxos de escrita
+    (``add``/``discard``) e reconciliado pelo mtime do diretório. ``find``
+    casa o token como substring do nome (mesma regra do antigo glob
+    ``*<numero>*``, sem depender de como a engine separa as partes do nome):
+    a primeira consulta de um token percorre os nomes em memória e o
+    resultado fica memorizado, atualizado por ``add``/``discard``; consultas
+    seguintes são uma busca no dicionário.
+    """
+
+    _instances: Dict[str, "PdfCatalog"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_dir(cls, output_dir: Path) -> "PdfCatalog":
+        """Retorna o catálogo compartilhado do diretório (um por processo)."""
+        key = str(Path(output_dir).resolve())
+        with cls._instances_lock:
+            catalog = cls._instances.get(key)
+            if catalog is None:
+                catalog = cls(Path(key))
+                cls._instances[key] = catalog
+            return catalog
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self._lock = threading.RLock()
+        self._names: Dict[str, str] = {}
+        self._by_token: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._dir_mtime: Optional[int] = None
+
+    def refresh(self) -> None:
+        """Revarre o diretório somente se o mtime mudou desde a última leitura."""
+        with self._lock:
+            mtime = self._current_mtime()
+            if mtime is not None and mtime == self._dir_mtime:
+                return
+            self._scan()
+
+    def find(self, token: str, pattern: Optional[str] = None, refresh: bool = True) -> List[Path]:
+        """PDFs com ``token`` no nome (e que casam com ``pattern``, se informado), ordenados."""
+        with self._lock:
+            if refresh:
+                self.refresh()
+            names = self._matches(token)
+            if pattern:
+                names = [n for n in names if fnmatchcase(n, pattern)]
+            return [self.base_dir / n for n in names]
+
+    def files_for(self, numero: str) -> List[Path]:
+        """PDFs (gerado e prefixados por cidade) de um número de certificado."""
+        return self.find(numero_token(numero))
+
+    def normalized(self, name: str) -> str:
+        """Nome normalizado (pré-calculado para arquivos catalogados)."""
+        cached = self._names.get(name)
+        return cached if cached is not None else norm(name)
+
+    def add(self, path: Path) -> None:
+        """Registra um PDF recém-escrito no diretório do catálogo."""
+        path = Path(path)
+        if not self._owns(path):
+            return
+        with self._lock:
+            in_sync = self._dir_mtime is not None
+            name = path.name
+            if name not in self._names:
+                self._names[name] = norm(name)
+                for token, names in self._by_token.items():
+                    if token in name:
+                        bisect.insort(names, name)
+            if in_sync:
+                self._stamp()
+
+    def discard(self, path: Path) -> None:
+        """Remove do catálogo um PDF apagado."""
+        path = Path(path)
+        if not self._owns(path):
+            return
+        with self._lock:
+            in_sync = self._dir_mtime is not None
+            name = path.name
+            if self._names.pop(name, None) is not None:
+                for token, names in self._by_token.items():
+                    idx = bisect.bisect_left(names, name)
+                    if idx < len(names) and names[idx] == name:
+                        del names[idx]
+            if in_sync:
+                self._stamp()
+
+    def _owns(self, path: Path) -> bool:
+        return path.suffix.lower() == ".pdf" and path.parent.resolve() == self.base_dir
+
+    def _scan(self) -> None:
+        names: Dict[str, str] = {}
+        try:
+            with os.scandir(self.base_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") or not entry.name.endswith(".pdf"):
+                        continue
+                    if entry.is_file():
+                        names[entry.name] = self._names.get(entry.name) or norm(entry.name)
+        except FileNotFoundError:
+            pass
+        self._names = names
+        self._by_token.clear()
+        self._stamp()
+
+    def _matches(self, token: str) -> List[str]:
+        names = self._by_token.get(token)
+        if names is not None:
+            self._by_token.move_to_end(token)
+            return names
+        names = sorted(n for n in self._names if token in n)
+        self._by_token[token] = names
+        while len(self._by_token) > MAX_TOKENS:
+            self._by_token.popitem(last=False)
+        return names
+
+    def _stamp(self) -> None:
+        mtime = self._current_mtime()
+        if mtime is not None and time.time_ns() - mtime < _RACY_WINDOW_NS:
+            mtime = None
+        self._dir_mtime = mtime
+
+    def _current_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.base_dir).st_mtime_ns
+        except OSError:
+            return None
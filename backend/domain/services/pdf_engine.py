@@ -10,6 +10,10 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any, List, Optional, Dict, Protocol
 from backend.domain.entities import CertificadoBundleEntity
+from backend.domain.exceptions import FeatureUnavailableError
+
+# Código de erro quando a junção de PDFs não está disponível
+PDF_MERGE_UNAVAILABLE = "PDF_MERGE_UNAVAILABLE"
 
 
 class PdfEngine(ABC):
@@ -111,6 +115,36 @@ class PdfEngine(ABC):
         """
         ...
 
+    def render_pdf(self, bundle: Any) -> Path:
+        """
+        Renderiza o PDF de um bundle e retorna o caminho gerado.
+
+        A implementação padrão usa o gerador do próprio processo; adapters
+        podem delegar a um pool de processos.
+        """
+        return self.get_pdf_generator().generate(bundle)
+
+    def template_version(self) -> str:
+        """
+        Identifica a versão do template/recursos de renderização; entra no
+        fingerprint dos PDFs, então mudá-la força nova renderização.
+        """
+        return ""
+
+    def supports_pdf_merge(self) -> bool:
+        """Indica se ``merge_pdfs`` está disponível neste motor (consulte antes de chamar)."""
+        return False
+
+    def merge_pdfs(self, sources: List[Path], target: Path) -> Path:
+        """
+        Concatena os PDFs ``sources`` (na ordem) em um único arquivo ``target``.
+
+        Raises:
+            FeatureUnavailableError: ``PDF_MERGE_UNAVAILABLE`` se o motor não
+                suporta a junção (``supports_pdf_merge()`` é False)
+        """
+        raise FeatureUnavailableError("Junção de PDFs não suportada por este motor.", codigo=PDF_MERGE_UNAVAILABLE)
+
 
 class CsvManagerPort(Protocol):
     produtos_path: Path
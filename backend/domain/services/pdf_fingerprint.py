@@ -0,0 +1,136 @@
+"""
+Domain Service - Fingerprint dos PDFs renderizados
+Cada PDF gerado é associado ao hash dos dados do bundle (certificado, produtos,
+métodos) e da versão do template; ``ensure_pdf`` só renderiza de novo quando
+esse hash muda, e os downloads conferem o mesmo hash antes de servir o PDF.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DB_NAME = ".fingerprints.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    numero TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    pdf TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fingerprints_pdf ON fingerprints (pdf);
+"""
+
+
+def _plain(obj: Any) -> Any:
+    """Converte entidades da engine/domínio em dados simples para o hash."""
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, dict):
+        return obj
+    if hasattr(obj, "__dict__"):
+        return {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+    return str(obj)
+
+
+def bundle_fingerprint(bundle: Any, template_version: str = "") -> str:
+    """SHA-256 canônico de certificado + produtos + métodos + versão do template."""
+    payload = {
+        "certificado": _plain(getattr(bundle, "certificado", None)),
+        "produtos": [_plain(p) for p in getattr(bundle, "produtos", None) or []],
+        "metodos": [_plain(m) for m in getattr(bundle, "metodos", None) or []],
+        "template": template_version,
+    }
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class PdfFingerprintManifest:
+    """
+    Manifesto ``<output_dir>/.fingerprints.sqlite3``: número -> (fingerprint, pdf).
+
+    Cada renderização grava só a própria linha (upsert); o SQLite serializa
+    escritas de processos diferentes (workers do servidor e do pool de
+    renderização) pelo lock do próprio arquivo, sem regravar o manifesto
+    inteiro.
+    """
+
+    _instances: Dict[str, "PdfFingerprintManifest"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_dir(cls, output_dir: Path) -> "PdfFingerprintManifest":
+        """Retorna o manifesto compartilhado do diretório (um por processo)."""
+        key = str(Path(output_dir).resolve())
+        with cls._instances_lock:
+            manifest = cls._instances.get(key)
+            if manifest is None:
+                manifest = cls(Path(key))
+                cls._instances[key] = manifest
+            return manifest
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self.db_path = base_dir / DB_NAME
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def lookup(self, numero: str, fingerprint: str) -> Optional[Path]:
+        """PDF registrado para ``numero`` se o fingerprint confere e o arquivo existe."""
+        entry = self.get(numero)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        path = self.base_dir / entry.get("pdf", "")
+        return path if path.is_file() else None
+
+    def get(self, numero: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT fingerprint, pdf FROM fingerprints WHERE numero = ?", (str(numero),)
+            ).fetchone()
+        return {"fingerprint": row[0], "pdf": row[1]} if row else None
+
+    def numeros_by_pdf(self) -> Dict[str, str]:
+        """Nome do PDF registrado -> número do certificado."""
+        with self._lock:
+            rows = self._connect().execute("SELECT pdf, numero FROM fingerprints WHERE pdf != ''").fetchall()
+        return dict(rows)
+
+    def record(self, numero: str, fingerprint: str, pdf_path: Path) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO fingerprints (numero, fingerprint, pdf) VALUES (?, ?, ?)",
+                    (str(numero), fingerprint, Path(pdf_path).name),
+                )
+
+    def forget(self, numero: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM fingerprints WHERE numero = ?", (str(numero),))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
@@ -0,0 +1,324 @@
+"""
+Domain Service - Catálogo persistente de metadados dos PDFs
+Tabela SQLite (``<output_dir>/.pdf_catalog.sqlite3``) com nome, caminho
+relativo, tamanho, mtime e número do certificado de cada PDF, para o navegador
+de PDFs do admin consultar por índice em vez de varrer o disco.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.domain.services.pdf_catalog import norm
+from backend.domain.services.pdf_fingerprint import PdfFingerprintManifest
+
+DB_NAME = ".pdf_catalog.sqlite3"
+# Diretórios modificados há menos que isso são revarridos na próxima sincronização
+# (uma escrita concorrente pode cair no mesmo tique do mtime)
+_RACY_WINDOW_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdfs (
+    relpath TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_norm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    numero TEXT
+);
+CREATE INDEX IF NOT EXISTS pdfs_mtime ON pdfs (mtime_ns DESC, relpath);
+CREATE INDEX IF NOT EXISTS pdfs_dir ON pdfs (dir);
+CREATE INDEX IF NOT EXISTS pdfs_numero ON pdfs (numero);
+CREATE INDEX IF NOT EXISTS pdfs_ino ON pdfs (ino);
+CREATE TABLE IF NOT EXISTS dirs (
+    relpath TEXT PRIMARY KEY,
+    mtime_ns INTEGER
+);
+"""
+
+
+@dataclass(frozen=True)
+class PdfRecord:
+    name: str
+    relpath: str
+    size: int
+    mtime: float
+    numero: Optional[str]
+
+
+@dataclass(frozen=True)
+class PdfListing:
+    items: List[PdfRecord]
+    total: int
+    facets: Dict[str, Any]
+
+
+class PdfMetadataCatalog:
+    """
+    Metadados dos PDFs de um diretório de saída, persistidos em SQLite.
+
+    ``sync`` compara o mtime de cada diretório conhecido com o registrado e
+    só revarre (``os.scandir``) os que mudaram; os fluxos de escrita e
+    exclusão atualizam as linhas diretamente (``upsert``/``remove``). O número
+    do certificado vem do fluxo de escrita, do manifesto de fingerprints ou de
+    outro PDF com o mesmo inode (aliases por cidade).
+    """
+
+    _instances: Dict[str, "PdfMetadataCatalog"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_dir(cls, output_dir: Path) -> "PdfMetadataCatalog":
+        """Retorna o catálogo compartilhado do diretório (um por processo)."""
+        key = str(Path(output_dir).resolve())
+        with cls._instances_lock:
+            catalog = cls._instances.get(key)
+            if catalog is None:
+                catalog = cls(Path(key))
+                cls._instances[key] = catalog
+            return catalog
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self.db_path = base_dir / DB_NAME
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def sync(self) -> int:
+        """
+        Reconcilia a tabela com o disco, revarrendo apenas diretórios alterados.
+
+        Returns:
+            Número de diretórios revarridos.
+        """
+        with self._lock:
+            conn = self._connect()
+            known: Dict[str, Optional[int]] = dict(conn.execute("SELECT relpath, mtime_ns FROM dirs"))
+            queue = [""] + sorted(d for d in known if d)
+            seen: Set[str] = set()
+            scanned = 0
+            with conn:
+                while queue:
+                    rel = queue.pop()
+                    if rel in seen:
+                        continue
+                    seen.add(rel)
+                    directory = self.base_dir / rel if rel else self.base_dir
+                    try:
+                        mtime = os.stat(directory).st_mtime_ns
+                    except (FileNotFoundError, NotADirectoryError):
+                        self._purge_dir(conn, rel)
+                        continue
+                    if rel in known and known[rel] == mtime:
+                        continue
+                    scanned += 1
+                    for sub in self._rescan_dir(conn, rel, directory):
+                        if sub not in seen:
+                            queue.append(sub)
+                    stamp = None if time.time_ns() - mtime < _RACY_WINDOW_NS else mtime
+                    conn.execute("INSERT OR REPLACE INTO dirs (relpath, mtime_ns) VALUES (?, ?)", (rel, stamp))
+            return scanned
+
+    def upsert(self, path: Path, numero: Optional[str] = None) -> None:
+        """Registra (ou atualiza) um PDF escrito; sem ``numero``, herda o de outro link do mesmo arquivo."""
+        path = Path(path)
+        rel = self._relpath(path)
+        if rel is None:
+            return
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self.remove([path])
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if numero is None:
+                    numero = self._numero_by_ino(conn, st.st_ino)
+                conn.execute(
+                    "INSERT OR REPLACE INTO pdfs (relpath, dir, name, name_norm, size, mtime_ns, ino, numero) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._row(rel, path.name, st, numero),
+                )
+
+    def remove(self, paths: Iterable[Path]) -> None:
+        rels = [rel for rel in (self._relpath(Path(p)) for p in paths) if rel is not None]
+        if not rels:
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("DELETE FROM pdfs WHERE relpath = ?", [(rel,) for rel in rels])
+
+    def query(
+        self,
+        q: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> PdfListing:
+        """
+        PDFs mais recentes primeiro, filtrados por trecho do nome e período de modificação.
+
+        ``facets`` traz, para o conjunto filtrado, contagens por mês de
+        modificação (``month``), por diretório (``dir``) e por vínculo com
+        certificado (``linked``).
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if q and q.strip():
+            clauses.append("instr(name_norm, ?) > 0")
+            params.append(norm(q.strip()))
+        if since is not None:
+            clauses.append("mtime_ns >= ?")
+            params.append(int(since * 1_000_000_000))
+        if until is not None:
+            clauses.append("mtime_ns <= ?")
+            params.append(int(until * 1_000_000_000))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                f"SELECT name, relpath, size, mtime_ns, numero FROM pdfs {where} ORDER BY mtime_ns DESC, relpath LIMIT ? OFFSET ?",
+                (*params, max(0, limit), max(0, offset)),
+            ).fetchall()
+            total = conn.execute(f"SELECT COUNT(*) FROM pdfs {where}", params).fetchone()[0]
+            months = conn.execute(
+                f"SELECT strftime('%Y-%m', mtime_ns / 1000000000, 'unixepoch', 'localtime') AS m, COUNT(*) FROM pdfs {where} GROUP BY m ORDER BY m DESC",
+                params,
+            ).fetchall()
+            dirs = conn.execute(f"SELECT dir, COUNT(*) FROM pdfs {where} GROUP BY dir ORDER BY dir", params).fetchall()
+            linked = conn.execute(f"SELECT COUNT(numero) FROM pdfs {where}", params).fetchone()[0]
+
+        return PdfListing(
+            items=[PdfRecord(name=r[0], relpath=r[1], size=r[2], mtime=r[3] / 1_000_000_000, numero=r[4]) for r in rows],
+            total=total,
+            facets={
+                "month": [{"value": m, "count": c} for m, c in months],
+                "dir": [{"value": d, "count": c} for d, c in dirs],
+                "linked": {"true": linked, "false": total - linked},
+            },
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _rescan_dir(self, conn: sqlite3.Connection, rel: str, directory: Path) -> List[str]:
+        found: Dict[str, os.stat_result] = {}
+        subdirs: List[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(f"{rel}/{entry.name}" if rel else entry.name)
+                        elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                            found[entry.name] = entry.stat()
+                    except OSError:
+                        continue
+        except FileNotFoundError:
+            return []
+
+        existing = {
+            name: (size, mtime_ns, ino, numero)
+            for name, size, mtime_ns, ino, numero in conn.execute(
+                "SELECT name, size, mtime_ns, ino, numero FROM pdfs WHERE dir = ?", (rel,)
+            )
+        }
+        gone = [name for name in existing if name not in found]
+        conn.executemany("DELETE FROM pdfs WHERE relpath = ?", [(self._join(rel, n),) for n in gone])
+
+        changed = {
+            name: st
+            for name, st in found.items()
+            if existing.get(name, (None,))[:3] != (st.st_size, st.st_mtime_ns, st.st_ino)
+        }
+        if changed:
+            by_pdf = self._manifest_numeros()
+            rows = []
+            for name, st in changed.items():
+                numero = by_pdf.get(name) or (existing.get(name) or (None,) * 4)[3]
+                rows.append(self._row(self._join(rel, name), name, st, numero))
+            # Aliases (hard links) herdam o número do arquivo de mesmo inode
+            by_ino = {row[6]: row[7] for row in rows if row[7]}
+            rows = [row if row[7] else row[:7] + (by_ino.get(row[6]) or self._numero_by_ino(conn, row[6]),) for row in rows]
+            conn.executemany(
+                "INSERT OR REPLACE INTO pdfs (relpath, dir, name, name_norm, size, mtime_ns, ino, numero) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+        known_subdirs = {r for (r,) in conn.execute("SELECT relpath FROM dirs WHERE relpath LIKE ? ESCAPE '\\'", (self._like_prefix(rel),))}
+        current = set(subdirs)
+        for sub in known_subdirs:
+            # Só filhos diretos: os demais são tratados pelo próprio diretório pai
+            if sub and "/" not in sub[len(rel) + 1 if rel else 0:] and sub not in current:
+                self._purge_dir(conn, sub)
+        return subdirs
+
+    def _purge_dir(self, conn: sqlite3.Connection, rel: str) -> None:
+        if not rel:
+            conn.execute("DELETE FROM pdfs")
+            conn.execute("DELETE FROM dirs")
+            return
+        prefix = self._like_prefix(rel)
+        conn.execute("DELETE FROM pdfs WHERE dir = ? OR dir LIKE ? ESCAPE '\\'", (rel, prefix))
+        conn.execute("DELETE FROM dirs WHERE relpath = ? OR relpath LIKE ? ESCAPE '\\'", (rel, prefix))
+
+    def _manifest_numeros(self) -> Dict[str, str]:
+        try:
+            return PdfFingerprintManifest.for_dir(self.base_dir).numeros_by_pdf()
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _numero_by_ino(conn: sqlite3.Connection, ino: int) -> Optional[str]:
+        row = conn.execute("SELECT numero FROM pdfs WHERE ino = ? AND numero IS NOT NULL LIMIT 1", (ino,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _row(rel: str, name: str, st: os.stat_result, numero: Optional[str]) -> Tuple[Any, ...]:
+        directory = rel.rpartition("/")[0]
+        return (rel, directory, name, norm(name), st.st_size, st.st_mtime_ns, st.st_ino, numero)
+
+    @staticmethod
+    def _join(rel: str, name: str) -> str:
+        return f"{rel}/{name}" if rel else name
+
+    @staticmethod
+    def _like_prefix(rel: str) -> str:
+        escaped = rel.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"{escaped}/%" if rel else "%"
+
+    def _relpath(self, path: Path) -> Optional[str]:
+        if path.suffix.lower() != ".pdf":
+            return None
+        try:
+            rel = path.resolve().relative_to(self.base_dir)
+        except ValueError:
+            return None
+        if any(part.startswith(".") for part in rel.parts):
+            return None
+        return rel.as_posix()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
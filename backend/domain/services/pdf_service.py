@@ -3,42 +3,54 @@ Domain Service - Gerenciamento de PDFs
 Operações de PDF que fazem parte da lógica de negócio
 """
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, List, Optional
+from fnmatch import fnmatchcase
+import sqlite3
 import unicodedata
-import shutil
 
 from backend.domain.services.pdf_engine import PdfEngine
-from backend.domain.exceptions import CertificadoNotFoundError, PdfGenerationError
+from backend.domain.services.pdf_catalog import PdfCatalog, norm, numero_token
+from backend.domain.services.pdf_store import PdfObjectStore
+from backend.domain.services.pdf_fingerprint import PdfFingerprintManifest, bundle_fingerprint
+from backend.domain.services.pdf_metadata import PdfMetadataCatalog
+from backend.domain.services.metrics import MetricsRegistry
+from backend.domain.exceptions import CertificadoNotFoundError, PdfDeletionError, PdfGenerationError
 
 
 # ============================================================================
 # PDF MANAGEMENT
 # ============================================================================
 
-def find_existing_pdf(bundle: Any, pdf_engine: PdfEngine) -> Optional[Path]:
+def find_existing_pdf(bundle: Any, pdf_engine: PdfEngine, catalog: Optional[PdfCatalog] = None) -> Optional[Path]:
     """
     Procura por PDF existente de um certificado.
     
     Args:
         bundle: Bundle do certificado (objeto da engine)
         pdf_engine: Motor de PDF
+        catalog: Catálogo já reconciliado pelo chamador (opcional)
         
     Returns:
         Path do PDF se encontrado, None caso contrário
     """
     certificado = bundle.certificado
     cnpj_digits = certificado.cnpj.replace(".", "").replace("/", "").replace("-", "")
-    numero_sanitizado = certificado.numero_certificado.replace("/", "-")
+    numero_sanitizado = numero_token(certificado.numero_certificado)
     pattern = f"*{cnpj_digits[:8]}*{numero_sanitizado}*.pdf"
     
-    pdf_generator = pdf_engine.get_pdf_generator()
-    pdfs = sorted(pdf_generator.output_dir.glob(pattern))
+    pdfs = _catalog_find(pdf_engine, catalog, numero_sanitizado, pattern)
     return pdfs[0] if pdfs else None
 
 
 def ensure_pdf(bundle: Any, pdf_engine: PdfEngine) -> Path:
     """
-    Garante que o PDF existe, gerando se necessário.
+    Garante que o PDF existe e corresponde aos dados atuais do bundle.
+    
+    O fingerprint (certificado, produtos, métodos e versão do template) do
+    último PDF renderizado fica no manifesto (``.fingerprints.sqlite3``): se
+    confere, o PDF é reaproveitado; se mudou, o PDF antigo (e seus aliases) é
+    descartado e renderizado de novo. PDFs anteriores ao manifesto são
+    adotados como estão.
     
     Args:
         bundle: Bundle do certificado
@@ -50,13 +62,31 @@ def ensure_pdf(bundle: Any, pdf_engine: PdfEngine) -> Path:
     Raises:
         PdfGenerationError: Se houver erro na geração
     """
-    existing_pdf = find_existing_pdf(bundle, pdf_engine)
-    if existing_pdf:
-        return existing_pdf
+    metrics = MetricsRegistry.shared()
+    numero = str(bundle.certificado.numero_certificado)
+    manifest = get_manifest(pdf_engine)
+    fingerprint = bundle_fingerprint(bundle, pdf_engine.template_version())
+
+    current = _current_pdf(bundle, pdf_engine, manifest, fingerprint)
+    if current:
+        return current
+
+    previous = manifest.get(numero)
+    if previous:
+        # Dados ou template mudaram: o PDF antigo não serve mais
+        metrics.incr("pdf.fingerprint.stale")
+        stale = get_catalog(pdf_engine).base_dir / previous.get("pdf", "")
+        if stale.is_file():
+            delete_pdfs([stale], pdf_engine)
+        manifest.forget(numero)
+    else:
+        metrics.incr("pdf.fingerprint.miss")
     
     try:
-        pdf_generator = pdf_engine.get_pdf_generator()
-        generated = pdf_generator.generate(bundle)
+        generated = pdf_engine.render_pdf(bundle)
+        _intern(generated, pdf_engine)
+        manifest.record(numero, fingerprint, generated)
+        _track(generated, pdf_engine, numero)
         cert = bundle.certificado if hasattr(bundle, "certificado") else None
         cidade = getattr(cert, "cidade", None) if cert else None
         if cidade:
@@ -71,28 +101,53 @@ def ensure_pdf(bundle: Any, pdf_engine: PdfEngine) -> Path:
         )
 
 
-def find_existing_pdf_for_cert(cert: Any, pdf_engine: PdfEngine) -> Optional[Path]:
+def current_pdf(bundle: Any, pdf_engine: PdfEngine) -> Optional[Path]:
+    """
+    PDF do bundle que pode ser servido sem renderizar: o registrado no
+    manifesto com o fingerprint atual, ou um PDF anterior ao manifesto
+    (adotado). None quando ``ensure_pdf`` precisa renderizar.
+    """
+    manifest = get_manifest(pdf_engine)
+    fingerprint = bundle_fingerprint(bundle, pdf_engine.template_version())
+    return _current_pdf(bundle, pdf_engine, manifest, fingerprint)
+
+
+def _current_pdf(bundle: Any, pdf_engine: PdfEngine, manifest: PdfFingerprintManifest, fingerprint: str) -> Optional[Path]:
+    metrics = MetricsRegistry.shared()
+    numero = str(bundle.certificado.numero_certificado)
+    cached = manifest.lookup(numero, fingerprint)
+    if cached:
+        metrics.incr("pdf.fingerprint.hit")
+        return cached
+    if manifest.get(numero):
+        return None
+    existing_pdf = find_existing_pdf(bundle, pdf_engine)
+    if existing_pdf:
+        metrics.incr("pdf.fingerprint.adopted")
+        manifest.record(numero, fingerprint, existing_pdf)
+        _track(existing_pdf, pdf_engine, numero)
+        return existing_pdf
+    return None
+
+
+def find_existing_pdf_for_cert(cert: Any, pdf_engine: PdfEngine, catalog: Optional[PdfCatalog] = None) -> Optional[Path]:
     data = cert.to_dict() if hasattr(cert, "to_dict") else cert
     numero = str(data.get("numero_certificado", ""))
     nome = str(data.get("razao_social", ""))
     cidade = str(data.get("cidade", ""))
 
-    def norm(s: str) -> str:
-        s = unicodedata.normalize("NFKD", s)
-        s = "".join([c for c in s if not unicodedata.combining(c)])
-        return s.lower()
-
-    numero_sanitizado = numero.replace("/", "-")
+    numero_sanitizado = numero_token(numero)
     name_token_dash = norm(nome).replace(" ", "-")
     name_token_space = norm(nome)
     city_token_dash = norm(cidade).replace(" ", "-")
     city_token_space = norm(cidade)
 
-    pdf_generator = pdf_engine.get_pdf_generator()
-    specific = list(pdf_generator.output_dir.glob(f"*{numero_sanitizado}*{city_token_dash}*.pdf"))
-    candidates = sorted(specific) or sorted(pdf_generator.output_dir.glob(f"*{numero_sanitizado}*.pdf"))
+    todos = _catalog_find(pdf_engine, catalog, numero_sanitizado)
+    specific = [p for p in todos if fnmatchcase(p.name, f"*{numero_sanitizado}*{city_token_dash}*.pdf")]
+    candidates = specific or todos
+    catalog = catalog or get_catalog(pdf_engine)
     for p in candidates:
-        fname = norm(p.name)
+        fname = catalog.normalized(p.name)
         if city_token_dash and city_token_dash in fname:
             return p
         if city_token_space and city_token_space in fname:
@@ -115,15 +170,110 @@ def ensure_city_prefixed_copy(pdf_path: Path, cidade: str, pdf_engine: PdfEngine
         return pdf_path
     target_name = f"{cidade_token}_{pdf_path.name}" if cidade_token else pdf_path.name
     target_path = (base_dir / target_name).resolve()
-    if target_path.exists():
+    store = get_store(pdf_engine)
+    # Nome já existente só serve se ainda aponta para o PDF atual
+    if store.is_alias(target_path, pdf_path):
         return target_path
     try:
-        shutil.copyfile(pdf_path, target_path)
+        # Alias (hard link) do mesmo objeto em vez de uma segunda cópia dos bytes
+        store.alias(pdf_path, target_path)
+        _track(target_path, pdf_engine)
         return target_path
     except Exception:
         return pdf_path
 
 
+def find_pdf_for_certificado(certificado: Any, pdf_engine: PdfEngine, catalog: Optional[PdfCatalog] = None) -> Optional[Path]:
+    """
+    Localiza o PDF de um certificado: primeiro por número + cidade/razão social,
+    depois pelo padrão CNPJ + número.
+    """
+    path = find_existing_pdf_for_cert(certificado, pdf_engine, catalog)
+    if path:
+        return path
+    return find_existing_pdf(_CertificadoRef(certificado), pdf_engine, catalog)
+
+
+def get_catalog(pdf_engine: PdfEngine) -> PdfCatalog:
+    """Catálogo compartilhado do diretório de saída de PDFs da engine."""
+    return PdfCatalog.for_dir(pdf_engine.get_pdf_generator().output_dir)
+
+
+def get_store(pdf_engine: PdfEngine) -> PdfObjectStore:
+    """Armazenamento por conteúdo do diretório de saída de PDFs da engine."""
+    return PdfObjectStore.for_dir(pdf_engine.get_pdf_generator().output_dir)
+
+
+def get_manifest(pdf_engine: PdfEngine) -> PdfFingerprintManifest:
+    """Manifesto de fingerprints do diretório de saída de PDFs da engine."""
+    return PdfFingerprintManifest.for_dir(pdf_engine.get_pdf_generator().output_dir)
+
+
+def get_metadata(pdf_engine: PdfEngine) -> PdfMetadataCatalog:
+    """Catálogo persistente (SQLite) de metadados dos PDFs da engine."""
+    return PdfMetadataCatalog.for_dir(pdf_engine.get_pdf_generator().output_dir)
+
+
+def delete_pdfs(paths: List[Path], pdf_engine: PdfEngine) -> List[Path]:
+    """
+    Apaga PDFs com todos os seus aliases e atualiza os catálogos.
+
+    Raises:
+        PdfDeletionError: Remoção parcial; os catálogos já refletem o que foi apagado.
+    """
+    try:
+        removed = get_store(pdf_engine).remove(paths)
+    except PdfDeletionError as e:
+        _forget(pdf_engine, [Path(p) for p in e.removed])
+        raise
+    _forget(pdf_engine, removed)
+    return removed
+
+
+def _forget(pdf_engine: PdfEngine, removed: List[Path]) -> None:
+    """Retira dos catálogos em memória e persistente os caminhos apagados."""
+    catalog = get_catalog(pdf_engine)
+    for path in removed:
+        catalog.discard(path)
+    try:
+        get_metadata(pdf_engine).remove(removed)
+    except sqlite3.Error:
+        # A próxima sincronização do catálogo persistente remove as linhas
+        pass
+
+
+def _track(path: Path, pdf_engine: PdfEngine, numero: Optional[str] = None) -> None:
+    """Registra um PDF escrito nos catálogos em memória e persistente."""
+    get_catalog(pdf_engine).add(path)
+    try:
+        get_metadata(pdf_engine).upsert(path, numero)
+    except sqlite3.Error:
+        # Catálogo persistente é reconciliado pelo scandir na próxima listagem
+        pass
+
+
+def _intern(path: Path, pdf_engine: PdfEngine) -> None:
+    try:
+        get_store(pdf_engine).intern(path)
+    except OSError:
+        # Armazenamento por conteúdo é otimização: o PDF gerado continua válido
+        pass
+
+
+def _catalog_find(pdf_engine: PdfEngine, catalog: Optional[PdfCatalog], token: str, pattern: Optional[str] = None) -> List[Path]:
+    # Catálogo explícito: o chamador já reconciliou (resolução em lote)
+    if catalog is not None:
+        return catalog.find(token, pattern, refresh=False)
+    return get_catalog(pdf_engine).find(token, pattern)
+
+
+class _CertificadoRef:
+    """Adapta um certificado isolado à interface de bundle usada por find_existing_pdf."""
+
+    def __init__(self, certificado: Any):
+        self.certificado = certificado
+
+
 def load_cert_by_id(cert_id: str, pdf_engine: PdfEngine) -> Any:
     """
     Carrega um certificado pelo ID.
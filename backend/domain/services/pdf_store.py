@@ -0,0 +1,261 @@
+"""
+Domain Service - Armazenamento de PDFs por conteúdo
+Cada PDF é guardado uma única vez em ``<output_dir>/.objects/<sha256>``; o nome
+gerado pela engine e as cópias prefixadas por cidade são hard links para esse
+objeto, não cópias dos bytes.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.domain.exceptions import PdfDeletionError
+from backend.domain.services.upload_spool import sha256_file
+
+OBJECTS_DIR = ".objects"
+
+
+class PdfObjectStore:
+    """
+    Objetos de PDF endereçados por conteúdo e seus aliases (hard links).
+
+    Em sistemas de arquivos sem hard link, ``alias`` recorre à cópia e
+    ``intern`` não faz nada: o comportamento volta a ser o de cópias soltas.
+    """
+
+    _instances: Dict[str, "PdfObjectStore"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_dir(cls, output_dir: Path) -> "PdfObjectStore":
+        """Retorna o armazenamento compartilhado do diretório (um por processo)."""
+        key = str(Path(output_dir).resolve())
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls(Path(key))
+                cls._instances[key] = store
+            return store
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self.objects_dir = base_dir / OBJECTS_DIR
+        self._lock = threading.Lock()
+        # (dispositivo, inode) -> SHA-256 dos objetos, para reaproveitar o hash já calculado
+        self._digests: Dict[Tuple[int, int], str] = {}
+        self._objects_mtime: Optional[int] = None
+
+    def intern(self, path: Path) -> Path:
+        """
+        Garante que ``path`` aponta para um objeto do armazenamento.
+
+        Se já existe objeto com o mesmo conteúdo, ``path`` passa a ser um link
+        para ele (a cópia redundante é descartada).
+        """
+        path = Path(path)
+        if path.stat().st_nlink > 1:
+            return path
+        digest = sha256_file(path)
+        obj = self.objects_dir / digest
+        with self._lock:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(path, obj)
+            except FileExistsError:
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                tmp.unlink(missing_ok=True)
+                os.link(obj, tmp)
+                os.replace(tmp, path)
+            except OSError:
+                # Sem suporte a hard link neste sistema de arquivos
+                return path
+            try:
+                st = obj.stat()
+                self._digests[(st.st_dev, st.st_ino)] = digest
+            except OSError:
+                pass
+        return path
+
+    def digest_of(self, path: Path, st: os.stat_result) -> Optional[str]:
+        """
+        SHA-256 de ``path`` se ele é um alias de um objeto do armazenamento
+        (o nome do objeto é o próprio hash), sem reler o conteúdo.
+
+        O mapa inode -> hash é montado com um ``scandir`` de ``.objects`` e
+        refeito só quando o diretório muda; cada resposta é conferida contra o
+        inode atual do objeto.
+        """
+        if st.st_nlink < 2:
+            return None
+        key = (st.st_dev, st.st_ino)
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is None:
+                self._load_digests()
+                digest = self._digests.get(key)
+            if digest is None:
+                return None
+            try:
+                obj = (self.objects_dir / digest).stat()
+            except OSError:
+                obj = None
+            if obj is None or (obj.st_dev, obj.st_ino) != key:
+                self._digests.pop(key, None)
+                return None
+            return digest
+
+    def _load_digests(self) -> None:
+        try:
+            mtime = os.stat(self.objects_dir).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._objects_mtime:
+            return
+        digests: Dict[Tuple[int, int], str] = {}
+        try:
+            with os.scandir(self.objects_dir) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    digests[(st.st_dev, st.st_ino)] = entry.name
+        except FileNotFoundError:
+            return
+        self._digests = digests
+        self._objects_mtime = mtime
+
+    def alias(self, source: Path, target: Path) -> Path:
+        """
+        Cria ``target`` como link para o objeto de ``source`` (cópia se não houver hard link).
+
+        Um ``target`` existente que não é alias de ``source`` (cópia solta
+        ainda não compactada, ou cópia de um PDF anterior) é substituído.
+        """
+        source, target = Path(source), Path(target)
+        if self.is_alias(target, source):
+            return target
+        self.intern(source)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(source, tmp)
+        except OSError:
+            # Cópia preservando o mtime: ``is_alias`` a reconhece depois
+            shutil.copy2(source, tmp)
+        os.replace(tmp, target)
+        return target
+
+    @staticmethod
+    def is_alias(target: Path, source: Path) -> bool:
+        """
+        ``target`` é o mesmo arquivo que ``source``: mesmo inode ou, sem hard
+        link, uma cópia de ``alias`` (mesmo tamanho e mtime).
+        """
+        try:
+            current, expected = Path(target).stat(), Path(source).stat()
+        except OSError:
+            return False
+        if (current.st_dev, current.st_ino) == (expected.st_dev, expected.st_ino):
+            return True
+        return current.st_nlink == 1 and (current.st_size, current.st_mtime_ns) == (expected.st_size, expected.st_mtime_ns)
+
+    def remove(self, paths: Iterable[Path]) -> List[Path]:
+        """
+        Apaga ``paths`` junto com todos os aliases e o objeto de cada um.
+
+        Returns:
+            Todos os caminhos efetivamente removidos (para atualizar catálogos).
+
+        Raises:
+            PdfDeletionError: Se algum caminho não pôde ser apagado; os demais
+                são removidos mesmo assim e vêm em ``removed``.
+        """
+        targets = [Path(p) for p in paths]
+        inodes: Set[Tuple[int, int]] = set()
+        for path in targets:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            if st.st_nlink > 1:
+                inodes.add((st.st_dev, st.st_ino))
+
+        candidates = list(targets)
+        if inodes:
+            candidates.extend(self._entries_with_inode(inodes))
+
+        removed: List[Path] = []
+        failed: List[Dict[str, str]] = []
+        seen: Set[str] = set()
+        for path in candidates:
+            key = str(path)
+            if key in seen:
+                continue
+            seen.add(key)
+            try:
+                path.unlink()
+                removed.append(path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                failed.append({"path": key, "error": str(e)})
+        if failed:
+            raise PdfDeletionError(
+                f"Falha ao remover {len(failed)} arquivo(s).",
+                removed=[str(p) for p in removed],
+                failed=failed,
+            )
+        return removed
+
+    def compact(self) -> int:
+        """
+        Converte cópias soltas já existentes em aliases de objetos.
+
+        Returns:
+            Número de arquivos cujo conteúdo passou a ser compartilhado.
+        """
+        shared = 0
+        for entry in self._pdf_entries(self.base_dir):
+            try:
+                before = entry.stat().st_nlink
+                if before > 1:
+                    continue
+                self.intern(entry)
+                # Dois links (arquivo + objeto) indicam objeto novo; mais que isso, conteúdo repetido
+                if entry.stat().st_nlink > 2:
+                    shared += 1
+            except OSError:
+                continue
+        return shared
+
+    def _entries_with_inode(self, inodes: Set[Tuple[int, int]]) -> List[Path]:
+        found: List[Path] = []
+        for directory in (self.base_dir, self.objects_dir):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if (st.st_dev, st.st_ino) in inodes:
+                            found.append(Path(entry.path))
+            except FileNotFoundError:
+                continue
+        return found
+
+    @staticmethod
+    def _pdf_entries(directory: Path) -> List[Path]:
+        try:
+            with os.scandir(directory) as entries:
+                return [
+                    Path(e.path)
+                    for e in entries
+                    if not e.name.startswith(".") and e.name.lower().endswith(".pdf") and e.is_file(follow_symlinks=False)
+                ]
+        except FileNotFoundError:
+            return []
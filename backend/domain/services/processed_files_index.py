@@ -2,17 +2,54 @@ from __future__ import annotations
 
 import json
 import hashlib
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Set
+
+# Linhas novas no JSONL após as quais um snapshot compactado é regravado
+SNAPSHOT_EVERY = 500
+# Bytes finais do trecho coberto pelo snapshot, para validar que o JSONL não foi trocado
+_PROBE_SIZE = 64
 
 
 class ProcessedFilesIndex:
-    def __init__(self, base_dir: Path):
+    """
+    Registro dos arquivos de upload já processados (``uploads_index.jsonl``).
+
+    Os hashes ficam em um conjunto em memória carregado uma vez por processo
+    (``for_dir``). Linhas acrescentadas por outros workers são lidas a partir
+    do último offset conhecido, e um snapshot compactado
+    (``uploads_index.snapshot.json``) evita reler todo o histórico na partida.
+    """
+
+    _instances: Dict[str, "ProcessedFilesIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_dir(cls, base_dir: Path) -> "ProcessedFilesIndex":
+        """Retorna o índice compartilhado do diretório (um por processo)."""
+        key = str(Path(base_dir).resolve())
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls(Path(key))
+                cls._instances[key] = index
+            return index
+
+    def __init__(self, base_dir: Path, snapshot_every: int = SNAPSHOT_EVERY):
         self.base_dir = base_dir
         self.index_path = (self.base_dir / "uploads_index.jsonl").resolve()
+        self.snapshot_path = self.index_path.with_name("uploads_index.snapshot.json")
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
         if not self.index_path.exists():
             self.index_path.touch()
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._hashes: Set[str] = set()
+        self._offset = 0
+        self._since_snapshot = 0
+        self._loaded = False
 
     @staticmethod
     def sha256_bytes(data: bytes) -> str:
@@ -21,21 +58,9 @@ class ProcessedFilesIndex:
         return h.hexdigest()
 
     def exists(self, file_hash: str) -> bool:
-        try:
-            with self.index_path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entry = json.loads(line)
-                        if entry.get("hash") == file_hash:
-                            return True
-                    except Exception:
-                        continue
-        except FileNotFoundError:
-            return False
-        return False
+        with self._lock:
+            self._sync()
+            return file_hash in self._hashes
 
     def add(self, entry: Dict[str, Any]) -> None:
         payload = {
@@ -47,6 +72,86 @@ class ProcessedFilesIndex:
             "planilha": entry.get("planilha"),
             "processed_at": entry.get("processed_at"),
         }
-        with self.index_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(payload) + "\n")
+        line = (json.dumps(payload) + "\n").encode("utf-8")
+        with self._lock:
+            # Uma única escrita em O_APPEND: linhas de workers concorrentes não se misturam
+            fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            if payload["hash"]:
+                self._hashes.add(payload["hash"])
+            self._sync()
+
+    def compact(self) -> None:
+        """Grava o snapshot compactado (hashes únicos até o offset atual)."""
+        with self._lock:
+            self._sync(allow_snapshot=False)
+            self._write_snapshot()
 
+    def _sync(self, allow_snapshot: bool = True) -> None:
+        if not self._loaded:
+            self._load_snapshot()
+            self._loaded = True
+        try:
+            size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size < self._offset:
+            # JSONL truncado ou substituído: recomeça do zero
+            self._hashes.clear()
+            self._offset = 0
+        if size > self._offset:
+            self._read_from_offset()
+        if allow_snapshot and self._since_snapshot >= self.snapshot_every:
+            self._write_snapshot()
+
+    def _read_from_offset(self) -> None:
+        with self.index_path.open("rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        # Só consome até a última linha completa (outro worker pode estar escrevendo)
+        end = chunk.rfind(b"\n") + 1
+        for raw in chunk[:end].splitlines():
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                file_hash = json.loads(raw).get("hash")
+            except Exception:
+                continue
+            if file_hash:
+                self._hashes.add(file_hash)
+            self._since_snapshot += 1
+        self._offset += end
+
+    def _load_snapshot(self) -> None:
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            offset = int(data["offset"])
+            probe = bytes.fromhex(data.get("probe", ""))
+            with self.index_path.open("rb") as f:
+                f.seek(max(0, offset - len(probe)))
+                if f.read(len(probe)) != probe or self.index_path.stat().st_size < offset:
+                    return
+            self._hashes = set(data.get("hashes", []))
+            self._offset = offset
+        except Exception:
+            # Snapshot ausente ou inválido: replay completo do JSONL
+            return
+
+    def _write_snapshot(self) -> None:
+        try:
+            with self.index_path.open("rb") as f:
+                f.seek(max(0, self._offset - _PROBE_SIZE))
+                probe = f.read(min(self._offset, _PROBE_SIZE))
+            tmp = self.snapshot_path.with_name(f".{self.snapshot_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(
+                json.dumps({"offset": self._offset, "probe": probe.hex(), "hashes": sorted(self._hashes)}),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.snapshot_path)
+            self._since_snapshot = 0
+        except OSError:
+            pass
@@ -0,0 +1,85 @@
+"""
+Domain Service - Single-flight por chave
+Execuções concorrentes com a mesma chave (ex.: hash do arquivo enviado)
+compartilham um único processamento: quem chega depois aguarda o resultado
+de quem já está executando em vez de repetir o trabalho.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """
+    Registro de execuções em andamento (chave -> ``asyncio.Future``).
+
+    O registro é por processo (``for_dir``) e vale apenas enquanto a execução
+    líder não termina; depois disso a chave é liberada e a próxima chamada
+    executa normalmente (onde a checagem de duplicidade já a recusa).
+    """
+
+    _instances: Dict[str, "SingleFlight"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_dir(cls, base_dir: Path) -> "SingleFlight":
+        """Retorna o registro compartilhado do diretório (um por processo)."""
+        key = str(Path(base_dir).resolve())
+        with cls._instances_lock:
+            flight = cls._instances.get(key)
+            if flight is None:
+                flight = cls()
+                cls._instances[key] = flight
+            return flight
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.joined = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Executa ``fn`` uma única vez por chave em andamento.
+
+        Returns:
+            ``(resultado, compartilhado)``; ``compartilhado`` é True quando o
+            resultado veio de outra execução. Exceções da execução líder são
+            repassadas a todos que a aguardavam. Se a líder for cancelada, os
+            demais tentam novamente (um deles assume a execução).
+        """
+        while True:
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.joined += 1
+            try:
+                return await asyncio.shield(pending), True
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.leaders += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita o aviso "exception was never retrieved" quando ninguém aguardava
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
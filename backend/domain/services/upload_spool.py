@@ -0,0 +1,123 @@
+"""
+Domain Service - Spool de uploads em disco
+Copia o conteúdo enviado para um arquivo temporário em blocos, calculando o
+SHA-256 incrementalmente: a memória por upload fica limitada ao tamanho do bloco.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+from backend.domain.exceptions import ValidationError
+
+CHUNK_SIZE = 1024 * 1024
+# Limite padrão por arquivo enviado (UPLOAD_MAX_BYTES sobrescreve)
+MAX_UPLOAD_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+@dataclass
+class SpooledUpload:
+    """Arquivo enviado já gravado em disco, com hash e tamanho."""
+    filename: str
+    path: Path
+    sha256: str
+    size: int
+
+    def discard(self) -> None:
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+class _Spool:
+    """
+    Temporário em gravação: aplica o limite de tamanho e o SHA-256 a cada
+    bloco; ao sair com erro o arquivo é removido.
+    """
+
+    def __init__(self, filename: str, max_bytes: Optional[int]):
+        self.filename = filename or ""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+        fd, name = tempfile.mkstemp(suffix=Path(self.filename).suffix.lower(), prefix="upload-")
+        self.path = Path(name)
+        self._out = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise ValidationError(
+                f"Arquivo excede o limite de {self.max_bytes} bytes.",
+                errors=[{"field": "arquivo", "message": "FILE_TOO_LARGE"}],
+            )
+        self._digest.update(chunk)
+        self._out.write(chunk)
+
+    def result(self) -> SpooledUpload:
+        return SpooledUpload(filename=self.filename, path=self.path, sha256=self._digest.hexdigest(), size=self.size)
+
+    def __enter__(self) -> "_Spool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._out.close()
+        if exc_type is not None:
+            self.path.unlink(missing_ok=True)
+
+
+async def spool_upload(
+    source: Any,
+    filename: str,
+    max_bytes: Optional[int] = MAX_UPLOAD_BYTES,
+    chunk_size: int = CHUNK_SIZE,
+) -> SpooledUpload:
+    """
+    Grava ``source`` (objeto com ``async read(n)``, ex.: ``UploadFile``) em um
+    temporário com o mesmo sufixo do nome original.
+
+    Raises:
+        ValidationError: ``FILE_TOO_LARGE`` assim que ``max_bytes`` é excedido
+            (o temporário é removido e o restante não é lido).
+    """
+    with _Spool(filename, max_bytes) as spool:
+        while True:
+            chunk = await source.read(chunk_size)
+            if not chunk:
+                break
+            await asyncio.to_thread(spool.write, chunk)
+    return spool.result()
+
+
+def spool_stream(
+    source: BinaryIO,
+    filename: str,
+    max_bytes: Optional[int] = MAX_UPLOAD_BYTES,
+    chunk_size: int = CHUNK_SIZE,
+) -> SpooledUpload:
+    """
+    Versão síncrona de ``spool_upload`` para fluxos binários já abertos
+    (ex.: membros de um ZIP); deve rodar fora do event loop.
+
+    Raises:
+        ValidationError: ``FILE_TOO_LARGE`` assim que ``max_bytes`` é excedido.
+    """
+    with _Spool(filename, max_bytes) as spool:
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            spool.write(chunk)
+    return spool.result()
+
+
+def sha256_file(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 de um arquivo lido em blocos."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
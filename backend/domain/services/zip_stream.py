@@ -0,0 +1,79 @@
+"""
+Domain Service - ZIP em streaming
+Monta o arquivo ZIP à medida que é enviado: cada bloco lido do disco vira
+bytes de saída imediatamente, sem arquivo temporário e com memória limitada
+ao tamanho do bloco. Por padrão as entradas são gravadas sem compressão
+(PDFs praticamente não comprimem).
+"""
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+CHUNK_SIZE = 256 * 1024
+
+
+class _ChunkSink:
+    """Destino não pesquisável do ``ZipFile``: acumula o que foi escrito até ser drenado."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+            self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(
+    entries: Iterable[Tuple[str, Path]],
+    compress: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Gera os bytes de um ZIP com as entradas ``(arcname, caminho)``.
+
+    Arquivos que sumirem antes de serem lidos são ignorados. Como a saída
+    não é pesquisável, tamanhos e CRC de cada entrada vão no descritor de
+    dados após o conteúdo (o diretório central fica completo no final).
+    """
+    sink = _ChunkSink()
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(sink, "w", compression=compression, allowZip64=True) as zf:
+        for arcname, path in entries:
+            try:
+                src = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with src:
+                info = zipfile.ZipInfo.from_file(path, arcname)
+                info.compress_type = compression
+                with zf.open(info, "w", force_zip64=info.file_size > 0x7FFFFFFF) as dst:
+                    while True:
+                        block = src.read(chunk_size)
+                        if not block:
+                            break
+                        dst.write(block)
+                        data = sink.drain()
+                        if data:
+                            yield data
+            data = sink.drain()
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
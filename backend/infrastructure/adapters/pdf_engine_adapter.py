@@ -4,21 +4,31 @@ Implementação concreta da interface PdfEngine usando a biblioteca engine-excel
 """
 from __future__ import annotations
 
+import hashlib
+import importlib.util
+import os
+import threading
+from importlib import metadata
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import engine_excel_to_pdf
 from engine_excel_to_pdf.interface import MotorCertificados
 from engine_excel_to_pdf.config import EngineConfig
 from engine_excel_to_pdf.validators import ValidationError as EngineValidationError
 
-from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.services.pdf_engine import PDF_MERGE_UNAVAILABLE, PdfEngine
+from backend.infrastructure.adapters.pdf_render_pool import PdfRenderPool
 from backend.domain.entities import (
     CertificadoEntity,
     ProdutoEntity,
     MetodoEntity,
     CertificadoBundleEntity,
 )
-from backend.domain.exceptions import ValidationError, FileProcessingError
+from backend.domain.exceptions import FeatureUnavailableError, ValidationError, FileProcessingError
+
+# Arquivos da engine que afetam a aparência do PDF
+_TEMPLATE_SUFFIXES = {".html", ".htm", ".css", ".jinja", ".j2", ".ttf", ".otf", ".woff", ".woff2", ".png", ".jpg", ".jpeg", ".svg"}
 
 
 class EnginePdfAdapter(PdfEngine):
@@ -27,14 +37,21 @@ class EnginePdfAdapter(PdfEngine):
     Esta classe adapta a biblioteca externa para nossa interface de domínio.
     """
     
-    def __init__(self, config: Optional[EngineConfig] = None):
+    def __init__(self, config: Optional[EngineConfig] = None, render_workers: int = 0):
         """
         Inicializa o adapter com configuração.
         
         Args:
             config: Configuração do engine (opcional)
+            render_workers: Processos dedicados à renderização de PDFs (0 renderiza na thread chamadora)
         """
-        self._motor = MotorCertificados(config=config or EngineConfig())
+        config = config or EngineConfig()
+        self._motor = MotorCertificados(config=config)
+        # Gravações nos CSVs/planilha da engine são serializadas; a renderização
+        # de PDFs (fora do motor) continua em paralelo nos uploads em lote.
+        self._write_lock = threading.Lock()
+        self._render_pool = PdfRenderPool(config, render_workers) if render_workers > 0 else None
+        self._template_version = _template_version(config)
     
     def processar_upload(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -51,7 +68,8 @@ class EnginePdfAdapter(PdfEngine):
             FileProcessingError: Se houver erro no processamento
         """
         try:
-            return self._motor.processar_upload(file_path)
+            with self._write_lock:
+                return self._motor.processar_upload(file_path)
         except EngineValidationError as e:
             raise ValidationError(
                 message="Erro de validação no arquivo",
@@ -135,7 +153,8 @@ class EnginePdfAdapter(PdfEngine):
             ValidationError: Se os dados forem inválidos
         """
         try:
-            return self._motor.criar_manual(dados)
+            with self._write_lock:
+                return self._motor.criar_manual(dados)
         except EngineValidationError as e:
             raise ValidationError(
                 message="Erro de validação nos dados do certificado",
@@ -147,6 +166,63 @@ class EnginePdfAdapter(PdfEngine):
                 details=str(e)
             )
     
+    def render_pdf(self, bundle: Any) -> Path:
+        """
+        Renderiza o PDF no pool de processos, quando configurado.
+        
+        Args:
+            bundle: Bundle do certificado (dataclasses da engine)
+            
+        Returns:
+            Caminho do PDF gerado
+        """
+        if self._render_pool is None:
+            return self._motor.pdf_generator.generate(bundle)
+        return self._render_pool.render(bundle)
+
+    def template_version(self) -> str:
+        """
+        Versão da engine + assinatura (mtime/tamanho) de logo e assets,
+        acrescida de ``PDF_TEMPLATE_VERSION`` se definida.
+        """
+        return self._template_version
+
+    def supports_pdf_merge(self) -> bool:
+        """Junção de PDFs requer o extra opcional ``merge`` (pypdf)."""
+        return importlib.util.find_spec("pypdf") is not None
+
+    def merge_pdfs(self, sources: List[Path], target: Path) -> Path:
+        """
+        Concatena os PDFs com pypdf, um documento por vez.
+        
+        Raises:
+            FeatureUnavailableError: ``PDF_MERGE_UNAVAILABLE`` se o pypdf não está instalado
+        """
+        try:
+            from pypdf import PdfWriter
+        except ImportError as e:
+            raise FeatureUnavailableError(
+                "Junção de PDFs requer o pacote pypdf (extra 'merge').", codigo=PDF_MERGE_UNAVAILABLE
+            ) from e
+        writer = PdfWriter()
+        try:
+            for source in sources:
+                writer.append(str(source))
+            with open(target, "wb") as fh:
+                writer.write(fh)
+        finally:
+            writer.close()
+        return target
+
+    def start_render_pool(self) -> None:
+        """Sobe e aquece os workers de renderização (no-op sem pool)."""
+        if self._render_pool is not None:
+            self._render_pool.start()
+
+    def shutdown_render_pool(self) -> None:
+        if self._render_pool is not None:
+            self._render_pool.shutdown()
+
     def reset_cache(self, config: Optional[EngineConfig] = None) -> None:
         """
         Reseta o cache do motor (útil para testes e limpeza).
@@ -185,3 +261,26 @@ class EnginePdfAdapter(PdfEngine):
 
     def _to_metodo_entity(self, engine_met: Any) -> MetodoEntity:
         return MetodoEntity(metodo=getattr(engine_met, "metodo", ""))
+
+
+def _template_version(config: EngineConfig) -> str:
+    try:
+        engine_version = metadata.version("engine-excel-to-pdf")
+    except metadata.PackageNotFoundError:
+        engine_version = ""
+    parts = [engine_version, os.getenv("PDF_TEMPLATE_VERSION", "")]
+    # Templates empacotados na engine (instalação via git não muda a versão)
+    roots = [(Path(engine_excel_to_pdf.__file__).parent, _TEMPLATE_SUFFIXES)]
+    roots += [(Path(p), None) for p in (getattr(config, "logo_path", None), getattr(config, "assets_dir", None)) if p]
+    for root, suffixes in roots:
+        files = sorted(root.rglob("*")) if root.is_dir() else [root]
+        for f in files:
+            if suffixes is not None and f.suffix.lower() not in suffixes:
+                continue
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            if f.is_file():
+                parts.append(f"{f.name}:{st.st_mtime_ns}:{st.st_size}")
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,106 @@
+"""
+Infrastructure Adapter - Pool de processos para renderização de PDFs
+A renderização (WeasyPrint) é CPU-bound e fica presa ao GIL em threads; aqui
+cada worker é um processo com o próprio MotorCertificados, criado uma única
+vez na partida (fontes, templates e logo já carregados).
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Optional
+
+from engine_excel_to_pdf.config import EngineConfig
+
+# Motor do processo worker (criado pelo initializer)
+_worker_motor: Any = None
+
+
+def _init_worker(config: EngineConfig) -> None:
+    global _worker_motor
+    from engine_excel_to_pdf.interface import MotorCertificados
+    _worker_motor = MotorCertificados(config=config)
+    # Instancia o gerador já na partida (carrega fontes/templates/logo)
+    _worker_motor.pdf_generator
+
+
+def _warm(delay: float) -> int:
+    # Mantém o worker ocupado por um instante para que o pool suba os demais
+    time.sleep(delay)
+    return os.getpid()
+
+
+def _render(bundle: Any) -> str:
+    return str(_worker_motor.pdf_generator.generate(bundle))
+
+
+def default_workers() -> int:
+    """
+    ``PDF_RENDER_WORKERS`` limitado ao número de núcleos. O pool é opt-in:
+    sem a variável (ou com 0) a renderização fica no próprio processo.
+    """
+    env = os.getenv("PDF_RENDER_WORKERS")
+    if env is None or env.strip() == "":
+        return 0
+    return min(max(0, int(env)), os.cpu_count() or 1)
+
+
+class PdfRenderPool:
+    """
+    Pool de processos que renderiza bundles da engine.
+
+    O bundle é enviado como dado (pickle das dataclasses da engine), sem
+    referências ao motor do processo principal. Se o pool quebrar (worker
+    morto), ele é recriado uma vez e a renderização é repetida.
+    """
+
+    def __init__(self, config: EngineConfig, workers: int):
+        self.config = config
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """Sobe os processos e aguarda o initializer de todos (pool aquecido)."""
+        executor = self._get_executor()
+        futures = [executor.submit(_warm, 0.2) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def render(self, bundle: Any) -> Path:
+        """Renderiza o PDF em um worker (bloqueia a thread chamadora)."""
+        executor = self._get_executor()
+        try:
+            return Path(executor.submit(_render, bundle).result())
+        except BrokenProcessPool:
+            self._reset(executor)
+            return Path(self._get_executor().submit(_render, bundle).result())
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: o processo principal tem threads (servidor, asyncio); fork não é seguro
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.config,),
+                )
+            return self._executor
+
+    def _reset(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
@@ -10,6 +10,7 @@ from fastapi import APIRouter, Request, Query
 from fastapi.responses import FileResponse, JSONResponse
 
 from backend.interface.controllers.admin_controller import AdminController
+from backend.interface.presenters import file_download
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -36,6 +37,12 @@ async def cache_status(request: Request) -> Dict[str, Any]:
     return await _controller.cache_status()
 
 
+@router.get("/metrics")
+async def metrics() -> Dict[str, Any]:
+    """Endpoint: Métricas internas (contadores e tempos)"""
+    return await _controller.metrics()
+
+
 @router.get("/pdfs")
 async def listar_pdfs(
     q: Optional[str] = Query(default=None),
@@ -50,12 +57,12 @@ async def listar_pdfs(
 
 
 @router.get("/pdfs/preview", response_model=None)
-async def preview_pdf(name: str):
-    """Endpoint: Preview de PDF"""
+async def preview_pdf(name: str, request: Request):
+    """Endpoint: Preview de PDF (ETag/304 e Range/206)"""
     result = await _controller.preview_pdf(name)
     
     if isinstance(result, Path):
-        return FileResponse(path=result, media_type="application/pdf")
+        return await file_download(result, "application/pdf", request.headers)
     
     return result
 
@@ -73,14 +80,9 @@ async def download_pdf(name: str):
 
 @router.post("/pdfs/download-zip", response_model=None)
 async def download_zip(body: Dict[str, Any]):
-    """Endpoint: Download de ZIP"""
+    """Endpoint: Download de ZIP (streaming)"""
     names: List[str] = body.get("names", [])
-    result = await _controller.download_zip(names)
-    
-    if isinstance(result, Path):
-        return FileResponse(path=result, filename="documentos.zip", media_type="application/zip")
-    
-    return result
+    return await _controller.download_zip(names, compress=bool(body.get("compress", False)))
 
 
 @router.delete("/pdfs")
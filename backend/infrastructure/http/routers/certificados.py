@@ -8,13 +8,16 @@ from __future__ import annotations
 from typing import Any, Dict, List
 from pathlib import Path
 
-from fastapi import APIRouter, File, UploadFile
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, File, Request, UploadFile
+from fastapi.responses import JSONResponse
 
 from backend.interface.controllers.certificados_controller import CertificadosController
+from backend.interface.presenters import file_download
 
 router = APIRouter(prefix="/certificados", tags=["certificados"])
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 # Controller será injetado do server.py (DI manual)
 _controller: CertificadosController | None = None
 
@@ -45,8 +48,10 @@ async def listar_certificados(
     max_valor: float | None = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
+    with_total: bool = False,
 ) -> Dict[str, Any]:
-    """Endpoint: Listar certificados com filtros"""
+    """Endpoint: Listar certificados com filtros (offset ou cursor)"""
     return await _controller.listar(
         id=id,
         bairro=bairro,
@@ -54,14 +59,54 @@ async def listar_certificados(
         min_valor=min_valor,
         max_valor=max_valor,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=cursor,
+        with_total=with_total,
+    )
+
+
+@router.get("/busca")
+async def buscar_certificados(q: str | None = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+    """Endpoint: Busca textual (sem acento, por prefixo) ordenada por relevância"""
+    return await _controller.buscar(q=q, limit=limit, offset=offset)
+
+
+@router.get("/export", response_model=None)
+async def exportar_certificados(
+    format: str = "ndjson",
+    id: str | None = None,
+    bairro: str | None = None,
+    cidade: str | None = None,
+    min_valor: float | None = None,
+    max_valor: float | None = None,
+):
+    """Endpoint: Exportar certificados filtrados em streaming (NDJSON ou CSV)"""
+    return await _controller.exportar(
+        format=format,
+        id=id,
+        bairro=bairro,
+        cidade=cidade,
+        min_valor=min_valor,
+        max_valor=max_valor,
     )
 
 
+@router.post("/exportacoes")
+async def criar_exportacao(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Endpoint: Exportação em lote (ZIP ou PDF único) dos certificados filtrados; progresso em /jobs/{id}"""
+    return await _controller.criar_exportacao(payload)
+
+
 @router.post("/upload-excel")
-async def upload_excel(arquivo: UploadFile = File(...)) -> Dict[str, Any]:
-    """Endpoint: Upload de Excel"""
-    return await _controller.upload_excel(arquivo)
+async def upload_excel(arquivo: UploadFile = File(...), async_mode: bool = False) -> Dict[str, Any]:
+    """Endpoint: Upload de Excel (``async_mode=true`` responde 202 com o job)"""
+    return await _controller.upload_excel(arquivo, async_mode=async_mode)
+
+
+@router.post("/upload-batch")
+async def upload_batch(arquivos: List[UploadFile] = File(...)) -> Dict[str, Any]:
+    """Endpoint: Upload em lote (vários .xlsx ou um ZIP)"""
+    return await _controller.upload_batch(arquivos)
 
 
 
@@ -72,43 +117,35 @@ async def obter_por_id(id: str) -> Dict[str, Any]:
 
 
 @router.get("/{id}/pdf", response_model=None)
-async def baixar_pdf_por_id(id: str):
-    """Endpoint: Baixar PDF de certificado"""
+async def baixar_pdf_por_id(id: str, request: Request):
+    """Endpoint: Baixar PDF de certificado (ETag/304 e Range/206)"""
     result = await _controller.baixar_pdf(id)
     
-    # Se retornou Path, é sucesso - retorna FileResponse
+    # Se retornou Path, é sucesso - retorna o arquivo com validadores
     if isinstance(result, Path):
-        return FileResponse(path=result, filename=result.name, media_type="application/pdf")
+        return await file_download(result, "application/pdf", request.headers, filename=result.name)
     
     # Se retornou Dict, é erro - já formatado pelo handler
     return result
 
 
 @router.get("/{id}/planilha", response_model=None)
-async def baixar_planilha_por_id(id: str):
-    """Endpoint: Baixar planilha consolidada"""
+async def baixar_planilha_por_id(id: str, request: Request):
+    """Endpoint: Baixar planilha consolidada (ETag/304 e Range/206)"""
     result = await _controller.baixar_planilha(id)
     
-    # Se retornou Path, é sucesso - retorna FileResponse
+    # Se retornou Path, é sucesso - retorna o arquivo com validadores
     if isinstance(result, Path):
-        return FileResponse(
-            path=result,
-            filename=result.name,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        return await file_download(result, XLSX_MEDIA_TYPE, request.headers, filename=result.name)
     
     # Se retornou Dict, é erro
     return result
 
 
 @router.get("/planilha", response_model=None)
-async def baixar_planilha_global():
+async def baixar_planilha_global(request: Request):
     """Endpoint: Baixar planilha consolidada global (atualizada)"""
     result = await _controller.baixar_planilha_global()
     if isinstance(result, Path):
-        return FileResponse(
-            path=result,
-            filename=result.name,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        return await file_download(result, XLSX_MEDIA_TYPE, request.headers, filename=result.name)
     return result
@@ -0,0 +1,39 @@
+"""
+Jobs Router - Thin wrapper sobre handlers
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request
+
+from backend.interface.controllers.jobs_controller import JobsController
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Controller será injetado do server.py
+_controller: JobsController | None = None
+
+
+def setup_controller(controller: JobsController) -> None:
+    """Injeta controller (DI manual)"""
+    global _controller
+    _controller = controller
+
+
+@router.get("/{job_id}")
+async def obter_job(job_id: str) -> Dict[str, Any]:
+    """Endpoint: Estado de um job"""
+    return await _controller.obter(job_id)
+
+
+@router.get("/{job_id}/events", response_model=None)
+async def eventos_job(job_id: str):
+    """Endpoint: Progresso do job via Server-Sent Events"""
+    return await _controller.eventos(job_id)
+
+
+@router.get("/{job_id}/download", response_model=None)
+async def baixar_resultado_job(job_id: str, request: Request):
+    """Endpoint: Resultado de uma exportação em lote (ETag/304 e Range/206)"""
+    return await _controller.baixar(job_id, request.headers)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from typing import List
 
@@ -8,13 +9,20 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from backend.domain.exceptions import ValidationError as DomainValidationError
+from backend.domain.exceptions import ValidationError as DomainValidationError, OverloadedError
 from backend.domain.services.system_state import SystemStateService
-from backend.interface.presenters import error
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
+from backend.domain.services.job_store import JobStore
+from backend.domain.services import pdf_service
+from backend.domain.services.file_validators import FileValidators
+from backend.application.usecases.upload_jobs import UploadJobQueue
+from backend.application.usecases.export_jobs import ExportJobQueue
+from backend.interface.presenters import error, overloaded
 
 # Infrastructure
 from backend.infrastructure.adapters.pdf_engine_adapter import EnginePdfAdapter
 from backend.infrastructure.adapters.nominatim_adapter import NominatimAdapter
+from backend.infrastructure.adapters.pdf_render_pool import default_workers
 from backend.infrastructure.repositories import FileCertificadoRepository
 from backend.infrastructure.factories import make_engine_config
 from backend.infrastructure.logging.factory import LoggerFactory
@@ -23,9 +31,10 @@ from backend.infrastructure.logging.factory import LoggerFactory
 from backend.interface.controllers.certificados_controller import CertificadosController
 from backend.interface.controllers.dashboard_controller import DashboardController
 from backend.interface.controllers.admin_controller import AdminController
+from backend.interface.controllers.jobs_controller import JobsController
 
 # Routers
-from backend.infrastructure.http.routers import certificados, dashboard, admin
+from backend.infrastructure.http.routers import certificados, dashboard, admin, jobs
 
 
 def _get_cors_origins() -> List[str]:
@@ -64,6 +73,10 @@ def create_app() -> FastAPI:
     async def _handle_request_validation_error(request, exc: RequestValidationError) -> JSONResponse:
         return error("Entrada inválida na requisição", codigo="REQUEST_VALIDATION_ERROR", detalhes=exc.errors(), status_code=422)
 
+    @app.exception_handler(OverloadedError)
+    async def _handle_overloaded_error(request, exc: OverloadedError) -> JSONResponse:
+        return overloaded(exc)
+
     # Health Check
     @app.get("/health")
     async def health_check() -> dict:
@@ -97,36 +110,99 @@ def create_app() -> FastAPI:
             root_logger.warn("dirs_fail", error=str(e))
 
         # 2. Instancia dependências da infraestrutura
-        pdf_engine = EnginePdfAdapter(config)
+        pdf_engine = EnginePdfAdapter(config, render_workers=default_workers())
+        app.state.pdf_engine = pdf_engine
+        # ETags de PDFs reaproveitam o SHA-256 do armazenamento por conteúdo
+        FileValidators.shared().add_source(pdf_service.get_store(pdf_engine).digest_of)
         repository = FileCertificadoRepository(pdf_engine)
+        aggregates = DashboardAggregateStore(pdf_engine, repository)
         geocoding_service = NominatimAdapter(logger=root_logger.with_component("NominatimAdapter"))
         root_logger = LoggerFactory.from_env(component="backend")
+        job_store = JobStore(config.output_dir)
+        job_queue = UploadJobQueue(
+            pdf_engine,
+            job_store,
+            logger=root_logger.with_component("UploadJobQueue"),
+            repository=repository,
+            aggregates=aggregates,
+            workers=int(os.getenv("UPLOAD_JOB_WORKERS", "2")),
+        )
+        app.state.job_queue = job_queue
+        export_queue = ExportJobQueue(
+            pdf_engine,
+            repository,
+            job_store,
+            logger=root_logger.with_component("ExportJobQueue"),
+            workers=int(os.getenv("EXPORT_JOB_WORKERS", "1")),
+        )
+        app.state.export_queue = export_queue
 
         # 3. Cria controllers com DI via construtor
         certificados_controller = CertificadosController(
             pdf_engine=pdf_engine,
             repository=repository,
-            logger=root_logger.with_component("CertificadosController")
+            logger=root_logger.with_component("CertificadosController"),
+            aggregates=aggregates,
+            batch_workers=int(os.getenv("UPLOAD_BATCH_WORKERS", "4")),
+            job_queue=job_queue,
+            export_queue=export_queue,
         )
         dashboard_controller = DashboardController(
             pdf_engine=pdf_engine,
+            repository=repository,
+            aggregates=aggregates,
             geocoding_service=geocoding_service
         )
         admin_controller = AdminController(
             pdf_engine=pdf_engine,
             system_state=system_state,
-            logger=root_logger.with_component("AdminController")
+            logger=root_logger.with_component("AdminController"),
+            aggregates=aggregates,
         )
 
         # 4. Injeta controllers nos routers
         certificados.setup_controller(certificados_controller)
         dashboard.setup_controller(dashboard_controller)
         admin.setup_controller(admin_controller)
+        jobs.setup_controller(JobsController(job_queue, logger=root_logger.with_component("JobsController"), export_queue=export_queue))
         root_logger.info("startup", output_dir=str(config.output_dir))
 
+    @app.on_event("startup")
+    async def start_job_queue():
+        # Retoma jobs pendentes de execuções anteriores
+        await app.state.job_queue.start()
+        await app.state.export_queue.start()
+
+    @app.on_event("startup")
+    async def start_render_pool():
+        # Workers de renderização sobem aquecidos (motor, fontes e templates carregados)
+        await asyncio.to_thread(app.state.pdf_engine.start_render_pool)
+
+    @app.on_event("startup")
+    async def compact_pdf_store():
+        # PDFs copiados antes do armazenamento por conteúdo viram aliases e o
+        # catálogo persistente do admin é reconciliado (em segundo plano)
+        engine = app.state.pdf_engine
+
+        def _compact_and_sync() -> None:
+            pdf_service.get_store(engine).compact()
+            pdf_service.get_metadata(engine).sync()
+
+        app.state.pdf_compaction = asyncio.create_task(asyncio.to_thread(_compact_and_sync))
+
+    @app.on_event("shutdown")
+    async def stop_job_queue():
+        await app.state.job_queue.stop()
+        await app.state.export_queue.stop()
+
+    @app.on_event("shutdown")
+    async def stop_render_pool():
+        await asyncio.to_thread(app.state.pdf_engine.shutdown_render_pool)
+
     # Registra routers
     app.include_router(certificados.router)
     app.include_router(dashboard.router)
     app.include_router(admin.router)
+    app.include_router(jobs.router)
 
     return app
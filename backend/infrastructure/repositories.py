@@ -1,49 +1,157 @@
 from __future__ import annotations
 
-from typing import List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+import threading
 from pathlib import Path
 from urllib.parse import unquote
 
 from backend.domain.services.pdf_engine import PdfEngine
 from backend.domain.repositories import CertificadoRepository
-from backend.domain.entities import CertificadoEntity
+from backend.domain.entities import CertificadoEntity, CertificadoPage, CertificadoSearchPage
 from backend.domain.services import pdf_service
+from backend.domain.services.certificado_index import CertificadoIndex, Signature, engine_data_signature
+from backend.domain.services.certificado_snapshot import CertificadoSnapshot
+from backend.domain.services.certificado_search import CertificadoSearchIndex, SearchFields, search_fields
+from backend.domain.services.csv_reader import CsvReader
+from backend.domain.services.dashboard_aggregates import produto_nome
+
 
 class FileCertificadoRepository(CertificadoRepository):
     def __init__(self, pdf_engine: PdfEngine):
         self.pdf_engine = pdf_engine
+        self._index = CertificadoIndex()
+        self._search = CertificadoSearchIndex()
+        self._snapshot: Optional[CertificadoSnapshot] = None
+        self._snapshot_lock = threading.Lock()
 
     def list(self) -> List[CertificadoEntity]:
-        certificados = self.pdf_engine.listar_certificados()
-        return [self._to_entity(c) for c in certificados]
+        return self._ensure_index().all()
+
+    def find(
+        self,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> List[CertificadoEntity]:
+        return self._ensure_index().find(id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor)
+
+    def find_page(
+        self,
+        after: Optional[Tuple[str, str]],
+        limit: int,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> CertificadoPage:
+        return self._ensure_index().page(
+            after, limit, id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor
+        )
+
+    def scan(
+        self,
+        after: Optional[Tuple[str, str]],
+        limit: int,
+        id: Optional[str] = None,
+        bairro: Optional[str] = None,
+        cidade: Optional[str] = None,
+        min_valor: Optional[float] = None,
+        max_valor: Optional[float] = None,
+    ) -> Tuple[List[CertificadoEntity], Optional[Tuple[str, str]]]:
+        return self._ensure_index().scan(
+            after, limit, id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor
+        )
+
+    def search(self, q: str, limit: int = 20, offset: int = 0) -> CertificadoSearchPage:
+        index = self._ensure_index()
+        self._search.refresh(self._data_signature(), lambda: self._search_documents(index.all()))
+        result = self._search.search(q, limit=limit, offset=offset)
+        items: List[CertificadoEntity] = []
+        scores: List[float] = []
+        for hit in result.hits:
+            entity = index.get_by_numero(hit.numero_certificado)
+            if entity is not None:
+                items.append(entity)
+                scores.append(hit.score)
+        return CertificadoSearchPage(items=items, scores=scores, total=result.total)
 
     def get_by_id(self, id: str) -> Optional[CertificadoEntity]:
-        try:
-            cert_obj = pdf_service.load_cert_by_id(unquote(id), self.pdf_engine)
-            return self._to_entity(cert_obj)
-        except Exception:
-            return None
+        return self._ensure_index().get_by_id(unquote(id))
 
     def get_by_numero(self, numero: str) -> Optional[CertificadoEntity]:
-        bundle = self.pdf_engine.get_bundle_by_numero(numero)
-        if bundle:
-            return self._to_entity(bundle.certificado)
-        return None
+        return self._ensure_index().get_by_numero(numero)
+
+    def get_by_cnpj(self, cnpj: str) -> List[CertificadoEntity]:
+        return self._ensure_index().get_by_cnpj(cnpj)
+
+    def snapshot(self) -> CertificadoSnapshot:
+        index = self._ensure_index()
+        with self._snapshot_lock:
+            if self._snapshot is None or self._snapshot.version != index.version:
+                version, entities = index.versioned()
+                self._snapshot = CertificadoSnapshot.from_certificados(entities, version=version)
+            return self._snapshot
+
+    def register(self, bundle: Any, before: Signature) -> None:
+        certificado = getattr(bundle, "certificado", bundle)
+        entity = self._to_entity(certificado)
+        signature = self._data_signature()
+        self._index.upsert(entity, before, signature)
+        if hasattr(bundle, "produtos"):
+            produtos = [produto_nome(p) for p in bundle.produtos or []]
+            metodos = [str(getattr(m, "metodo", "") or "") for m in getattr(bundle, "metodos", None) or []]
+            self._search.upsert(entity.numero_certificado, search_fields(entity, produtos, metodos), before, signature)
+        else:
+            # Sem o bundle não há produtos/métodos: a busca recarrega dos CSVs
+            self._search.invalidate()
+
+    def invalidate(self) -> None:
+        self._index.invalidate()
+        self._search.invalidate()
 
     def get_pdf_path(self, numero: str) -> Optional[Path]:
-        bundle = self.pdf_engine.get_bundle_by_numero(numero)
-        if not bundle:
-            return None
-        # Tenta localizar especificamente pelo certificado do bundle
-        path = pdf_service.find_existing_pdf_for_cert(bundle.certificado, self.pdf_engine)
-        if path:
-            return path
-        # Fallback para busca com bundle
-        return pdf_service.find_existing_pdf(bundle, self.pdf_engine)
+        return self.get_pdf_paths([numero]).get(numero)
+
+    def get_pdf_paths(self, numeros: Iterable[str]) -> Dict[str, Optional[Path]]:
+        index = self._ensure_index()
+        # Uma única reconciliação do catálogo para o lote inteiro
+        catalog = pdf_service.get_catalog(self.pdf_engine)
+        catalog.refresh()
+        paths: Dict[str, Optional[Path]] = {}
+        for numero in numeros:
+            cert = index.get_by_numero(numero)
+            paths[numero] = pdf_service.find_pdf_for_certificado(cert, self.pdf_engine, catalog) if cert else None
+        return paths
 
     def get_consolidated_spreadsheet_path(self) -> Path:
         return self.pdf_engine.get_spreadsheet_generator().consolidated_path
 
+    def _ensure_index(self) -> CertificadoIndex:
+        self._index.refresh(self._data_signature(), self._load_entities)
+        return self._index
+
+    def _load_entities(self) -> List[CertificadoEntity]:
+        return [self._to_entity(c) for c in self.pdf_engine.listar_certificados()]
+
+    def _search_documents(self, entities: List[CertificadoEntity]) -> Iterable[Tuple[str, SearchFields]]:
+        csv_manager = self.pdf_engine.get_csv_manager()
+        reader = CsvReader.shared()
+        produtos: Dict[str, List[str]] = {}
+        for row in reader.rows(getattr(csv_manager, "produtos_path", None)):
+            produtos.setdefault(row.get("numero_certificado", ""), []).append(produto_nome(row))
+        metodos: Dict[str, List[str]] = {}
+        for row in reader.rows(getattr(csv_manager, "metodos_path", None)):
+            metodos.setdefault(row.get("numero_certificado", ""), []).append((row.get("metodo") or "").strip())
+        for entity in entities:
+            numero = entity.numero_certificado
+            yield numero, search_fields(entity, produtos.get(numero, ()), metodos.get(numero, ()))
+
+    def _data_signature(self) -> Signature:
+        return engine_data_signature(self.pdf_engine)
+
     def _to_entity(self, engine_cert: Any) -> CertificadoEntity:
         d = engine_cert.to_dict()
         return CertificadoEntity(
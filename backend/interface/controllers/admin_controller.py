@@ -3,15 +3,19 @@ Admin Handlers - Framework-agnostic business logic
 """
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 
+from backend.domain.exceptions import PdfDeletionError
 from backend.domain.services.pdf_engine import PdfEngine
 from backend.domain.services.system_state import SystemStateService
-from backend.interface.presenters import success, error
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
+from backend.interface.presenters import success, error, stream
 from backend.application.usecases.admin import (
     ClearCacheUseCase,
     GetCacheStatusUseCase,
+    GetMetricsUseCase,
     ListPdfsUseCase,
     DownloadPdfByNameUseCase,
     DownloadZipUseCase,
@@ -22,21 +26,29 @@ from backend.application.usecases.admin import (
 class AdminController:
     """Controllers para endpoints administrativos"""
     
-    def __init__(self, pdf_engine: PdfEngine, system_state: SystemStateService, logger=None):
+    def __init__(
+        self,
+        pdf_engine: PdfEngine,
+        system_state: SystemStateService,
+        logger=None,
+        aggregates: DashboardAggregateStore | None = None,
+    ):
         """
         Injeta dependências via construtor.
         
         Args:
             pdf_engine: Interface do motor de PDF
             system_state: Serviço de estado do sistema
+            aggregates: Agregados do dashboard (invalidados ao limpar o cache)
         """
         self.pdf_engine = pdf_engine
         self.system_state = system_state
         self.logger = logger
+        self.aggregates = aggregates
     
     async def clear_cache(self, client_host: str) -> Dict[str, Any]:
         """Handler para limpar cache"""
-        usecase = ClearCacheUseCase(self.pdf_engine, self.system_state)
+        usecase = ClearCacheUseCase(self.pdf_engine, self.system_state, aggregates=self.aggregates)
         result = usecase.execute(client_host)
         return success(result, message="Cache limpo com sucesso")
     
@@ -45,6 +57,10 @@ class AdminController:
         usecase = GetCacheStatusUseCase(self.pdf_engine, self.system_state)
         return success(usecase.execute(), message="Status do cache")
     
+    async def metrics(self) -> Dict[str, Any]:
+        """Handler para métricas internas"""
+        return success(GetMetricsUseCase().execute(), message="Métricas")
+    
     async def listar_pdfs(
         self,
         q: Optional[str] = None,
@@ -57,9 +73,9 @@ class AdminController:
         """Handler para listar PDFs"""
         if self.logger: self.logger.info("admin_list_pdfs_start", q=q, doc_type=doc_type, data_de=data_de, data_ate=data_ate, limit=limit, offset=offset)
         usecase = ListPdfsUseCase(self.pdf_engine)
-        data = usecase.execute(q, doc_type, data_de, data_ate, limit, offset)
-        if self.logger: self.logger.info("admin_list_pdfs_done", count=len(data or []))
-        return success(data, message="Lista de PDFs")
+        data, meta = await asyncio.to_thread(usecase.execute, q, doc_type, data_de, data_ate, limit, offset)
+        if self.logger: self.logger.info("admin_list_pdfs_done", count=len(data), total=meta["total"])
+        return success(data, message="Lista de PDFs", meta=meta)
     
     async def preview_pdf(self, name: str) -> Path | Dict[str, Any]:
         """Handler para preview de PDF"""
@@ -91,16 +107,15 @@ class AdminController:
             if self.logger: self.logger.error("admin_download_pdf_not_found", name=name)
             return error("PDF não encontrado.", codigo="PDF_NOT_FOUND", status_code=404)
     
-    async def download_zip(self, names: List[str]) -> Path | Dict[str, Any]:
-        """Handler para download de ZIP"""
+    async def download_zip(self, names: List[str], compress: bool = False):
+        """Handler para download de ZIP (streaming, sem arquivo temporário)"""
         if not isinstance(names, list) or not names:
             return error("Lista de arquivos vazia.", codigo="EMPTY_LIST", status_code=400)
         
-        if self.logger: self.logger.info("admin_download_zip_start", names_count=len(names or []))
+        if self.logger: self.logger.info("admin_download_zip_start", names_count=len(names or []), compress=compress)
         usecase = DownloadZipUseCase(self.pdf_engine)
-        zip_path = usecase.execute(names)
-        if self.logger: self.logger.info("admin_download_zip_done", path=str(zip_path))
-        return zip_path  # Path será tratado no router
+        chunks = usecase.execute(names, compress=compress)
+        return stream(chunks, media_type="application/zip", filename="documentos.zip")
     
     async def delete_pdfs(self, names: List[str]) -> Dict[str, Any]:
         """Handler para deletar PDFs"""
@@ -108,5 +123,10 @@ class AdminController:
             return error("Lista de arquivos vazia.", codigo="EMPTY_LIST", status_code=400)
         
         usecase = DeletePdfsUseCase(self.pdf_engine)
-        deleted = usecase.execute(names)
+        try:
+            # Varre o diretório de saída e .objects e grava nos catálogos SQLite: fora do event loop
+            deleted = await asyncio.to_thread(usecase.execute, names)
+        except PdfDeletionError as e:
+            if self.logger: self.logger.error("admin_delete_pdfs_partial", removed=len(e.removed), failed=e.failed)
+            return error(e.message, codigo="PARTIAL_DELETE", detalhes=e.details, status_code=500)
         return success({"deleted": deleted}, message="Arquivos removidos")
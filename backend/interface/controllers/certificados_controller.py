@@ -11,17 +11,27 @@ from pathlib import Path
 
 from backend.domain.services.pdf_engine import PdfEngine
 from backend.domain.repositories import CertificadoRepository
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
 from backend.domain.exceptions import (
     CertificadoNotFoundError,
     ValidationError,
     FileProcessingError,
-    DataInconsistencyError
+    DataInconsistencyError,
+    OverloadedError,
 )
-from backend.interface.presenters import success, error, build_response, build_resource_urls_id
+from backend.domain.services.admission import OP_MANUAL, OP_PDF, OP_UPLOAD, AdmissionControl
+from backend.interface.presenters import success, error, overloaded, stream, build_response, build_resource_urls_id
 from backend.domain.services import pdf_service
-from backend.application.usecases.upload_excel import UploadExcelUseCase, UploadExcelInput
+from backend.application.usecases.upload_excel import UploadExcelUseCase, UploadExcelInput, validate_filename
+from backend.application.usecases.upload_batch import UploadBatchUseCase, MAX_ZIP_UPLOAD_BYTES
+from backend.domain.services.upload_spool import MAX_UPLOAD_BYTES, spool_upload
+from backend.application.usecases.upload_jobs import UploadJobQueue
+from backend.application.usecases.export_jobs import ExportJobQueue
+from backend.interface.controllers.jobs_controller import present_job
 from backend.application.usecases.create_manual import CreateManualCertificateUseCase
 from backend.application.usecases.list_certificates import ListCertificatesUseCase
+from backend.application.usecases.search_certificates import SearchCertificatesUseCase
+from backend.application.usecases.export_certificates import ExportCertificatesUseCase, EXPORT_FORMATS
 from backend.application.usecases.get_certificate import (
     GetCertificateUseCase,
     DownloadPdfUseCase,
@@ -35,24 +45,50 @@ class CertificadosController:
     Desacoplado do FastAPI - recebe dependências no construtor.
     """
     
-    def __init__(self, pdf_engine: PdfEngine, repository: CertificadoRepository, logger=None):
+    def __init__(
+        self,
+        pdf_engine: PdfEngine,
+        repository: CertificadoRepository,
+        logger=None,
+        aggregates: DashboardAggregateStore | None = None,
+        batch_workers: int = 4,
+        job_queue: UploadJobQueue | None = None,
+        admission: AdmissionControl | None = None,
+        export_queue: ExportJobQueue | None = None,
+    ):
         """
         Injeta dependências via construtor (DI manual).
         
         Args:
             pdf_engine: Interface do motor de PDF
             repository: Interface do repositório
+            aggregates: Agregados do dashboard atualizados a cada gravação (opcional)
+            batch_workers: Arquivos processados em paralelo no upload em lote
+            job_queue: Fila de uploads assíncronos (opcional)
+            admission: Limites de concorrência das operações pesadas (padrão: compartilhado)
+            export_queue: Fila de exportações em lote de PDFs (opcional)
         """
         self.pdf_engine = pdf_engine
         self.repository = repository
         self.logger = logger
+        self.aggregates = aggregates
+        self.batch_workers = batch_workers
+        self.job_queue = job_queue
+        self.admission = admission or AdmissionControl.shared()
+        self.export_queue = export_queue
     
     async def criar_manual(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Controller para criação manual de certificado"""
         try:
             if self.logger: self.logger.info("criar_manual_start")
-            use_case = CreateManualCertificateUseCase(self.pdf_engine, logger=self.logger.with_component("CreateManualCertificateUseCase") if self.logger else None)
-            dto = await use_case.execute(payload)
+            use_case = CreateManualCertificateUseCase(
+                self.pdf_engine,
+                logger=self.logger.with_component("CreateManualCertificateUseCase") if self.logger else None,
+                repository=self.repository,
+                aggregates=self.aggregates,
+            )
+            async with self.admission.slot(OP_MANUAL):
+                dto = await use_case.execute(payload)
             # Adapta DTO para resposta HTTP
             response_payload = build_response(dto.bundle, dto.planilha_path, dto.pdf_path)
             if dto.id:
@@ -63,6 +99,9 @@ class CertificadosController:
         except ValidationError as e:
             if self.logger: self.logger.warn("criar_manual_validation_error", errors=e.errors)
             return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=400)
+        except OverloadedError as e:
+            if self.logger: self.logger.warn("criar_manual_overloaded", retry_after=e.retry_after)
+            return overloaded(e)
         except Exception as e:
             if self.logger: self.logger.error("criar_manual_error", error=str(e))
             return error(str(e), codigo="MANUAL_CREATION_ERROR", status_code=500)
@@ -76,66 +115,159 @@ class CertificadosController:
         max_valor: float | None = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
+        with_total: bool = False,
     ) -> Dict[str, Any]:
         """Controller para listagem de certificados"""
         try:
-            if self.logger: self.logger.info("listar_start", id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor, limit=limit, offset=offset)
+            if self.logger: self.logger.info("listar_start", id=id, bairro=bairro, cidade=cidade, min_valor=min_valor, max_valor=max_valor, limit=limit, offset=offset, cursor=cursor)
             use_case = ListCertificatesUseCase(self.repository, logger=self.logger.with_component("ListCertificatesUseCase") if self.logger else None)
-            result = await use_case.execute(
+            page = await use_case.execute(
                 id=id,
                 bairro=bairro,
                 cidade=cidade,
                 min_valor=min_valor,
                 max_valor=max_valor,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                cursor=cursor,
+                with_total=with_total,
             )
-            # Monta URLs e arquivos na camada de interface
-            resposta = []
-            planilha = str(self.repository.get_consolidated_spreadsheet_path().resolve())
-            for item in result:
-                data = item.model_dump()
-                # Serializa datetime para string ISO
-                if data.get("data_execucao"):
-                    data["data_execucao"] = data["data_execucao"].isoformat()
-                    
-                data["urls"] = build_resource_urls_id(str(data.get("id", "")))
-                numero = data.get("numero_certificado", "")
-                pdf_path = await asyncio.to_thread(self.repository.get_pdf_path, numero)
-                    
-                # Reshape para compatibilidade com frontend (Dashboard.tsx espera row.certificado.campo)
-                reshaped_data = {
-                    "certificado": {
-                        "id": data["id"],
-                        "numero_certificado": data["numero_certificado"],
-                        "razao_social": data["razao_social"],
-                        "bairro": data["bairro"],
-                        "cidade": data["cidade"],
-                        "valor": data["valor"],
-                        "data_execucao": data["data_execucao"],
-                    },
-                    "urls": build_resource_urls_id(str(data.get("id", ""))),
-                    "arquivos": {
-                        "pdf": str(pdf_path.resolve()) if pdf_path else None,
-                        "planilha": planilha,
-                    }
-                }
-                resposta.append(reshaped_data)
+            resposta = await self._reshape_items(page.items)
+            meta = None
+            if cursor is not None or with_total:
+                meta = {"next_cursor": page.next_cursor, "total": page.total}
             if self.logger: self.logger.info("listar_done", count=len(resposta))
-            return success(resposta, message="Lista de certificados")
+            return success(resposta, message="Lista de certificados", meta=meta)
+        except ValidationError as e:
+            if self.logger: self.logger.warn("listar_validation_error", errors=e.errors)
+            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=400)
         except Exception as e:
             import traceback
             traceback.print_exc()
             if self.logger: self.logger.error("listar_error", error=str(e))
             return error(str(e), codigo="LIST_ERROR", status_code=500)
     
-    async def upload_excel(self, arquivo) -> Dict[str, Any]:
-        """Controller para upload de Excel"""
+    async def buscar(self, q: str | None = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """Controller para a busca textual de certificados"""
+        try:
+            use_case = SearchCertificatesUseCase(self.repository, logger=self.logger.with_component("SearchCertificatesUseCase") if self.logger else None)
+            page = await use_case.execute(q or "", limit=limit, offset=offset)
+            resposta = await self._reshape_items(page.items)
+            for item, hit in zip(resposta, page.items):
+                item["score"] = hit.score
+            if self.logger: self.logger.info("buscar_done", total=page.total, count=len(resposta))
+            return success(resposta, message="Resultado da busca", meta={"total": page.total})
+        except ValidationError as e:
+            if self.logger: self.logger.warn("buscar_validation_error", errors=e.errors)
+            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=400)
+        except Exception as e:
+            if self.logger: self.logger.error("buscar_error", error=str(e))
+            return error(str(e), codigo="SEARCH_ERROR", status_code=500)
+
+    async def _reshape_items(self, result: List[Any]) -> List[Dict[str, Any]]:
+        """Itens de listagem no formato do frontend (``row.certificado.campo``), com URLs e arquivos."""
+        # Monta URLs e arquivos na camada de interface
+        resposta = []
+        planilha = str(self.repository.get_consolidated_spreadsheet_path().resolve())
+        # Resolve os PDFs da página inteira em um único salto de thread
+        numeros = [item.numero_certificado for item in result]
+        pdf_paths = await asyncio.to_thread(self.repository.get_pdf_paths, numeros)
+        for item in result:
+            data = item.model_dump()
+            # Serializa datetime para string ISO
+            if data.get("data_execucao"):
+                data["data_execucao"] = data["data_execucao"].isoformat()
+                
+            data["urls"] = build_resource_urls_id(str(data.get("id", "")))
+            numero = data.get("numero_certificado", "")
+            pdf_path = pdf_paths.get(numero)
+                
+            # Reshape para compatibilidade com frontend (Dashboard.tsx espera row.certificado.campo)
+            reshaped_data = {
+                "certificado": {
+                    "id": data["id"],
+                    "numero_certificado": data["numero_certificado"],
+                    "razao_social": data["razao_social"],
+                    "bairro": data["bairro"],
+                    "cidade": data["cidade"],
+                    "valor": data["valor"],
+                    "data_execucao": data["data_execucao"],
+                },
+                "urls": build_resource_urls_id(str(data.get("id", ""))),
+                "arquivos": {
+                    "pdf": str(pdf_path.resolve()) if pdf_path else None,
+                    "planilha": planilha,
+                }
+            }
+            resposta.append(reshaped_data)
+        return resposta
+
+    async def exportar(
+        self,
+        format: str = "ndjson",
+        id: str | None = None,
+        bairro: str | None = None,
+        cidade: str | None = None,
+        min_valor: float | None = None,
+        max_valor: float | None = None,
+    ):
+        """Controller para exportação em streaming (NDJSON/CSV)"""
+        try:
+            use_case = ExportCertificatesUseCase(self.repository, logger=self.logger.with_component("ExportCertificatesUseCase") if self.logger else None)
+            chunks = use_case.execute(
+                format=format,
+                id=id,
+                bairro=bairro,
+                cidade=cidade,
+                min_valor=min_valor,
+                max_valor=max_valor,
+            )
+            fmt = format.strip().lower()
+            return stream(chunks, media_type=EXPORT_FORMATS[fmt], filename=f"certificados.{fmt}")
+        except ValidationError as e:
+            if self.logger: self.logger.warn("exportar_validation_error", errors=e.errors)
+            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=400)
+        except Exception as e:
+            if self.logger: self.logger.error("exportar_error", error=str(e))
+            return error(str(e), codigo="EXPORT_ERROR", status_code=500)
+
+    async def criar_exportacao(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Controller para exportação em lote de PDFs por filtros (job assíncrono)"""
+        if not self.export_queue:
+            return error("Fila de exportações não configurada", codigo="CONFIG_ERROR", status_code=500)
+        payload = payload or {}
+        try:
+            filtros = {k: payload.get(k) for k in ("cidade", "bairro", "min_valor", "max_valor", "data_de", "data_ate")}
+            job = await self.export_queue.submit(filtros, format=str(payload.get("format") or "zip"))
+            if self.logger: self.logger.info("criar_exportacao_queued", job_id=job["id"])
+            return success(present_job(job), message="Exportação enfileirada", status_code=202)
+        except ValidationError as e:
+            if self.logger: self.logger.warn("criar_exportacao_validation_error", errors=e.errors)
+            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=400)
+        except Exception as e:
+            if self.logger: self.logger.error("criar_exportacao_error", error=str(e))
+            return error(str(e), codigo="EXPORT_ERROR", status_code=500)
+
+    async def upload_excel(self, arquivo, async_mode: bool = False) -> Dict[str, Any]:
+        """Controller para upload de Excel (``async_mode`` devolve um job imediatamente)"""
+        if async_mode:
+            return await self._upload_excel_async(arquivo)
+        spooled = None
         try:
             if self.logger: self.logger.info("upload_excel_start")
-            use_case = UploadExcelUseCase(self.pdf_engine, logger=self.logger.with_component("UploadExcelUseCase") if self.logger else None)
-            bytes_data = await arquivo.read()
-            dto = await use_case.execute(UploadExcelInput(filename=arquivo.filename or "", file_bytes=bytes_data))
+            use_case = UploadExcelUseCase(
+                self.pdf_engine,
+                logger=self.logger.with_component("UploadExcelUseCase") if self.logger else None,
+                repository=self.repository,
+                aggregates=self.aggregates,
+            )
+            # Extensão validada antes de ler o corpo; o arquivo vai para disco em blocos
+            validate_filename(arquivo.filename or "")
+            # Admissão antes do spool: com a fila cheia o corpo nem é lido
+            async with self.admission.slot(OP_UPLOAD):
+                spooled = await spool_upload(arquivo, arquivo.filename or "")
+                dto = await use_case.execute(UploadExcelInput.from_spool(spooled))
             
             # Adapta DTO para resposta HTTP (mantendo compatibilidade com frontend)
             result = {
@@ -149,9 +281,10 @@ class CertificadosController:
             return success(result, message="Upload processado com sucesso")
         except ValidationError as e:
             if self.logger: self.logger.warn("upload_excel_validation_error", errors=e.errors)
-            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=400)
-        except ValidationError as e:
-            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=400)
+            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=_validation_status(e))
+        except OverloadedError as e:
+            if self.logger: self.logger.warn("upload_excel_overloaded", retry_after=e.retry_after)
+            return overloaded(e)
         except FileProcessingError as e:
             if self.logger: self.logger.error("upload_excel_file_error", details=e.details)
             return error(e.message, codigo="FILE_PROCESSING_ERROR", detalhes=e.details, status_code=500)
@@ -160,12 +293,67 @@ class CertificadosController:
             traceback.print_exc()
             if self.logger: self.logger.error("upload_excel_error", error=str(e))
             return error(str(e), codigo="UPLOAD_ERROR", status_code=500)
+        finally:
+            if spooled:
+                spooled.discard()
     
+    async def _upload_excel_async(self, arquivo) -> Dict[str, Any]:
+        if not self.job_queue:
+            return error("Fila de jobs não configurada", codigo="CONFIG_ERROR", status_code=500)
+        spooled = None
+        try:
+            validate_filename(arquivo.filename or "")
+            spooled = await spool_upload(arquivo, arquivo.filename or "")
+            # O spool é movido para o diretório do job; o discard abaixo vira no-op
+            job = await self.job_queue.submit(UploadExcelInput.from_spool(spooled))
+            return success(present_job(job), message="Upload enfileirado", status_code=202)
+        except ValidationError as e:
+            if self.logger: self.logger.warn("upload_excel_async_validation_error", errors=e.errors)
+            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=_validation_status(e))
+        except Exception as e:
+            if self.logger: self.logger.error("upload_excel_async_error", error=str(e))
+            return error(str(e), codigo="UPLOAD_ERROR", status_code=500)
+        finally:
+            if spooled:
+                spooled.discard()
+
+    async def upload_batch(self, arquivos: List[Any]) -> Dict[str, Any]:
+        """Controller para upload em lote (vários arquivos ou um ZIP de .xlsx)"""
+        spooled = []
+        try:
+            if self.logger: self.logger.info("upload_batch_request", arquivos=len(arquivos))
+            use_case = UploadBatchUseCase(
+                self.pdf_engine,
+                logger=self.logger.with_component("UploadBatchUseCase") if self.logger else None,
+                repository=self.repository,
+                aggregates=self.aggregates,
+                max_workers=self.batch_workers,
+                admission=self.admission,
+            )
+            # Cada arquivo do lote ocupa sua própria vaga de upload dentro do use case
+            for arquivo in arquivos:
+                filename = arquivo.filename or ""
+                limit = MAX_ZIP_UPLOAD_BYTES if filename.lower().endswith(".zip") else MAX_UPLOAD_BYTES
+                spooled.append(await spool_upload(arquivo, filename, max_bytes=limit))
+            dto = await use_case.execute([UploadExcelInput.from_spool(s) for s in spooled])
+            for item in dto.items:
+                if item.cert_id:
+                    item.urls = build_resource_urls_id(item.cert_id)
+            return success(dto.model_dump(), message="Lote processado")
+        except ValidationError as e:
+            return error(e.message, codigo="VALIDATION_ERROR", detalhes=e.errors, status_code=_validation_status(e))
+        except Exception as e:
+            if self.logger: self.logger.error("upload_batch_error", error=str(e))
+            return error(str(e), codigo="UPLOAD_ERROR", status_code=500)
+        finally:
+            for s in spooled:
+                s.discard()
+
     async def obter_por_id(self, id: str) -> Dict[str, Any]:
         """Handler para obter certificado por ID"""
         try:
             if self.logger: self.logger.info("obter_por_id_start", id=id)
-            use_case = GetCertificateUseCase(self.repository, self.pdf_engine)
+            use_case = GetCertificateUseCase(self.repository, self.pdf_engine, admission=self.admission)
             result = await use_case.execute(id)
             numero = result["numero_certificado"]
             bundle = self.pdf_engine.get_bundle_entity_by_numero(numero)
@@ -189,6 +377,8 @@ class CertificadosController:
         except DataInconsistencyError as e:
             if self.logger: self.logger.error("obter_por_id_inconsistency", error=e.message)
             return error(e.message, codigo="DATA_INCONSISTENCY", status_code=500)
+        except OverloadedError as e:
+            return overloaded(e)
         except Exception as e:
             if self.logger: self.logger.error("obter_por_id_error", error=str(e))
             return error(str(e), codigo="GET_ERROR", status_code=500)
@@ -200,7 +390,7 @@ class CertificadosController:
         """
         try:
             if self.logger: self.logger.info("baixar_pdf_start", id=id)
-            use_case = DownloadPdfUseCase(self.repository, self.pdf_engine)
+            use_case = DownloadPdfUseCase(self.repository, self.pdf_engine, admission=self.admission)
             pdf_path = await use_case.execute(id)
             if self.logger: self.logger.info("baixar_pdf_done", id=id, path=str(pdf_path))
             return pdf_path  # Path será tratado no router
@@ -210,6 +400,8 @@ class CertificadosController:
         except FileNotFoundError as e:
             if self.logger: self.logger.warn("baixar_pdf_file_missing", id=id)
             return error(str(e), codigo="PDF_NOT_FOUND", status_code=404)
+        except OverloadedError as e:
+            return overloaded(e)
         except Exception as e:
             if self.logger: self.logger.error("baixar_pdf_error", id=id, error=str(e))
             return error(str(e), codigo="DOWNLOAD_ERROR", status_code=500)
@@ -223,12 +415,15 @@ class CertificadosController:
                 return error(f"Certificado não encontrado: {numero}", codigo="NOT_FOUND", status_code=404)
             pdf_path = await asyncio.to_thread(self.repository.get_pdf_path, numero)
             if not pdf_path:
-                pdf_path = await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
+                async with self.admission.slot(OP_PDF):
+                    pdf_path = await asyncio.to_thread(pdf_service.ensure_pdf, bundle, self.pdf_engine)
             if not pdf_path or not pdf_path.exists():
                 if self.logger: self.logger.warn("baixar_pdf_numero_file_missing", numero=numero)
                 return error("PDF não encontrado.", codigo="PDF_NOT_FOUND", status_code=404)
             if self.logger: self.logger.info("baixar_pdf_numero_done", numero=numero, path=str(pdf_path))
             return pdf_path
+        except OverloadedError as e:
+            return overloaded(e)
         except Exception as e:
             if self.logger: self.logger.error("baixar_pdf_numero_error", numero=numero, error=str(e))
             return error(str(e), codigo="DOWNLOAD_ERROR", status_code=500)
@@ -256,3 +451,9 @@ class CertificadosController:
             return error(str(e), codigo="SPREADSHEET_NOT_READY", status_code=404)
         except Exception as e:
             return error(str(e), codigo="DOWNLOAD_ERROR", status_code=500)
+
+
+def _validation_status(e: ValidationError) -> int:
+    """413 para arquivo acima do limite; 400 para os demais erros de validação."""
+    too_large = any(isinstance(err, dict) and err.get("message") == "FILE_TOO_LARGE" for err in e.errors)
+    return 413 if too_large else 400
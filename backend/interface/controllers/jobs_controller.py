@@ -0,0 +1,115 @@
+"""
+Jobs Handlers - Consulta e acompanhamento de jobs assíncronos
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
+
+from backend.application.usecases.export_jobs import EXPORT_JOB_FORMATS, ExportJobQueue
+from backend.application.usecases.upload_jobs import JobQueue, UploadJobQueue
+from backend.domain.services.job_store import FINISHED_STATES
+from backend.interface.presenters import success, error, event_stream, file_download, build_resource_urls_id
+
+# Intervalo máximo sem eventos antes de um comentário de keep-alive
+_KEEPALIVE_SECONDS = 15.0
+
+
+def present_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Visão pública do job (sem detalhes internos da entrada)."""
+    payload = job.get("payload") or {}
+    result = job.get("result")
+    if result and result.get("cert_id"):
+        result = {**result, "urls": build_resource_urls_id(result["cert_id"])}
+    urls = {"job": f"/jobs/{job['id']}", "events": f"/jobs/{job['id']}/events"}
+    if job.get("kind") == ExportJobQueue.kind:
+        urls["download"] = f"/jobs/{job['id']}/download"
+    return {
+        "id": job["id"],
+        "kind": job.get("kind"),
+        "status": job.get("status"),
+        "filename": payload.get("filename"),
+        "created_at": job.get("created_at"),
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at"),
+        "stages": job.get("stages", []),
+        "progress": job.get("progress"),
+        "result": result,
+        "error": job.get("error"),
+        "urls": urls,
+    }
+
+
+class JobsController:
+    """Controllers para endpoints de jobs"""
+
+    def __init__(self, job_queue: UploadJobQueue, logger=None, export_queue: ExportJobQueue | None = None):
+        """
+        Injeta dependências via construtor.
+
+        Args:
+            job_queue: Fila de jobs de upload
+            export_queue: Fila de exportações em lote (opcional)
+        """
+        self.job_queue = job_queue
+        self.export_queue = export_queue
+        self.logger = logger
+
+    async def obter(self, job_id: str) -> Dict[str, Any]:
+        """Handler para estado de um job"""
+        _, job = await self._find(job_id)
+        if not job:
+            return error(f"Job não encontrado: {job_id}", codigo="JOB_NOT_FOUND", status_code=404)
+        return success(present_job(job), message="Estado do job")
+
+    async def eventos(self, job_id: str):
+        """Handler SSE: um evento ``stage`` por etapa e ``done`` ao finalizar"""
+        _, job = await self._find(job_id)
+        if not job:
+            return error(f"Job não encontrado: {job_id}", codigo="JOB_NOT_FOUND", status_code=404)
+        return event_stream(self._events(job_id))
+
+    async def baixar(self, job_id: str, request_headers: Mapping[str, str]):
+        """Handler para o resultado de uma exportação em lote"""
+        _, job = await self._find(job_id)
+        if not job or not self.export_queue or job.get("kind") != self.export_queue.kind:
+            return error(f"Exportação não encontrada: {job_id}", codigo="JOB_NOT_FOUND", status_code=404)
+        if job.get("status") not in FINISHED_STATES:
+            return error("Exportação ainda em andamento.", codigo="JOB_NOT_READY", detalhes=job.get("progress"), status_code=409)
+        artifact = self.export_queue.artifact(job)
+        if artifact is None:
+            return error("Resultado da exportação indisponível.", codigo="EXPORT_NOT_AVAILABLE", detalhes=job.get("error"), status_code=410)
+        fmt = job["payload"]["format"]
+        return await file_download(artifact, EXPORT_JOB_FORMATS[fmt], request_headers, filename=f"certificados.{fmt}")
+
+    async def _find(self, job_id: str) -> Tuple[Optional[JobQueue], Optional[Dict[str, Any]]]:
+        queues: List[JobQueue] = [q for q in (self.job_queue, self.export_queue) if q is not None]
+        for queue in queues:
+            # JobStore lê do disco: fora do event loop
+            job = await asyncio.to_thread(queue.get, job_id)
+            if job:
+                # As filas podem compartilhar o JobStore: o dono é a fila do mesmo tipo
+                owner = next((q for q in queues if q.kind == job.get("kind")), queue)
+                return owner, job
+        return None, None
+
+    async def _events(self, job_id: str) -> AsyncIterator[str]:
+        sent = 0
+        while True:
+            queue, job = await self._find(job_id)
+            if not job:
+                return
+            stages = job.get("stages", [])
+            for stage in stages[sent:]:
+                yield _sse("stage", stage)
+            sent = len(stages)
+            if job.get("status") in FINISHED_STATES:
+                yield _sse("done", present_job(job))
+                return
+            if not await queue.wait_for_change(_KEEPALIVE_SECONDS):
+                yield ": keep-alive\n\n"
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
@@ -4,34 +4,101 @@ Formatação de respostas HTTP e URLs de recursos
 """
 from __future__ import annotations
 
+import asyncio
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping
 from urllib.parse import quote
 
-from fastapi.responses import JSONResponse
+from fastapi import Response
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from backend.domain.entities import CertificadoBundleEntity
+from backend.domain.exceptions import OverloadedError
+from backend.domain.services.file_validators import FileValidators
 
 
 # ============================================================================
 # HTTP RESPONSE FORMATTERS
 # ============================================================================
 
-def success(data: Any, message: str = "OK", status_code: int = 200) -> JSONResponse:
-    """Formata uma resposta de sucesso padronizada."""
-    return JSONResponse(
-        status_code=status_code,
-        content={"message": message, "data": data, "sucesso": True}
-    )
+def success(data: Any, message: str = "OK", status_code: int = 200, meta: Dict[str, Any] | None = None) -> JSONResponse:
+    """Formata uma resposta de sucesso padronizada (``meta`` opcional para paginação etc.)."""
+    content: Dict[str, Any] = {"message": message, "data": data, "sucesso": True}
+    if meta is not None:
+        content["meta"] = meta
+    return JSONResponse(status_code=status_code, content=content)
 
 
-def error(message: str, codigo: str | None = None, detalhes: Any | None = None, status_code: int = 400) -> JSONResponse:
+def error(
+    message: str,
+    codigo: str | None = None,
+    detalhes: Any | None = None,
+    status_code: int = 400,
+    headers: Dict[str, str] | None = None,
+) -> JSONResponse:
     """Formata uma resposta de erro padronizada."""
     payload: Dict[str, Any] = {
         "message": message,
         "error": {"codigo": codigo, "detalhes": detalhes},
         "sucesso": False,
     }
-    return JSONResponse(status_code=status_code, content=payload)
+    return JSONResponse(status_code=status_code, content=payload, headers=headers)
+
+
+def overloaded(exc: OverloadedError) -> JSONResponse:
+    """429 com ``Retry-After`` para operações recusadas pelo controle de admissão."""
+    return error(exc.message, codigo="OVERLOADED", detalhes=exc.details, status_code=429, headers={"Retry-After": str(exc.retry_after)})
+
+
+def stream(chunks: Iterable[bytes], media_type: str, filename: str | None = None) -> StreamingResponse:
+    """Resposta em streaming a partir de um gerador de blocos de bytes."""
+    headers: Dict[str, str] = {}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+
+async def file_download(
+    path: Path,
+    media_type: str,
+    request_headers: Mapping[str, str],
+    filename: str | None = None,
+) -> Response:
+    """
+    Resposta de arquivo com ETag forte (hash do conteúdo) e Last-Modified.
+
+    ``If-None-Match``/``If-Modified-Since`` satisfeitos geram ``304`` sem
+    corpo; ``Range`` (e ``If-Range``) é atendido pelo ``FileResponse`` com
+    ``206``. O hash é obtido fora do event loop (fontes registradas ou
+    leitura do arquivo em thread).
+    """
+    v = await asyncio.to_thread(FileValidators.shared().validators, path)
+    headers = {"ETag": v.etag, "Last-Modified": v.last_modified, "Cache-Control": "no-cache"}
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, v.etag):
+            return Response(status_code=304, headers=headers)
+    elif request_headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request_headers["if-modified-since"]).timestamp()
+            if int(v.mtime) <= since:
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+    return FileResponse(path=v.path, media_type=media_type, filename=filename, stat_result=v.stat, headers=headers)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Comparação fraca (RFC 9110 para If-None-Match): ignora o prefixo W/
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def event_stream(events: AsyncIterator[str]) -> StreamingResponse:
+    """Resposta Server-Sent Events (``events`` já formatados como ``event:/data:``)."""
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events, media_type="text/event-stream", headers=headers)
 
 
 # ============================================================================
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from backend.domain.exceptions import OverloadedError
+from backend.domain.services.admission import AdmissionControl
+from backend.domain.services.metrics import MetricsRegistry
+from backend.interface.presenters import overloaded
+
+
+@pytest.mark.asyncio
+async def test_fila_cheia_recusa_com_retry_after():
+    metrics = MetricsRegistry()
+    admission = AdmissionControl({"upload": (1, 1)}, metrics=metrics)
+    release = asyncio.Event()
+
+    async def hold():
+        async with admission.slot("upload"):
+            await release.wait()
+
+    first = asyncio.create_task(hold())
+    second = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert admission.snapshot()["upload"] == {"limit": 1, "queue": 1, "active": 1, "waiting": 1}
+
+    with pytest.raises(OverloadedError) as exc:
+        async with admission.slot("upload"):
+            pass
+    assert exc.value.retry_after >= 1
+
+    release.set()
+    await asyncio.gather(first, second)
+    data = metrics.snapshot()
+    assert data["counters"]["admission.upload.admitted"] == 2
+    assert data["counters"]["admission.upload.rejected"] == 1
+    assert data["observations"]["admission.upload.wait_ms"]["count"] == 2
+
+    response = overloaded(exc.value)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(exc.value.retry_after)
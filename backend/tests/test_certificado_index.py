@@ -0,0 +1,124 @@
+from backend.domain.entities import CertificadoEntity
+from backend.domain.services.certificado_index import CertificadoIndex
+
+
+def _cert(id: str, numero: str, cnpj: str = "12.345.678/0001-99", cidade: str = "Imperatriz-MA") -> CertificadoEntity:
+    return CertificadoEntity(
+        id=id,
+        numero_certificado=numero,
+        razao_social="Empresa",
+        cnpj=cnpj,
+        endereco=None,
+        bairro="Centro",
+        cidade=cidade,
+        valor="R$ 1.500,00",
+        pragas_tratadas="insetos",
+        data_execucao="2025-01-15",
+    )
+
+
+def test_indice_busca_por_id_numero_e_cnpj():
+    index = CertificadoIndex()
+    index.refresh((("a.csv", 1, 1),), lambda: [_cert("1", "001/25"), _cert("2", "002/25")])
+
+    assert index.get_by_id("2").numero_certificado == "002/25"
+    assert index.get_by_numero("001/25").id == "1"
+    assert [c.id for c in index.get_by_cnpj("12345678000199")] == ["1", "2"]
+    assert index.get_by_id("3") is None
+
+
+def test_indice_reconstroi_apenas_quando_assinatura_muda():
+    index = CertificadoIndex()
+    cargas = []
+
+    def loader():
+        cargas.append(1)
+        return [_cert("1", "001/25")]
+
+    index.refresh((("a.csv", 1, 1),), loader)
+    index.refresh((("a.csv", 1, 1),), loader)
+    index.refresh((("a.csv", 2, 5),), loader)
+    assert len(cargas) == 2
+
+
+def test_upsert_atualiza_indices_sem_reconstruir():
+    index = CertificadoIndex()
+    index.refresh((("a.csv", 1, 1),), lambda: [_cert("1", "001/25")])
+
+    index.upsert(_cert("2", "002/25", cnpj="98.765.432/0001-10"), (("a.csv", 1, 1),), (("a.csv", 2, 2),))
+    index.upsert(_cert("1b", "001/25"), (("a.csv", 2, 2),), (("a.csv", 3, 3),))
+
+    assert len(index) == 2
+    assert index.get_by_id("1") is None
+    assert index.get_by_id("1b").numero_certificado == "001/25"
+    assert [c.id for c in index.get_by_cnpj("98765432000110")] == ["2"]
+    index.refresh((("a.csv", 3, 3),), lambda: [])
+    assert len(index) == 2
+
+
+def test_upsert_apos_gravacao_de_outro_writer_invalida():
+    index = CertificadoIndex()
+    index.refresh((("a.csv", 1, 1),), lambda: [_cert("1", "001/25")])
+
+    # Outro processo gravou (assinatura 2) antes desta gravação (assinatura 3)
+    index.upsert(_cert("3", "003/25"), (("a.csv", 2, 2),), (("a.csv", 3, 3),))
+
+    index.refresh((("a.csv", 3, 3),), lambda: [_cert("1", "001/25"), _cert("2", "002/25"), _cert("3", "003/25")])
+    assert len(index) == 3
+
+
+def test_find_combina_indices_secundarios():
+    certs = [
+        _cert("1", "001/25", cidade="Imperatriz-MA"),
+        _cert("2", "002/25", cidade="São Luís-MA"),
+        _cert("3", "003/25", cidade="Imperatriz-MA"),
+    ]
+    certs[1].valor = "R$ 500,00"
+    certs[2].valor = None
+    certs[2].bairro = "Bacuri"
+    index = CertificadoIndex()
+    index.refresh((("a.csv", 1, 1),), lambda: certs)
+
+    assert [c.id for c in index.find(cidade="imperatriz")] == ["1", "3"]
+    assert [c.id for c in index.find(cidade="-ma")] == ["1", "2", "3"]
+    assert [c.id for c in index.find(bairro="BACURI ")] == ["3"]
+    assert [c.id for c in index.find(min_valor=600)] == ["1"]
+    assert [c.id for c in index.find(max_valor=1500, cidade="luís")] == ["2"]
+    assert [c.id for c in index.find()] == ["1", "2", "3"]
+
+    index.upsert(_cert("4", "004/25", cidade="Açailândia-MA"), (("a.csv", 1, 1),), (("a.csv", 2, 2),))
+    assert [c.id for c in index.find(cidade="açail", min_valor=1000, max_valor=2000)] == ["4"]
+
+
+def test_page_percorre_por_chave_com_total():
+    index = CertificadoIndex()
+    index.refresh((("a.csv", 1, 1),), lambda: [_cert(str(i), f"{i:03d}/25") for i in (3, 1, 2, 5, 4)])
+
+    first = index.page(None, 2)
+    assert [c.id for c in first.items] == ["1", "2"]
+    assert first.total == 5
+    second = index.page(first.next_key, 2)
+    assert [c.id for c in second.items] == ["3", "4"]
+    last = index.page(second.next_key, 2)
+    assert [c.id for c in last.items] == ["5"]
+    assert last.next_key is None
+
+    filtrada = index.page(("1", "001/25"), 10, cidade="imperatriz")
+    assert [c.id for c in filtrada.items] == ["2", "3", "4", "5"]
+    assert filtrada.total == 5
+
+
+def test_scan_percorre_em_blocos_aplicando_filtros():
+    certs = [_cert(str(i), f"{i:03d}/25", cidade="Imperatriz-MA" if i % 2 else "São Luís-MA") for i in (3, 1, 2, 5, 4)]
+    index = CertificadoIndex()
+    index.refresh((("a.csv", 1, 1),), lambda: certs)
+
+    items, key = index.scan(None, 2, cidade="imperatriz")
+    assert [c.id for c in items] == ["1", "3"]
+    items, key = index.scan(key, 2, cidade="imperatriz")
+    assert [c.id for c in items] == ["5"]
+    assert key is None
+
+    items, key = index.scan(("4", "004/25"), 10)
+    assert [c.id for c in items] == ["5"]
+    assert key is None
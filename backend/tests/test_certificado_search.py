@@ -0,0 +1,177 @@
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.domain.services.certificado_index import engine_data_signature
+from backend.domain.services.certificado_search import CertificadoSearchIndex, query_terms, search_fields
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.infrastructure.repositories import FileCertificadoRepository
+
+
+def _doc(numero: str, razao: str, cidade: str, cnpj: str = "12.345.678/0001-99", produtos=(), metodos=()):
+    cert = {
+        "numero_certificado": numero,
+        "razao_social": razao,
+        "cnpj": cnpj,
+        "cidade": cidade,
+        "bairro": "Centro",
+        "pragas_tratadas": "baratas, ratos",
+    }
+    return numero, search_fields(cert, produtos, metodos)
+
+
+def _index(*docs) -> CertificadoSearchIndex:
+    index = CertificadoSearchIndex()
+    index.refresh((("a.csv", 1, 1),), lambda: list(docs))
+    return index
+
+
+def test_busca_ignora_acentos_e_exige_todos_os_termos():
+    index = _index(
+        _doc("001/25", "Padaria Pão Quente", "São Luís-MA"),
+        _doc("002/25", "Mercado Central", "Imperatriz-MA"),
+    )
+
+    assert [h.numero_certificado for h in index.search("PAO sao luis").hits] == ["001/25"]
+    assert [h.numero_certificado for h in index.search("pão imperatriz").hits] == []
+    assert index.search("   ").total == 0
+
+
+def test_busca_por_prefixo_cnpj_e_numero():
+    index = _index(
+        _doc("240/25-KJ", "Empresa XYZ", "Imperatriz-MA", cnpj="98.765.432/0001-10"),
+        _doc("241/25-KJ", "Outra", "Açailândia-MA"),
+    )
+
+    assert [h.numero_certificado for h in index.search("imper").hits] == ["240/25-KJ"]
+    assert [h.numero_certificado for h in index.search("98.765.432/0001-10").hits] == ["240/25-KJ"]
+    assert [h.numero_certificado for h in index.search("98765432000110").hits] == ["240/25-KJ"]
+    assert [h.numero_certificado for h in index.search("241/25").hits] == ["241/25-KJ"]
+    assert query_terms("12.345.678/0001-99 Açaí") == ["12345678000199", "acai"]
+
+
+def test_ranking_prefere_campos_de_maior_peso_e_termo_exato():
+    index = _index(
+        _doc("001/25", "Comercial Lima", "Imperatriz-MA", produtos=["Deltametrina"]),
+        _doc("002/25", "Deltametrina Dedetizadora", "Imperatriz-MA"),
+        _doc("003/25", "Limão Doce", "Imperatriz-MA"),
+    )
+
+    result = index.search("deltametrina")
+    assert [h.numero_certificado for h in result.hits] == ["002/25", "001/25"]
+    assert result.hits[0].score > result.hits[1].score
+    assert [h.numero_certificado for h in index.search("lima").hits] == ["001/25", "003/25"]
+
+
+def test_upsert_reindexa_e_paginacao():
+    index = _index(*[_doc(f"{i:03d}/25", "Empresa", "Imperatriz-MA") for i in range(5)])
+
+    index.upsert("002/25", _doc("002/25", "Farmácia Nova", "Timon-MA")[1], (("a.csv", 1, 1),), (("a.csv", 2, 2),))
+    index.upsert("009/25", _doc("009/25", "Farmácia Velha", "Caxias-MA")[1], (("a.csv", 2, 2),), (("a.csv", 3, 3),))
+
+    assert index.search("empresa").total == 4
+    assert [h.numero_certificado for h in index.search("farmacia").hits] == ["002/25", "009/25"]
+    assert index.search("timon").hits[0].numero_certificado == "002/25"
+    page = index.search("imperatriz", limit=2, offset=2)
+    assert page.total == 4
+    assert [h.numero_certificado for h in page.hits] == ["003/25", "004/25"]
+    assert len(index) == 6
+
+
+@dataclass
+class _Cert:
+    id: str
+    numero_certificado: str
+    razao_social: str
+    cidade: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Produto:
+    produto: str
+
+
+@dataclass
+class _Metodo:
+    metodo: str
+
+
+@dataclass
+class _Bundle:
+    certificado: _Cert
+    produtos: list
+    metodos: list
+
+
+class _StubEngine(PdfEngine):
+    def __init__(self, base: Path):
+        self.certs: List[_Cert] = []
+        self.csv = type("CSV", (), {})()
+        self.csv.certificados_path = base / "certificados.csv"
+        self.csv.produtos_path = base / "produtos.csv"
+        self.csv.metodos_path = base / "metodos.csv"
+        self.csv.certificados_path.write_text("", encoding="utf-8")
+        self.csv.produtos_path.write_text("numero_certificado,produto\n", encoding="utf-8")
+        self.csv.metodos_path.write_text("numero_certificado,metodo\n", encoding="utf-8")
+
+    def add(self, cert: _Cert, produto: str, metodo: str) -> _Bundle:
+        self.certs.append(cert)
+        with self.csv.certificados_path.open("a", encoding="utf-8") as f:
+            f.write(f"{cert.numero_certificado}\n")
+        with self.csv.produtos_path.open("a", encoding="utf-8") as f:
+            f.write(f"{cert.numero_certificado},{produto}\n")
+        with self.csv.metodos_path.open("a", encoding="utf-8") as f:
+            f.write(f"{cert.numero_certificado},{metodo}\n")
+        return _Bundle(cert, [_Produto(produto)], [_Metodo(metodo)])
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def listar_certificados(self) -> List[Any]:
+        return list(self.certs)
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return self.csv
+
+    def get_pdf_generator(self):
+        return None
+
+    def get_spreadsheet_generator(self):
+        return None
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+def test_upsert_apos_gravacao_de_outro_writer_invalida():
+    index = _index(_doc("001/25", "Empresa", "Imperatriz-MA"))
+
+    # Outro processo gravou o 002/25 antes desta gravação
+    index.upsert("003/25", _doc("003/25", "Empresa", "Caxias-MA")[1], (("a.csv", 2, 2),), (("a.csv", 3, 3),))
+    index.refresh((("a.csv", 3, 3),), lambda: [_doc(f"00{i}/25", "Empresa", "Timon-MA") for i in (1, 2, 3)])
+
+    assert index.search("empresa").total == 3
+
+
+def test_repositorio_indexa_produtos_dos_csvs_e_novos_uploads(tmp_path):
+    engine = _StubEngine(tmp_path)
+    engine.add(_Cert("1", "001/25", "Padaria Sol", "São Luís-MA"), "Fipronil Gel", "Iscagem")
+    repository = FileCertificadoRepository(engine)
+
+    page = repository.search("fipronil")
+    assert [c.id for c in page.items] == ["1"] and page.total == 1
+
+    before = engine_data_signature(engine)
+    bundle = engine.add(_Cert("2", "002/25", "Hotel Lua", "Imperatriz-MA"), "Cipermetrina", "Pulverização")
+    repository.register(bundle, before)
+    assert [c.id for c in repository.search("pulverizacao").items] == ["2"]
+    assert [c.id for c in repository.search("sao luis iscagem").items] == ["1"]
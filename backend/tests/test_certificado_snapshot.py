@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from backend.domain.entities import CertificadoEntity
+from backend.domain.services.certificado_snapshot import CertificadoSnapshot, mes_label, mes_ordinal
+
+
+def _cert(numero: str, cidade: str, pragas: str, valor, data) -> CertificadoEntity:
+    return CertificadoEntity(
+        id=numero,
+        numero_certificado=numero,
+        razao_social="Empresa",
+        cnpj="12.345.678/0001-99",
+        endereco=None,
+        bairro="Centro",
+        cidade=cidade,
+        valor=valor,
+        pragas_tratadas=pragas,
+        data_execucao=data,
+    )
+
+
+def test_snapshot_agrupa_por_mes_cidade_praga_e_valor():
+    snapshot = CertificadoSnapshot.from_certificados([
+        _cert("1", "São Luís-MA", "ratos, baratas", "R$ 1.500,00", datetime(2025, 1, 10)),
+        _cert("2", "Imperatriz-MA", "baratas", "R$ 500,50", "2025-02-01"),
+        _cert("3", "Imperatriz-MA", "", None, datetime(2025, 2, 20)),
+        _cert("4", "", "ratos,ratos", "inválido", None),
+    ])
+
+    assert len(snapshot) == 4
+    assert snapshot.mes_counts() == {"2025-01": 1, "2025-02": 2}
+    assert snapshot.cidade_counts() == {"São Luís-MA": 1, "Imperatriz-MA": 2}
+    assert snapshot.praga_counts() == {"ratos": 3, "baratas": 2}
+    total, count = snapshot.valor_stats()
+    assert round(total, 2) == 2000.5
+    assert count == 2
+
+
+def test_snapshot_vazio():
+    snapshot = CertificadoSnapshot.from_certificados([])
+    assert len(snapshot) == 0
+    assert snapshot.mes_counts() == {}
+    assert snapshot.cidade_counts() == {}
+    assert snapshot.valor_stats() == (0.0, 0)
+
+
+def test_mes_ordinal_aceita_datas_da_engine_iso_e_brasileiras():
+    assert mes_label(mes_ordinal(datetime(2025, 3, 9))) == "2025-03"
+    assert mes_label(mes_ordinal("2025-03-09T10:00:00")) == "2025-03"
+    assert mes_label(mes_ordinal(" 09/03/2025")) == "2025-03"
+    assert mes_ordinal("2025-13-01") == mes_ordinal("março") == mes_ordinal(None) == -1
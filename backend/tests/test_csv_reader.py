@@ -0,0 +1,39 @@
+import os
+
+from backend.domain.services.csv_reader import CsvReader
+
+
+def _touch(path, ns):
+    os.utime(path, ns=(ns, ns))
+
+
+def test_leitura_incremental_de_linhas_acrescentadas(tmp_path):
+    path = tmp_path / "produtos.csv"
+    path.write_text("numero_certificado,produto\n001,A\n", encoding="utf-8")
+    _touch(path, 1_000_000_000)
+    reader = CsvReader()
+
+    first = reader.rows(path)
+    assert [r["produto"] for r in first] == ["A"]
+    assert reader.rows(path) is first
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write("002,B\n003,C\n")
+    _touch(path, 2_000_000_000)
+    assert [r["produto"] for r in reader.rows(path)] == ["A", "B", "C"]
+    assert (reader.full_reads, reader.tail_reads) == (1, 1)
+    assert len(first) == 1
+
+
+def test_reescrita_do_arquivo_forca_leitura_completa(tmp_path):
+    path = tmp_path / "metodos.csv"
+    path.write_text("numero_certificado,metodo\n001,Iscagem\n", encoding="utf-8")
+    _touch(path, 1_000_000_000)
+    reader = CsvReader()
+    reader.rows(path)
+
+    path.write_text("numero_certificado,metodo\n001,Pulverização\n002,Iscagem\n", encoding="utf-8")
+    _touch(path, 2_000_000_000)
+    assert [r["metodo"] for r in reader.rows(path)] == ["Pulverização", "Iscagem"]
+    assert (reader.full_reads, reader.tail_reads) == (2, 0)
+    assert reader.rows(tmp_path / "inexistente.csv") == []
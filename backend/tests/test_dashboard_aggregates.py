@@ -0,0 +1,124 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.domain.services.certificado_index import engine_data_signature
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.services.dashboard_aggregates import DashboardAggregateStore
+from backend.infrastructure.repositories import FileCertificadoRepository
+
+
+@dataclass
+class _Cert:
+    id: str
+    numero_certificado: str
+    cidade: str
+    valor: str
+    pragas_tratadas: str
+    data_execucao: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Produto:
+    produto: str
+    classe_quimica: str
+
+
+@dataclass
+class _Metodo:
+    metodo: str
+
+
+@dataclass
+class _Bundle:
+    certificado: _Cert
+    produtos: list
+    metodos: list
+
+
+class _StubEngine(PdfEngine):
+    def __init__(self, base: Path):
+        self.certs: List[_Cert] = []
+        self.csv = type("CSV", (), {})()
+        self.csv.produtos_path = base / "produtos.csv"
+        self.csv.metodos_path = base / "metodos.csv"
+        self.csv.produtos_path.write_text("numero_certificado,produto,classe_quimica\n", encoding="utf-8")
+        self.csv.metodos_path.write_text("numero_certificado,metodo\n", encoding="utf-8")
+
+    def add(self, cert: _Cert, produto: str, classe: str, metodo: str) -> _Bundle:
+        self.certs.append(cert)
+        with self.csv.produtos_path.open("a", encoding="utf-8") as f:
+            f.write(f"{cert.numero_certificado},{produto},{classe}\n")
+        with self.csv.metodos_path.open("a", encoding="utf-8") as f:
+            f.write(f"{cert.numero_certificado},{metodo}\n")
+        return _Bundle(cert, [_Produto(produto, classe)], [_Metodo(metodo)])
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def listar_certificados(self) -> List[Any]:
+        return list(self.certs)
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return self.csv
+
+    def get_pdf_generator(self):
+        return None
+
+    def get_spreadsheet_generator(self):
+        return None
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+def test_delta_incremental_equivale_a_reconstrucao(tmp_path):
+    engine = _StubEngine(tmp_path)
+    engine.add(_Cert("1", "001/25", "Imperatriz-MA", "R$ 1.000,00", "ratos", datetime(2025, 1, 5)), "Prod A", "Piretroide", "Pulverização")
+    repository = FileCertificadoRepository(engine)
+    store = DashboardAggregateStore(engine, repository)
+    assert store.view().certificados == 1
+
+    before = engine_data_signature(engine)
+    bundle = engine.add(_Cert("2", "002/25", "São Luís-MA", "R$ 500,00", "ratos, baratas", datetime(2025, 2, 1)), "Prod B", "Piretroide", "Iscagem")
+    repository.register(bundle, before)
+    store.apply(bundle, before)
+    version = store.version
+    incremental = store.view()
+    assert store.version == version
+
+    assert incremental.certificados == 2
+    assert incremental.por_praga == [("ratos", 2), ("baratas", 1)]
+    assert incremental.classes_quimicas == [("Piretroide", 2)]
+    assert incremental.valor_total == 1500.0
+
+    store.invalidate()
+    assert store.view() == incremental
+
+
+def test_gravacao_concorrente_forca_reconstrucao(tmp_path):
+    engine = _StubEngine(tmp_path)
+    engine.add(_Cert("1", "001/25", "Imperatriz-MA", "R$ 1.000,00", "ratos", datetime(2025, 1, 5)), "Prod A", "Piretroide", "Pulverização")
+    store = DashboardAggregateStore(engine, FileCertificadoRepository(engine))
+    assert store.view().certificados == 1
+
+    # Outro processo grava depois da última reconstrução
+    engine.add(_Cert("2", "002/25", "Caxias-MA", "R$ 200,00", "cupins", datetime(2025, 1, 9)), "Prod C", "Fipronil", "Injeção")
+    before = engine_data_signature(engine)
+    bundle = engine.add(_Cert("3", "003/25", "São Luís-MA", "R$ 500,00", "ratos", datetime(2025, 2, 1)), "Prod B", "Piretroide", "Iscagem")
+    store.apply(bundle, before)
+
+    view = store.view()
+    assert view.certificados == 3
+    assert dict(view.por_cidade)["Caxias-MA"] == 1
+    assert view.valor_total == 1700.0
@@ -0,0 +1,87 @@
+import zipfile
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from backend.domain.services.excel_sanitizer import _sheet_part, sanitize_excel_for_engine
+
+
+def test_preenche_nome_fantasia_alterando_so_a_aba_afetada(tmp_path):
+    src = tmp_path / "cert.xlsx"
+    wb = Workbook()
+    wb.active.title = "Capa"
+    ws = wb.create_sheet("Dados")
+    ws["B3"] = "Razão Social"
+    ws["C3"] = "ACME & Filhos <LTDA>"
+    ws["B4"] = "Nome Fantasia"
+    ws["C4"].font = Font(bold=True)
+    ws["D4"] = "depois"
+    wb.save(src)
+
+    out = sanitize_excel_for_engine(src)
+
+    assert out.name == "sanitized_cert.xlsx"
+    dados = load_workbook(out)["Dados"]
+    assert dados["C4"].value == "ACME & Filhos <LTDA>"
+    assert dados["C4"].font.b
+    assert dados["D4"].value == "depois"
+    with zipfile.ZipFile(src) as a, zipfile.ZipFile(out) as b:
+        assert a.namelist() == b.namelist()
+        changed = [n for n in a.namelist() if a.read(n) != b.read(n)]
+    assert changed == ["xl/worksheets/sheet2.xml"]
+
+
+def test_cria_celula_ausente_na_posicao_correta(tmp_path):
+    src = tmp_path / "cert.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws["A2"] = "Razão Social"
+    ws["B2"] = "Z"
+    ws["A5"] = "Nome Fantasia"
+    ws["C5"] = 3
+    wb.save(src)
+
+    out = sanitize_excel_for_engine(src)
+
+    row = [c.value for c in load_workbook(out).active[5]]
+    assert row == ["Nome Fantasia", "Z", 3]
+
+
+def test_sem_correcao_nao_grava_copia(tmp_path):
+    src = tmp_path / "cert.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws["A2"] = "Razão Social"
+    ws["B2"] = "Z"
+    ws["A5"] = "Nome Fantasia"
+    ws["B5"] = "Já preenchido"
+    wb.save(src)
+
+    assert sanitize_excel_for_engine(src) == src
+    assert not (tmp_path / "sanitized_cert.xlsx").exists()
+
+
+def test_localiza_aba_pelos_relacionamentos_do_workbook(tmp_path):
+    src = tmp_path / "cert.xlsx"
+    with zipfile.ZipFile(src, "w") as zf:
+        zf.writestr("_rels/.rels", (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        ))
+        zf.writestr("xl/workbook.xml", (
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            '<sheet name="Capa" sheetId="1" r:id="rId1"/><sheet name="Dados &amp; Cia" sheetId="2" r:id="rId7"/>'
+            "</sheets></workbook>"
+        ))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="x" Target="worksheets/capa.xml"/>'
+            '<Relationship Id="rId7" Type="x" Target="worksheets/../worksheets/dados.xml"/>'
+            "</Relationships>"
+        ))
+
+    with zipfile.ZipFile(src) as zin:
+        assert _sheet_part(zin, "Dados & Cia") == "xl/worksheets/dados.xml"
+        assert _sheet_part(zin, "Inexistente") is None
@@ -0,0 +1,177 @@
+import io
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from backend.application.usecases.export_jobs import ExportJobQueue, export_key, normalize_export_filters
+from backend.domain.entities import CertificadoEntity
+from backend.domain.exceptions import ValidationError
+from backend.domain.services.admission import AdmissionControl
+from backend.domain.services.job_store import JobStore
+from backend.domain.services.metrics import MetricsRegistry
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.interface.controllers.jobs_controller import present_job
+
+
+def _cert(numero: str, cidade: str, data: str) -> CertificadoEntity:
+    return CertificadoEntity(
+        id=f"id-{numero}",
+        numero_certificado=numero,
+        razao_social="Empresa",
+        cnpj="12.345.678/0001-90",
+        endereco=None,
+        bairro="Centro",
+        cidade=cidade,
+        valor="R$ 100,00",
+        pragas_tratadas=None,
+        data_execucao=datetime.fromisoformat(data),
+    )
+
+
+class _Repository:
+    def __init__(self, certs: List[CertificadoEntity]):
+        self.certs = certs
+
+    def find(self, id=None, bairro=None, cidade=None, min_valor=None, max_valor=None) -> List[CertificadoEntity]:
+        return [c for c in self.certs if not cidade or c.cidade == cidade]
+
+    def get_pdf_path(self, numero: str) -> Optional[Path]:
+        return None
+
+
+class _Engine(PdfEngine):
+    def __init__(self, output_dir: Path, certs: List[CertificadoEntity]):
+        self.output_dir = output_dir
+        self.certs = {c.numero_certificado: c for c in certs}
+        self.renders = 0
+        self.version = "v1"
+
+    def template_version(self) -> str:
+        return self.version
+
+    def render_pdf(self, bundle: Any) -> Path:
+        self.renders += 1
+        path = self.output_dir / f"CERT_12345678_{bundle.certificado.numero_certificado}.pdf"
+        path.write_bytes(f"%PDF {bundle.certificado.numero_certificado}".encode())
+        return path
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        return {}
+
+    def listar_certificados(self) -> List[Any]:
+        return []
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        cert = self.certs.get(numero_certificado)
+        if not cert:
+            return None
+        return SimpleNamespace(certificado=SimpleNamespace(**cert.to_dict()), produtos=[], metodos=[])
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return type("CSV", (), {})()
+
+    def get_pdf_generator(self):
+        return type("PDFGen", (), {"output_dir": self.output_dir})()
+
+    def get_spreadsheet_generator(self):
+        return type("SheetGen", (), {})()
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+async def _wait_finished(queue: ExportJobQueue, job_id: str) -> Dict[str, Any]:
+    for _ in range(100):
+        job = queue.get(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        await queue.wait_for_change(0.05)
+    raise AssertionError("job não finalizou")
+
+
+def _queue(tmp_path: Path, admission: AdmissionControl | None = None):
+    certs = [
+        _cert("1", "Campinas", "2024-01-10"),
+        _cert("2", "Campinas", "2024-03-05"),
+        _cert("3", "Santos", "2024-01-20"),
+    ]
+    out = tmp_path / "pdfs"
+    out.mkdir()
+    engine = _Engine(out, certs)
+    return engine, ExportJobQueue(engine, _Repository(certs), JobStore(tmp_path), admission=admission or AdmissionControl({"pdf": (1, 4)}))
+
+
+def test_filtros_normalizados_e_chave_estavel():
+    a = normalize_export_filters(cidade=" Campinas ", min_valor="10", data_de="2024-01-01")
+    b = normalize_export_filters(cidade="Campinas", min_valor=10.0, data_de="2024-01-01T00:00:00", bairro="")
+    assert a == b
+    assert export_key(a, "zip") == export_key(b, "zip") != export_key(a, "pdf")
+    with pytest.raises(ValidationError):
+        normalize_export_filters(data_de="01/02/2024")
+    with pytest.raises(ValidationError):
+        normalize_export_filters(min_valor=50, max_valor=10)
+
+
+@pytest.mark.asyncio
+async def test_exportacao_zip_gera_pdfs_faltantes_e_reaproveita_por_filtro(tmp_path):
+    engine, queue = _queue(tmp_path)
+    filtros = {"cidade": "Campinas", "data_de": "2024-01-01", "data_ate": "2024-02-28"}
+
+    job = await _wait_finished(queue, (await queue.submit(filtros, "zip"))["id"])
+
+    assert job["status"] == "done", job["error"]
+    assert job["progress"] == {"total": 1, "done": 1, "rendered": 1, "missing": 0}
+    assert job["result"]["count"] == 1 and job["result"]["cached"] is False
+    assert "resolved" in [s["stage"] for s in job["stages"]]
+    assert present_job(job)["urls"]["download"] == f"/jobs/{job['id']}/download"
+    with zipfile.ZipFile(io.BytesIO(queue.artifact(job).read_bytes())) as zf:
+        assert len(zf.namelist()) == 1 and zf.namelist()[0].endswith("_1.pdf")
+
+    again = await _wait_finished(queue, (await queue.submit(dict(filtros, cidade=" Campinas "), "zip"))["id"])
+    await queue.stop()
+
+    assert again["id"] != job["id"]
+    assert again["result"]["cached"] is True
+    assert engine.renders == 1
+    assert queue.artifact(again) == queue.artifact(job)
+
+
+@pytest.mark.asyncio
+async def test_exportacao_rejeita_formato_e_falha_sem_resultados(tmp_path):
+    _, queue = _queue(tmp_path)
+    with pytest.raises(ValidationError):
+        await queue.submit({}, "rar")
+    with pytest.raises(ValidationError):
+        # Motor sem suporte à junção de PDFs
+        await queue.submit({}, "pdf")
+
+    job = await _wait_finished(queue, (await queue.submit({"cidade": "Sorocaba"}, "zip"))["id"])
+    await queue.stop()
+
+    assert job["status"] == "failed"
+    assert job["error"]["codigo"] == "NO_MATCHES"
+    assert queue.artifact(job) is None
+
+
+@pytest.mark.asyncio
+async def test_exportacao_renderiza_de_novo_pdf_desatualizado_sob_o_limite(tmp_path):
+    metrics = MetricsRegistry()
+    engine, queue = _queue(tmp_path, AdmissionControl({"pdf": (1, 4)}, metrics=metrics))
+    filtros = {"cidade": "Santos"}
+
+    first = await _wait_finished(queue, (await queue.submit(filtros, "zip"))["id"])
+    engine.version = "v2"
+    second = await _wait_finished(queue, (await queue.submit(filtros, "zip"))["id"])
+    await queue.stop()
+
+    assert first["status"] == second["status"] == "done"
+    assert second["progress"]["rendered"] == 1 and second["result"]["cached"] is False
+    assert engine.renders == 2
+    assert metrics.snapshot()["counters"]["admission.pdf.admitted"] == 2
@@ -0,0 +1,75 @@
+import asyncio
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+
+from backend.domain.services.file_validators import FileValidators
+from backend.domain.services.pdf_store import PdfObjectStore
+from backend.interface.presenters import file_download
+
+
+async def _get(path: Path, headers: Dict[str, str] | None = None) -> Tuple[int, Dict[str, str], bytes]:
+    """Executa a resposta ASGI de ``file_download`` como um GET."""
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    response = await file_download(path, "application/pdf", headers, filename=path.name)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+    }
+    messages = []
+
+    async def receive():
+        # Cliente nunca desconecta; a resposta encerra a espera ao terminar o envio
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await response(scope, receive, send)
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, body
+
+
+@pytest.mark.asyncio
+async def test_etag_forte_304_e_range(tmp_path):
+    pdf = tmp_path / "cert.pdf"
+    pdf.write_bytes(b"0123456789")
+
+    status, headers, body = await _get(pdf)
+    etag = headers["etag"]
+    assert (status, body) == (200, b"0123456789")
+    assert etag.startswith('"') and len(etag) == 34
+
+    assert (await _get(pdf, {"If-None-Match": f"W/{etag}"}))[0] == 304
+    assert (await _get(pdf, {"If-Modified-Since": headers["last-modified"]}))[0] == 304
+
+    status, _, body = await _get(pdf, {"Range": "bytes=2-5", "If-Range": etag})
+    assert (status, body) == (206, b"2345")
+    assert (await _get(pdf, {"Range": "bytes=2-5", "If-Range": '"outro"'}))[0] == 200
+
+    pdf.write_bytes(b"novo conteudo")
+    status, headers, _ = await _get(pdf, {"If-None-Match": etag})
+    assert status == 200 and headers["etag"] != etag
+
+
+def test_etag_reaproveita_hash_do_armazenamento(tmp_path):
+    generated = tmp_path / "CERT_1.pdf"
+    generated.write_bytes(b"%PDF-1")
+    alias = PdfObjectStore(tmp_path).alias(generated, tmp_path / "sao-paulo_CERT_1.pdf")
+    digest = next((tmp_path / ".objects").iterdir()).name
+
+    # Um armazenamento novo (reinício do processo) recupera o hash pelos nomes em .objects
+    validators = FileValidators()
+    validators.add_source(PdfObjectStore(tmp_path).digest_of)
+
+    assert validators.validators(alias).etag == f'"{digest[:32]}"'
+    assert validators.validators(generated).etag == f'"{digest[:32]}"'
+    assert validators.hashed == 0
+
+    avulso = tmp_path / "avulso.pdf"
+    avulso.write_bytes(b"%PDF-2")
+    validators.validators(avulso)
+    assert validators.hashed == 1
@@ -0,0 +1,48 @@
+from backend.domain.services.pdf_catalog import PdfCatalog
+
+
+def test_catalogo_localiza_pdfs_por_numero(tmp_path):
+    (tmp_path / "12345678_240-25-KJ.pdf").write_bytes(b"%PDF")
+    (tmp_path / "imperatriz-ma_12345678_240-25-KJ.pdf").write_bytes(b"%PDF")
+    (tmp_path / "12345678_241-25-KJ.pdf").write_bytes(b"%PDF")
+    (tmp_path / "notas.txt").write_text("x")
+    catalog = PdfCatalog(tmp_path)
+
+    nomes = [p.name for p in catalog.files_for("240/25-KJ")]
+    assert nomes == ["12345678_240-25-KJ.pdf", "imperatriz-ma_12345678_240-25-KJ.pdf"]
+    assert [p.name for p in catalog.find("240-25-KJ", "imperatriz*")] == ["imperatriz-ma_12345678_240-25-KJ.pdf"]
+
+
+def test_catalogo_acompanha_escritas_e_remocoes(tmp_path):
+    catalog = PdfCatalog(tmp_path)
+    assert catalog.files_for("240/25-KJ") == []
+
+    novo = tmp_path / "São-Luís_240-25-KJ.pdf"
+    novo.write_bytes(b"%PDF")
+    catalog.add(novo)
+    assert catalog.files_for("240/25-KJ") == [novo]
+    assert catalog.normalized(novo.name) == "sao-luis_240-25-kj.pdf"
+
+    novo.unlink()
+    catalog.discard(novo)
+    assert catalog.files_for("240/25-KJ") == []
+
+
+def test_catalogo_casa_numero_como_substring_e_memoriza(tmp_path):
+    # Mesma regra do glob ``*<numero>*``: não depende do separador usado pela engine
+    (tmp_path / "CERT12345678-240-25-KJ.pdf").write_bytes(b"%PDF")
+    (tmp_path / "12345678_241-25-KJ.pdf").write_bytes(b"%PDF")
+    catalog = PdfCatalog(tmp_path)
+
+    assert [p.name for p in catalog.files_for("240/25-KJ")] == ["CERT12345678-240-25-KJ.pdf"]
+
+    # Resultado memorizado acompanha escritas e remoções
+    novo = tmp_path / "imperatriz-ma_CERT12345678-240-25-KJ.pdf"
+    novo.write_bytes(b"%PDF")
+    catalog.add(novo)
+    assert [p.name for p in catalog.find("240-25-KJ", refresh=False)] == [
+        "CERT12345678-240-25-KJ.pdf",
+        "imperatriz-ma_CERT12345678-240-25-KJ.pdf",
+    ]
+    catalog.discard(tmp_path / "CERT12345678-240-25-KJ.pdf")
+    assert catalog.find("240-25-KJ", refresh=False) == [novo]
@@ -0,0 +1,112 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from backend.domain.services import pdf_service
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.services.pdf_fingerprint import PdfFingerprintManifest, bundle_fingerprint
+
+
+class _Engine(PdfEngine):
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.renders = 0
+        self.template = "v1"
+
+    def render_pdf(self, bundle: Any) -> Path:
+        self.renders += 1
+        path = self.output_dir / f"CERT_12345678_{bundle.certificado.numero_certificado}.pdf"
+        path.write_bytes(f"%PDF {self.renders}".encode())
+        return path
+
+    def template_version(self) -> str:
+        return self.template
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        return {}
+
+    def listar_certificados(self) -> List[Any]:
+        return []
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return type("CSV", (), {})()
+
+    def get_pdf_generator(self):
+        return type("PDFGen", (), {"output_dir": self.output_dir})()
+
+    def get_spreadsheet_generator(self):
+        return type("SheetGen", (), {})()
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+def _bundle(produto: str = "Fipronil") -> SimpleNamespace:
+    cert = SimpleNamespace(numero_certificado="9", cnpj="12.345.678/0001-90", cidade="Campinas")
+    return SimpleNamespace(certificado=cert, produtos=[SimpleNamespace(produto=produto)], metodos=[])
+
+
+def test_fingerprint_cobre_dados_e_template():
+    assert bundle_fingerprint(_bundle()) == bundle_fingerprint(_bundle())
+    assert bundle_fingerprint(_bundle()) != bundle_fingerprint(_bundle("Cipermetrina"))
+    assert bundle_fingerprint(_bundle(), "v1") != bundle_fingerprint(_bundle(), "v2")
+
+
+def test_renderiza_so_quando_dados_ou_template_mudam(tmp_path):
+    engine = _Engine(tmp_path)
+
+    first = pdf_service.ensure_pdf(_bundle(), engine)
+    assert first.name == "campinas_CERT_12345678_9.pdf"
+    pdf_service.ensure_pdf(_bundle(), engine)
+    assert engine.renders == 1
+
+    updated = pdf_service.ensure_pdf(_bundle("Cipermetrina"), engine)
+    assert engine.renders == 2
+    # O alias por cidade acompanha o novo PDF
+    assert updated.read_bytes() == b"%PDF 2"
+
+    engine.template = "v2"
+    pdf_service.ensure_pdf(_bundle("Cipermetrina"), engine)
+    assert engine.renders == 3
+
+
+def test_pdf_anterior_ao_manifesto_e_adotado(tmp_path):
+    engine = _Engine(tmp_path)
+    legado = tmp_path / "CERT_12345678_9.pdf"
+    legado.write_bytes(b"%PDF legado")
+
+    assert pdf_service.ensure_pdf(_bundle(), engine) == legado
+    assert pdf_service.ensure_pdf(_bundle(), engine) == legado
+    assert engine.renders == 0
+
+
+def test_download_confere_fingerprint_antes_de_servir(tmp_path):
+    engine = _Engine(tmp_path)
+    pdf_service.ensure_pdf(_bundle(), engine)
+
+    assert pdf_service.current_pdf(_bundle(), engine) is not None
+    # Dados mudaram: o PDF registrado não pode ser servido sem renderizar de novo
+    assert pdf_service.current_pdf(_bundle("Cipermetrina"), engine) is None
+    assert engine.renders == 1
+
+
+def test_manifesto_por_linha_nao_perde_gravacoes_concorrentes(tmp_path):
+    # Duas instâncias simulam processos distintos sobre o mesmo diretório
+    a = PdfFingerprintManifest(tmp_path)
+    b = PdfFingerprintManifest(tmp_path)
+
+    a.record("1", "f1", tmp_path / "a.pdf")
+    a.record("2", "f2", tmp_path / "b.pdf")
+    b.record("3", "f3", tmp_path / "c.pdf")
+    b.forget("1")
+
+    assert b.numeros_by_pdf() == {"b.pdf": "2", "c.pdf": "3"}
+    assert a.get("3") == {"fingerprint": "f3", "pdf": "c.pdf"}
+    a.close()
+    b.close()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import time
+from pathlib import Path
+
+from backend.domain.services.pdf_fingerprint import PdfFingerprintManifest
+from backend.domain.services.pdf_metadata import PdfMetadataCatalog
+
+
+def _pdf(path: Path, data: bytes, age_seconds: float) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    ts = time.time() - age_seconds
+    os.utime(path, (ts, ts))
+    return path
+
+
+def _age_dir(path: Path, age_seconds: float = 10) -> None:
+    # Fora da janela de mtime "racy": o diretório pode ser pulado na próxima sincronização
+    ts = time.time() - age_seconds
+    os.utime(path, (ts, ts))
+
+
+def test_consulta_paginada_com_total_facetas_e_numero(tmp_path):
+    PdfFingerprintManifest.for_dir(tmp_path).record("240/25", "fp", tmp_path / "CERT_240-25.pdf")
+    gerado = _pdf(tmp_path / "CERT_240-25.pdf", b"%PDF-1", 300)
+    os.link(gerado, tmp_path / "campinas_CERT_240-25.pdf")
+    _pdf(tmp_path / "antigos" / "São_Paulo_CERT_7.pdf", b"%PDF-2", 100 * 86400)
+    _pdf(tmp_path / ".objects" / "oculto.pdf", b"%PDF-3", 10)
+    (tmp_path / "notas.txt").write_text("x")
+    _age_dir(tmp_path / "antigos")
+    _age_dir(tmp_path)
+
+    catalog = PdfMetadataCatalog(tmp_path)
+    assert catalog.sync() == 2
+
+    page = catalog.query(limit=2)
+    assert page.total == 3
+    assert [r.relpath for r in page.items] == ["CERT_240-25.pdf", "campinas_CERT_240-25.pdf"]
+    assert {r.numero for r in page.items} == {"240/25"}
+    assert page.facets["linked"] == {"true": 2, "false": 1}
+    assert {f["value"]: f["count"] for f in page.facets["dir"]} == {"": 2, "antigos": 1}
+    assert sum(f["count"] for f in page.facets["month"]) == 3
+
+    # Busca sem acento/caixa e por período de modificação
+    assert [r.name for r in catalog.query(q="SAO_paulo").items] == ["São_Paulo_CERT_7.pdf"]
+    assert catalog.query(since=time.time() - 3600).total == 2
+
+
+def test_sincronizacao_incremental_e_caminhos_de_escrita(tmp_path):
+    _pdf(tmp_path / "A.pdf", b"%PDF-A", 100)
+    _age_dir(tmp_path)
+    catalog = PdfMetadataCatalog(tmp_path)
+    catalog.sync()
+    # O próprio banco (e o WAL) foi criado no diretório: envelhece o mtime de novo
+    _age_dir(tmp_path)
+    catalog.sync()
+
+    # Nada mudou: nenhum diretório é revarrido
+    assert catalog.sync() == 0
+
+    # Escrita registrada pelo fluxo de geração, com número
+    novo = _pdf(tmp_path / "B.pdf", b"%PDF-B", 0)
+    catalog.upsert(novo, "99")
+    assert catalog.query(q="b.pdf").items[0].numero == "99"
+
+    # Alteração feita por fora é encontrada pelo scandir do diretório alterado
+    (tmp_path / "A.pdf").unlink()
+    _pdf(tmp_path / "sub" / "C.pdf", b"%PDF-C", 0)
+    assert catalog.sync() >= 1
+    assert sorted(r.relpath for r in catalog.query().items) == ["B.pdf", "sub/C.pdf"]
+
+    novo.unlink()
+    catalog.remove([novo])
+    shutil.rmtree(tmp_path / "sub")
+    catalog.sync()
+    assert catalog.query().total == 0
+
+    # Persistido em disco: outra instância enxerga o mesmo estado
+    catalog.upsert(_pdf(tmp_path / "D.pdf", b"%PDF-D", 0), "5")
+    catalog.close()
+    assert PdfMetadataCatalog(tmp_path).query().items[0].numero == "5"
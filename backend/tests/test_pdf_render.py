@@ -0,0 +1,67 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from backend.domain.exceptions import FeatureUnavailableError
+from backend.domain.services import pdf_service
+from backend.domain.services.pdf_engine import PdfEngine
+
+
+class _PoolEngine(PdfEngine):
+    """Simula um adapter que delega a renderização (ex.: pool de processos)."""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.rendered: List[Any] = []
+
+    def render_pdf(self, bundle: Any) -> Path:
+        self.rendered.append(bundle)
+        path = self.output_dir / f"CERT_12345678_{bundle.certificado.numero_certificado}.pdf"
+        path.write_bytes(b"%PDF")
+        return path
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        return {}
+
+    def listar_certificados(self) -> List[Any]:
+        return []
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return type("CSV", (), {})()
+
+    def get_pdf_generator(self):
+        return type("PDFGen", (), {"output_dir": self.output_dir, "generate": lambda self, b: 1 / 0})()
+
+    def get_spreadsheet_generator(self):
+        return type("SheetGen", (), {})()
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+def test_ensure_pdf_renderiza_via_engine_e_reaproveita_o_existente(tmp_path):
+    engine = _PoolEngine(tmp_path)
+    cert = SimpleNamespace(numero_certificado="77", cnpj="12.345.678/0001-90", cidade="")
+    bundle = SimpleNamespace(certificado=cert, produtos=[], metodos=[])
+
+    first = pdf_service.ensure_pdf(bundle, engine)
+    second = pdf_service.ensure_pdf(bundle, engine)
+
+    assert first == second == tmp_path / "CERT_12345678_77.pdf"
+    assert engine.rendered == [bundle]
+
+
+def test_juncao_indisponivel_levanta_erro_de_dominio(tmp_path):
+    engine = _PoolEngine(tmp_path)
+    assert not engine.supports_pdf_merge()
+    with pytest.raises(FeatureUnavailableError) as exc:
+        engine.merge_pdfs([], tmp_path / "saida.pdf")
+    assert exc.value.codigo == "PDF_MERGE_UNAVAILABLE"
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import pytest
+
+from backend.domain.exceptions import PdfDeletionError
+from backend.domain.services.pdf_catalog import PdfCatalog
+from backend.domain.services.pdf_store import PdfObjectStore
+
+
+def test_alias_compartilha_o_objeto_e_remocao_apaga_todos(tmp_path):
+    store = PdfObjectStore(tmp_path)
+    generated = tmp_path / "CERT_1.pdf"
+    generated.write_bytes(b"%PDF-1")
+
+    alias = store.alias(generated, tmp_path / "sao-paulo_CERT_1.pdf")
+
+    assert alias.read_bytes() == b"%PDF-1"
+    assert alias.stat().st_ino == generated.stat().st_ino
+    objects = list((tmp_path / ".objects").iterdir())
+    assert len(objects) == 1 and objects[0].stat().st_ino == generated.stat().st_ino
+
+    removed = store.remove([alias])
+
+    assert sorted(p.name for p in removed) == sorted(["sao-paulo_CERT_1.pdf", "CERT_1.pdf", objects[0].name])
+    assert not generated.exists() and not objects[0].exists()
+
+
+def test_alias_substitui_copia_solta_de_outro_pdf(tmp_path):
+    store = PdfObjectStore(tmp_path)
+    generated = tmp_path / "CERT_1.pdf"
+    generated.write_bytes(b"%PDF-novo")
+    # Cópia anterior ao armazenamento, de uma renderização antiga
+    legacy = tmp_path / "sao-paulo_CERT_1.pdf"
+    legacy.write_bytes(b"%PDF-antigo")
+    assert not store.is_alias(legacy, generated)
+
+    alias = store.alias(generated, legacy)
+
+    assert alias.read_bytes() == b"%PDF-novo"
+    assert store.is_alias(alias, generated)
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_alias_sem_hard_link_reconhece_a_propria_copia(tmp_path, monkeypatch):
+    def no_link(src, dst):
+        raise OSError("hard link não suportado")
+
+    monkeypatch.setattr("backend.domain.services.pdf_store.os.link", no_link)
+    store = PdfObjectStore(tmp_path)
+    generated = tmp_path / "CERT_1.pdf"
+    generated.write_bytes(b"%PDF-1")
+
+    alias = store.alias(generated, tmp_path / "sao-paulo_CERT_1.pdf")
+    assert store.is_alias(alias, generated)
+
+    generated.write_bytes(b"%PDF-2 renderizado de novo")
+    assert not store.is_alias(alias, generated)
+    assert store.alias(generated, alias).read_bytes() == b"%PDF-2 renderizado de novo"
+
+
+def test_compact_converte_copias_existentes_em_aliases(tmp_path):
+    (tmp_path / "CERT_2.pdf").write_bytes(b"%PDF-2")
+    (tmp_path / "campinas_CERT_2.pdf").write_bytes(b"%PDF-2")
+    (tmp_path / "CERT_3.pdf").write_bytes(b"%PDF-3")
+
+    assert PdfObjectStore(tmp_path).compact() == 1
+    assert (tmp_path / "CERT_2.pdf").stat().st_ino == (tmp_path / "campinas_CERT_2.pdf").stat().st_ino
+    assert len(list((tmp_path / ".objects").iterdir())) == 2
+    # O diretório de objetos não aparece no catálogo
+    assert [p.name for p in PdfCatalog(tmp_path.resolve()).find("CERT")] == ["CERT_2.pdf", "CERT_3.pdf", "campinas_CERT_2.pdf"]
+
+
+def test_remocao_parcial_informa_o_que_foi_apagado(tmp_path, monkeypatch):
+    store = PdfObjectStore(tmp_path)
+    livre = tmp_path / "CERT_4.pdf"
+    preso = tmp_path / "CERT_5.pdf"
+    livre.write_bytes(b"%PDF-4")
+    preso.write_bytes(b"%PDF-5")
+    unlink = Path.unlink
+
+    def falha_em_preso(self, *args, **kwargs):
+        if self == preso:
+            raise PermissionError("ocupado")
+        return unlink(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "unlink", falha_em_preso)
+    with pytest.raises(PdfDeletionError) as exc:
+        store.remove([livre, preso])
+
+    assert exc.value.removed == [str(livre)]
+    assert [f["path"] for f in exc.value.failed] == [str(preso)]
+    assert not livre.exists() and preso.exists()
@@ -0,0 +1,39 @@
+import json
+
+from backend.domain.services.processed_files_index import ProcessedFilesIndex
+
+
+def test_hash_adicionado_por_outro_worker_e_visto_pelo_offset(tmp_path):
+    a = ProcessedFilesIndex(tmp_path)
+    b = ProcessedFilesIndex(tmp_path)
+    assert not a.exists("h1")
+
+    b.add({"hash": "h1", "filename": "a.xlsx"})
+    assert a.exists("h1")
+
+    # Linha parcial (escrita em andamento) só é considerada quando completa
+    with a.index_path.open("a", encoding="utf-8") as f:
+        f.write('{"hash": "h2"')
+    assert not a.exists("h2")
+    with a.index_path.open("a", encoding="utf-8") as f:
+        f.write("}\n")
+    assert a.exists("h2")
+
+
+def test_snapshot_compactado_evita_replay_completo(tmp_path):
+    writer = ProcessedFilesIndex(tmp_path, snapshot_every=2)
+    for i in range(3):
+        writer.add({"hash": f"h{i}"})
+    snapshot = json.loads(writer.snapshot_path.read_text(encoding="utf-8"))
+    assert set(snapshot["hashes"]) >= {"h0", "h1"}
+
+    writer.add({"hash": "h3"})
+    reader = ProcessedFilesIndex(tmp_path)
+    assert all(reader.exists(f"h{i}") for i in range(4))
+    assert reader._offset == reader.index_path.stat().st_size
+
+    # Snapshot que não corresponde ao JSONL é ignorado
+    writer.index_path.write_text(json.dumps({"hash": "novo"}) + "\n", encoding="utf-8")
+    fresh = ProcessedFilesIndex(tmp_path)
+    assert fresh.exists("novo")
+    assert not fresh.exists("h0")
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from backend.application.usecases.upload_excel import UploadExcelInput, UploadExcelUseCase
+from backend.domain.exceptions import ValidationError
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.services.single_flight import SingleFlight
+
+
+class _SlowEngine(PdfEngine):
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.1)
+        raise ValidationError("Planilha sem cabeçalho.")
+
+    def listar_certificados(self) -> List[Any]:
+        return []
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return type("CSV", (), {})()
+
+    def get_pdf_generator(self):
+        return type("PDFGen", (), {"output_dir": self.output_dir})()
+
+    def get_spreadsheet_generator(self):
+        return type("SheetGen", (), {})()
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+@pytest.mark.asyncio
+async def test_chamadas_concorrentes_compartilham_o_resultado():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    results = await asyncio.gather(*(flight.run("h", work) for _ in range(3)))
+
+    assert calls == 1
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert all(value == "ok" for value, _ in results)
+    assert not flight.in_flight("h")
+    assert (await flight.run("h", work))[1] is False
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_lider_cancelado_libera_a_chave_para_quem_aguardava():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "segundo"
+
+    leader = asyncio.create_task(flight.run("h", slow))
+    await started.wait()
+    follower = asyncio.create_task(flight.run("h", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("segundo", False)
+
+
+@pytest.mark.asyncio
+async def test_uploads_identicos_concorrentes_processam_uma_vez(tmp_path):
+    engine = _SlowEngine(tmp_path)
+    uc = UploadExcelUseCase(engine)
+
+    results = await asyncio.gather(
+        uc.execute(UploadExcelInput("a.xlsx", b"mesmo-conteudo")),
+        uc.execute(UploadExcelInput("b.xlsx", b"mesmo-conteudo")),
+        return_exceptions=True,
+    )
+
+    # A sanitização falha nos bytes inválidos; o erro da execução líder é repassado
+    assert engine.calls == 1
+    assert all(isinstance(r, Exception) for r in results)
+    assert type(results[0]) is type(results[1])
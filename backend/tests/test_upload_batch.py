@@ -0,0 +1,95 @@
+import asyncio
+import io
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from backend.application.usecases.upload_batch import UploadBatchUseCase
+from backend.application.usecases.upload_excel import UploadExcelInput
+from backend.domain.exceptions import ValidationError
+from backend.domain.services.admission import AdmissionControl
+from backend.domain.services.metrics import MetricsRegistry
+from backend.domain.services.pdf_engine import PdfEngine
+
+
+class _StubEngine(PdfEngine):
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.processed: List[str] = []
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        self.processed.append(file_path.suffix)
+        raise ValidationError("Planilha sem cabeçalho.")
+
+    def listar_certificados(self) -> List[Any]:
+        return []
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return type("CSV", (), {})()
+
+    def get_pdf_generator(self):
+        return type("PDFGen", (), {"output_dir": self.output_dir})()
+
+    def get_spreadsheet_generator(self):
+        return type("SheetGen", (), {})()
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+def _zip(members: Dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_lote_expande_zip_e_reporta_status_por_arquivo(tmp_path):
+    engine = _StubEngine(tmp_path)
+    uc = UploadBatchUseCase(engine, max_workers=2)
+    arquivos = [
+        UploadExcelInput("lote.zip", _zip({"a.xlsx": b"A", "sub/b.xlsx": b"A", "__MACOSX/._a.xlsx": b"x", "leia.txt": b"t"})),
+        UploadExcelInput("notas.txt", b"abc"),
+        UploadExcelInput("quebrado.zip", b"nao-e-zip"),
+    ]
+
+    result = await uc.execute(arquivos)
+
+    assert [(i.filename, i.status) for i in result.items] == [
+        ("a.xlsx", "error"),  # engine e sanitização falham
+        ("b.xlsx", "duplicate"),
+        ("notas.txt", "invalid"),
+        ("quebrado.zip", "invalid"),
+    ]
+    assert result.items[3].detalhes == [{"field": "arquivos", "message": "INVALID_ZIP"}]
+    assert (result.total, result.duplicados, result.falhas) == (4, 1, 3)
+    assert engine.processed == [".xlsx"]
+
+
+@pytest.mark.asyncio
+async def test_zip_expandido_em_temporarios_descartados_ao_final(tmp_path):
+    entrada = UploadExcelInput("lote.zip", _zip({"a.xlsx": b"A", "b.xlsx": b"B"}))
+
+    membros = await asyncio.to_thread(UploadBatchUseCase.expand_zip, entrada)
+    assert [(m.filename, m.path.read_bytes()) for m in membros] == [("a.xlsx", b"A"), ("b.xlsx", b"B")]
+    for m in membros:
+        m.discard()
+
+    engine = _StubEngine(tmp_path)
+    metrics = MetricsRegistry()
+    admission = AdmissionControl({"upload": (1, 4)}, metrics=metrics)
+    result = await UploadBatchUseCase(engine, max_workers=2, admission=admission).execute([entrada])
+    assert [i.status for i in result.items] == ["error", "error"]
+    # Uma vaga de admissão por arquivo do lote
+    assert metrics.snapshot()["counters"]["admission.upload.admitted"] == 2
+    assert len(engine.processed) == 2
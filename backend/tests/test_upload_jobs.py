@@ -0,0 +1,80 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from backend.application.usecases.upload_excel import UploadExcelInput
+from backend.application.usecases.upload_jobs import UploadJobQueue
+from backend.domain.exceptions import ValidationError
+from backend.domain.services.job_store import JobStore
+from backend.domain.services.pdf_engine import PdfEngine
+
+
+class _StubEngine(PdfEngine):
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        raise ValidationError("Planilha sem cabeçalho.")
+
+    def listar_certificados(self) -> List[Any]:
+        return []
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return type("CSV", (), {})()
+
+    def get_pdf_generator(self):
+        return type("PDFGen", (), {"output_dir": self.output_dir})()
+
+    def get_spreadsheet_generator(self):
+        return type("SheetGen", (), {})()
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+async def _wait_finished(queue: UploadJobQueue, job_id: str) -> Dict[str, Any]:
+    for _ in range(100):
+        job = queue.get(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        await queue.wait_for_change(0.05)
+    raise AssertionError("job não finalizou")
+
+
+@pytest.mark.asyncio
+async def test_job_registra_etapas_e_persiste_em_disco(tmp_path):
+    queue = UploadJobQueue(_StubEngine(tmp_path), JobStore(tmp_path))
+    with pytest.raises(ValidationError):
+        await queue.submit(UploadExcelInput("dados.txt", b"abc"))
+
+    job = await queue.submit(UploadExcelInput("dados.xlsx", b"abc"))
+    assert job["status"] == "queued"
+    job = await _wait_finished(queue, job["id"])
+    await queue.stop()
+
+    assert [s["stage"] for s in job["stages"]] == ["queued", "started", "failed"]
+    assert job["error"]["codigo"] in ("FILE_PROCESSING_ERROR", "UPLOAD_ERROR")
+    assert JobStore(tmp_path).get(job["id"])["status"] == "failed"
+    assert not JobStore(tmp_path).input_path(job["id"]).exists()
+
+
+@pytest.mark.asyncio
+async def test_jobs_interrompidos_sao_retomados_na_partida(tmp_path):
+    store = JobStore(tmp_path)
+    job = store.create("upload", {"filename": "dados.xlsx"}, b"abc")
+    job["status"] = "running"
+    store.save(job)
+
+    queue = UploadJobQueue(_StubEngine(tmp_path), JobStore(tmp_path))
+    await queue.start()
+    job = await _wait_finished(queue, job["id"])
+    await queue.stop()
+
+    assert [s["stage"] for s in job["stages"]][:3] == ["queued", "requeued", "started"]
@@ -0,0 +1,76 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from openpyxl import Workbook
+
+from backend.application.usecases.admin import GetMetricsUseCase
+from backend.application.usecases.upload_excel import UploadExcelUseCase
+from backend.domain.services.metrics import MetricsRegistry
+from backend.domain.services.pdf_engine import PdfEngine
+
+
+class _Engine(PdfEngine):
+    """Aceita a planilha apenas com "Nome Fantasia" preenchido."""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.parsed: List[str] = []
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        from openpyxl import load_workbook
+        self.parsed.append(file_path.name)
+        if not load_workbook(file_path).active["B2"].value:
+            raise ValueError("Nome fantasia vazio")
+        return {"ok": True}
+
+    def listar_certificados(self) -> List[Any]:
+        return []
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return type("CSV", (), {})()
+
+    def get_pdf_generator(self):
+        return type("PDFGen", (), {"output_dir": self.output_dir})()
+
+    def get_spreadsheet_generator(self):
+        return type("SheetGen", (), {})()
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        return dados
+
+
+def _workbook(path: Path, fantasia: Optional[str]) -> Path:
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"] = "Razão Social"
+    ws["B1"] = "ACME LTDA"
+    ws["A2"] = "Nome Fantasia"
+    ws["B2"] = fantasia
+    wb.save(path)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_preflight_faz_um_unico_parse_e_registra_o_caminho(tmp_path):
+    metrics = MetricsRegistry()
+    engine = _Engine(tmp_path)
+    uc = UploadExcelUseCase(engine)
+    uc._metrics = metrics
+
+    await uc._parse(_workbook(tmp_path / "limpa.xlsx", "ACME"))
+    _, sanitized = await uc._parse(_workbook(tmp_path / "vazia.xlsx", None))
+
+    assert engine.parsed == ["limpa.xlsx", "sanitized_vazia.xlsx"]
+    assert sanitized == tmp_path / "sanitized_vazia.xlsx"
+    counters = metrics.snapshot()["counters"]
+    assert counters["upload.preflight.clean"] == 1
+    assert counters["upload.preflight.sanitized"] == 1
+    assert counters["upload.engine_parses"] == 2
+    assert GetMetricsUseCase(metrics).execute()["upload_preflight"] == {"inspected": 2, "hit_rate": 1.0}
@@ -0,0 +1,61 @@
+import hashlib
+import io
+
+import pytest
+
+from backend.application.usecases.upload_excel import UploadExcelInput
+from backend.domain.exceptions import ValidationError
+from backend.domain.services.upload_spool import spool_stream, spool_upload
+
+
+class _Source:
+    def __init__(self, data: bytes):
+        self._buffer = io.BytesIO(data)
+        self.reads = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads += 1
+        return self._buffer.read(size)
+
+
+@pytest.mark.asyncio
+async def test_spool_grava_em_blocos_e_calcula_hash():
+    data = b"x" * 10_000
+    source = _Source(data)
+    spooled = await spool_upload(source, "Planilha.XLSX", chunk_size=4096)
+    try:
+        assert spooled.path.suffix == ".xlsx"
+        assert spooled.path.read_bytes() == data
+        assert spooled.sha256 == hashlib.sha256(data).hexdigest()
+        assert spooled.size == len(data)
+        assert source.reads == 4
+
+        inp = UploadExcelInput.from_spool(spooled)
+        assert inp.size == len(data)
+        assert await inp.sha256() == spooled.sha256
+    finally:
+        spooled.discard()
+    assert not spooled.path.exists()
+
+
+@pytest.mark.asyncio
+async def test_spool_interrompe_ao_exceder_limite():
+    source = _Source(b"x" * 10_000)
+    with pytest.raises(ValidationError) as exc:
+        await spool_upload(source, "a.xlsx", max_bytes=5000, chunk_size=4096)
+    assert exc.value.errors == [{"field": "arquivo", "message": "FILE_TOO_LARGE"}]
+    assert source.reads == 2
+
+
+def test_spool_sincrono_aplica_o_mesmo_hash_e_limite():
+    data = b"y" * 10_000
+    spooled = spool_stream(io.BytesIO(data), "membro.xlsx", chunk_size=4096)
+    try:
+        assert spooled.sha256 == hashlib.sha256(data).hexdigest()
+        assert spooled.size == len(data) and spooled.path.read_bytes() == data
+    finally:
+        spooled.discard()
+
+    with pytest.raises(ValidationError) as exc:
+        spool_stream(io.BytesIO(data), "membro.xlsx", max_bytes=5000, chunk_size=4096)
+    assert exc.value.errors == [{"field": "arquivo", "message": "FILE_TOO_LARGE"}]
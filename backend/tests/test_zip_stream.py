@@ -0,0 +1,85 @@
+import io
+import subprocess
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.application.usecases.admin import DownloadZipUseCase
+from backend.domain.services.pdf_engine import PdfEngine
+from backend.domain.services.zip_stream import iter_zip
+
+
+class _Engine(PdfEngine):
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+
+    def processar_upload(self, file_path: Path) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def listar_certificados(self) -> List[Any]:
+        return []
+
+    def get_bundle_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_bundle_entity_by_numero(self, numero_certificado: str) -> Optional[Any]:
+        return None
+
+    def get_csv_manager(self):
+        return None
+
+    def get_pdf_generator(self):
+        return type("PDFGen", (), {"output_dir": self.output_dir})()
+
+    def get_spreadsheet_generator(self):
+        return type("SheetGen", (), {})()
+
+    def criar_certificado_manual(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+def test_zip_em_streaming_sem_compressao_por_padrao(tmp_path):
+    (tmp_path / "A.pdf").write_bytes(b"%PDF-A" * 1000)
+    (tmp_path / "B.pdf").write_bytes(b"%PDF-B")
+    (tmp_path / "notas.txt").write_text("x")
+
+    chunks = list(
+        DownloadZipUseCase(_Engine(tmp_path)).execute(["A.pdf", "B.pdf", "A.pdf", "notas.txt", "../fora.pdf"])
+    )
+
+    assert len(chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        assert zf.namelist() == ["A.pdf", "B.pdf"]
+        assert {i.compress_type for i in zf.infolist()} == {zipfile.ZIP_STORED}
+        assert zf.read("A.pdf") == b"%PDF-A" * 1000
+        assert zf.testzip() is None
+
+
+def test_zip_comprimido_e_blocos_limitados(tmp_path):
+    src = tmp_path / "grande.pdf"
+    src.write_bytes(bytes(range(256)) * 4096)
+
+    chunks = list(iter_zip([("grande.pdf", src)], compress=True, chunk_size=8192))
+
+    # Nenhum bloco de saída acumula o arquivo inteiro
+    assert max(len(c) for c in chunks) < 64 * 1024
+    data = b"".join(chunks)
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.getinfo("grande.pdf").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("grande.pdf") == src.read_bytes()
+    if shutil.which("unzip"):
+        archive = tmp_path / "out.zip"
+        archive.write_bytes(data)
+        assert subprocess.run(["unzip", "-tq", str(archive)], capture_output=True).returncode == 0
+
+
+def test_zip_ignora_arquivo_removido_antes_da_leitura(tmp_path):
+    keep = tmp_path / "keep.pdf"
+    keep.write_bytes(b"%PDF")
+    gone = tmp_path / "gone.pdf"
+
+    data = b"".join(iter_zip([("gone.pdf", gone), ("keep.pdf", keep)]))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.namelist() == ["keep.pdf"]